@@ -1,48 +1,45 @@
+import copy
 import json
 import os
+import sys
+from contextlib import contextmanager
 
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Carpeta que contiene el paquete inventario
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
 
-class Item:  # Creamos nuestra clase Item
-    def __init__(self, id_item, nombre, cantidad, precio):  # Constructor con atributos
-        self.id_item = id_item
-        self.nombre = nombre
-        self.cantidad = cantidad
-        self.precio = precio
-
-    def get_id(self):  # Metodo para el id
-        return self.id_item
-
-    def get_nombre(self):  # metodo para el nombre
-        return self.nombre
-
-    def get_cantidad(self):  # metodo para obtener la cantidad
-        return self.cantidad
-
-    def get_precio(self):  # metodo para obtener el precio
-        return self.precio
-
-    def set_cantidad(self, cantidad):  # metodo para establecer la cantidad
-        self.cantidad = cantidad
-
-    def set_precio(self, precio):  # metodo para establecer el precio
-        self.precio = precio
-
-    def to_dict(self):
-        """Convierte el objeto Item a un diccionario para serialización JSON"""
-        return {
-            "id_item": self.id_item,
-            "nombre": self.nombre,
-            "cantidad": self.cantidad,
-            "precio": self.precio
-        }
+# Item y las utilidades de archivos son las mismas del paquete inventario (también las usa la semana 11)
+from inventario.modelo import Item, trigramas
+from inventario.archivos import escribir_atomico, leer_json_por_partes
 
 
 class Inventario:
 
-    def __init__(self):
+    def __init__(self, carga_diferida=False):
+        self.carga_pendiente = False  # Con carga diferida el archivo se lee la primera vez que se usan los items
         self.items = []  # Creamos una lista vacía para almacenar los productos
         self.archivo = "inventarios.json"  # Definimos el nombre del archivo donde se guardará el inventario
-        self.cargar_archivo()  # # Llamamos al metodo para cargar datos del archivo cuando se crea el inventario
+        self.en_lote = False  # Indica si estamos dentro de un lote (guardado diferido)
+        self.cambios_lote = False  # Indica si hubo cambios durante el lote
+        self.indice_nombres = {}  # Índice invertido: trigrama -> conjunto de items cuyo nombre lo contiene
+        self.orden_items = {}  # Item -> número de secuencia, para devolver las búsquedas en orden de la lista
+        self.secuencia = 0  # Contador para el orden de inserción
+        if carga_diferida:
+            self.carga_pendiente = True  # Crear el inventario no toca el disco
+        else:
+            self.cargar_archivo()  # # Llamamos al metodo para cargar datos del archivo cuando se crea el inventario
+
+    # La lista de productos; con carga diferida se lee el archivo en el primer acceso
+    @property
+    def items(self):
+        if self.carga_pendiente:
+            self.carga_pendiente = False
+            self.cargar_archivo()
+        return self.datos_items
+
+    @items.setter
+    def items(self, items):
+        self.datos_items = items
 
     # Creamos el metodo para guardar el archivo en formato JSON
     def guardar_archivo(self):
@@ -50,49 +47,108 @@ class Inventario:
             # Convertimos todos los items a diccionarios
             items_dict = [item.to_dict() for item in self.items]
 
-            # Guardamos en formato JSON con indentación para mejor legibilidad
-            with open(self.archivo, "w") as f:
-                json.dump(items_dict, f, indent=4)
+            # Guardamos en formato JSON con indentación para mejor legibilidad, de forma atómica
+            escribir_atomico(self.archivo, lambda f: json.dump(items_dict, f, indent=4), encoding="utf-8")
 
             print(f"Cambios guardados en archivo: {os.path.abspath(self.archivo)}")
         except Exception as e:
             print(f"Error al guardar en archivo: {str(e)}")
 
+    # Metodo para guardar, dentro de un lote solo marcamos que hay cambios pendientes
+    def persistir_cambio(self):
+        if self.en_lote:
+            self.cambios_lote = True
+        else:
+            self.guardar_archivo()
+
+    # Context manager para aplicar muchos cambios en memoria y guardar una sola vez al final
+    # Uso: with inventario.lote(): inventario.aña_item(...); inventario.act_item(...)
+    @contextmanager
+    def lote(self):
+        if self.en_lote:  # Un lote dentro de otro se integra al lote exterior
+            yield self
+            return
+        respaldo = [copy.copy(item) for item in self.items]  # Copia para poder deshacer
+        self.en_lote = True
+        try:
+            yield self
+        except BaseException:
+            self.items = respaldo  # Si ocurre un error restauramos el inventario en memoria
+            self.reconstruir_indice()
+            print("Lote cancelado, se restauró el inventario.")
+            raise
+        else:
+            if self.cambios_lote:
+                self.guardar_archivo()  # Una sola reescritura del JSON para todo el lote
+        finally:
+            self.en_lote = False
+            self.cambios_lote = False
+
     # Creamos un metodo para cargar el archivo JSON
     def cargar_archivo(self):
         try:
-            with open(self.archivo, "r") as f:
-                datos_json = json.load(f)  # Cargamos el contenido JSON
-                for dato in datos_json:  # Iteramos por cada item en el JSON
+            with open(self.archivo, "r", encoding="utf-8") as f:
+                # Leemos el arreglo JSON por partes para no tener en memoria el archivo completo
+                for dato in leer_json_por_partes(f):  # Iteramos por cada item en el JSON
                     item = Item(
                         dato["id_item"],
                         dato["nombre"],
                         int(dato["cantidad"]),
                         float(dato["precio"])
                     )
-                    self.items.append(item)
+                    self.agregar_en_memoria(item)
             print(f"Inventario cargado del archivo: {len(self.items)} productos.")
         except FileNotFoundError:
             print("Archivo JSON no encontrado. Se creará uno nuevo al guardar.")
         except json.JSONDecodeError:
             print(f"Error: El archivo {self.archivo} no tiene un formato JSON válido.")
+            self.reconstruir_indice([])  # Descartamos los productos leídos antes del error
         except Exception as e:
             print(f"Error al cargar el archivo: {str(e)}")
 
+    # Metodo para guardar un item en la lista y en el índice de nombres
+    def agregar_en_memoria(self, item):
+        self.items.append(item)
+        for t in trigramas(item.get_nombre()):
+            self.indice_nombres.setdefault(t, set()).add(item)
+        self.orden_items[item] = self.secuencia
+        self.secuencia += 1
+
+    # Metodo para quitar un item de la lista y del índice de nombres
+    def quitar_de_memoria(self, item):
+        self.items.remove(item)
+        for t in trigramas(item.get_nombre()):
+            items = self.indice_nombres.get(t)
+            if items is not None:
+                items.discard(item)
+                if not items:
+                    del self.indice_nombres[t]  # No dejamos trigramas vacíos en el índice
+        del self.orden_items[item]
+
+    # Metodo para volver a generar el índice a partir de los items dados (por defecto self.items)
+    def reconstruir_indice(self, items=None):
+        if items is None:
+            items = self.items
+        self.items = []
+        self.indice_nombres = {}
+        self.orden_items = {}
+        for item in items:
+            self.agregar_en_memoria(item)
+
     def aña_item(self, item):
         for i in self.items:  # Iteramos sobre la lista de items
             if i.get_id() == item.get_id():  # Verificamos si el ID ya existe
                 print("Error: El ID ya existe.")  # Mensaje de error
                 return
-        self.items.append(item)  # Agregamos el nuevo item
-        self.guardar_archivo()  # Guardamos los cambios
+        self.agregar_en_memoria(item)  # Agregamos el nuevo item
+        self.persistir_cambio()  # Guardamos los cambios
         print("Producto añadido.")  # Mensaje de éxito
 
     def el_item(self, id_item):
         for i in self.items:  # Iteramos sobre la lista de items
             if i.get_id() == id_item:
-                self.items.remove(i)  # Eliminamos el item
-                self.guardar_archivo()  # Guardamos los cambios
+                self.quitar_de_memoria(i)  # Eliminamos el item
+                self.persistir_cambio()  # Guardamos los cambios
                 print("Producto eliminado.")  # Mensaje de éxito
                 return
         print("Error: Producto no encontrado.")  # Mensaje de error
@@ -104,16 +160,29 @@ class Inventario:
                     i.set_cantidad(cantidad)  # Actualizamos la cantidad
                 if precio is not None:  # Si el precio no es None
                     i.set_precio(precio)  # Actualizamos el precio
-                self.guardar_archivo()  # Guardamos los cambios
+                self.persistir_cambio()  # Guardamos los cambios
                 print("Item actualizado exitosamente.")  # Mensaje de éxito
                 return
         print("Error: Producto no encontrado.")  # Mensaje de error
 
     def bus_item(self, nombre):
-        result = []  # Lista para los resultados
-        for i in self.items:  # Iteramos sobre los items
-            if nombre.lower() in i.get_nombre().lower():  # Verificamos si el nombre está contenido
-                result.append(i)  # Añadimos el item a los resultados
+        if self.carga_pendiente:
+            self.items  # El índice de nombres se arma al cargar, así que forzamos la carga
+        nombre = nombre.lower()
+        if len(nombre) < 3:  # Con menos de 3 letras no hay trigramas, recorremos todos los items
+            return [i for i in self.items if nombre in i.get_nombre().lower()]
+        # Intersectamos los conjuntos de items de cada trigrama, empezando por el más pequeño
+        conjuntos = []
+        for t in trigramas(nombre):
+            items = self.indice_nombres.get(t)
+            if not items:
+                return []  # Si un trigrama no aparece en ningún nombre no hay resultados
+            conjuntos.append(items)
+        conjuntos.sort(key=len)
+        candidatos = conjuntos[0].intersection(*conjuntos[1:])
+        # Los trigramas pueden coincidir sin que el texto completo esté contenido, así que verificamos
+        result = [i for i in candidatos if nombre in i.get_nombre().lower()]
+        result.sort(key=lambda i: self.orden_items[i])  # Mismo orden que la lista
         return result  # Retornamos la lista de resultados
 
     def most_items(self):
@@ -129,8 +198,9 @@ class Inventario:
             print("-" * 60)
 
 
-def mostrar():
-    inventario = Inventario()
+def mostrar(inventario=None):
+    if inventario is None:
+        inventario = Inventario()
     while True:  # Bucle para el menú
         print("1. Añadir producto")
         print("2. Eliminar producto")
@@ -201,6 +271,5 @@ def mostrar():
             print(f"Error: {str(e)}")  #Imprimimos que hay un error
 
 
-
-prod = mostrar()
-print(prod)
\ No newline at end of file
+if __name__ == "__main__":
+    mostrar()
@@ -2,8 +2,230 @@
 # Este programa implementa un sistema básico para administrar una biblioteca,
 # incluyendo libros, usuarios y operaciones de préstamo/devolución.
 
+import gc
+import heapq
+import math
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager, redirect_stdout
+
+# Criterios de búsqueda exacta y cómo obtener cada uno de un libro
+CRITERIOS = {
+    "titulo": lambda libro: libro.datos_basicos[0],
+    "autor": lambda libro: libro.datos_basicos[1],
+    "categoria": lambda libro: libro.categoria,
+}
+
+
+def normalizar(texto):
+    """
+    Normaliza un valor para compararlo sin distinguir mayúsculas y minúsculas.
+
+    Args:
+        texto (str): Valor a normalizar
+
+    Returns:
+        str: Valor normalizado
+    """
+    return texto.lower()
+
+
+# Marcas diacríticas combinables (tildes, diéresis, virgulilla de la ñ) que quedan sueltas tras NFKD
+DIACRITICOS = re.compile("[\u0300-\u036f]")
+
+# Palabras muy frecuentes que no ayudan a distinguir un libro de otro
+PALABRAS_VACIAS = {"a", "al", "de", "del", "el", "en", "la", "las", "lo", "los", "por", "un", "una", "y"}
+
+
+def plegar(texto):
+    """
+    Pasa el texto a minúsculas y le quita las tildes ("García Márquez" -> "garcia marquez").
+
+    Args:
+        texto (str): Texto original
+
+    Returns:
+        str: Texto plegado
+    """
+    texto = texto.casefold()
+    if texto.isascii():
+        return texto  # Sin tildes no hay nada que descomponer
+    return DIACRITICOS.sub("", unicodedata.normalize("NFKD", texto))
+
+
+def palabras(texto):
+    """
+    Divide un texto en palabras plegadas, sin las palabras vacías.
+
+    Args:
+        texto (str): Texto a dividir
+
+    Returns:
+        list: Palabras del texto
+    """
+    return [p for p in re.findall(r"\w+", plegar(texto)) if p not in PALABRAS_VACIAS]
+
+
+# Índice invertido sobre título y autor con puntaje BM25
+class IndiceTexto:
+    def __init__(self, k1=1.2, b=0.75):
+        """
+        Inicializa un índice vacío.
+
+        Args:
+            k1 (float): Saturación de la frecuencia de una palabra en el documento (BM25)
+            b (float): Peso de la normalización por largo del documento (BM25)
+        """
+        self.k1 = k1
+        self.b = b
+        self.apariciones = {}  # Palabra -> {ISBN: veces que aparece}; las palabras nunca se borran
+        self.palabras_libro = {}  # ISBN -> palabras distintas del libro, para poder quitarlo
+        self.largos = {}  # ISBN -> cantidad de palabras del libro
+        self.largo_total = 0
+        self.vocabulario = []  # Palabras ordenadas, para buscar por prefijo con bisect
+        self.vocabulario_pendiente = False  # Hay palabras nuevas que todavía no están en el vocabulario
+
+    def __len__(self):
+        return len(self.largos)
+
+    # Método para indexar el texto de un libro
+    def agregar(self, isbn, texto):
+        """
+        Agrega un documento al índice (si ya estaba, lo reemplaza).
+
+        Args:
+            isbn (str): Identificador del documento
+            texto (str): Texto a indexar
+        """
+        if isbn in self.largos:
+            self.quitar(isbn)
+        lista = palabras(texto)
+        frecuencias = {}
+        for palabra in lista:
+            frecuencias[palabra] = frecuencias.get(palabra, 0) + 1
+        for palabra, veces in frecuencias.items():
+            libros = self.apariciones.get(palabra)
+            if libros is None:
+                libros = self.apariciones[palabra] = {}
+                self.vocabulario_pendiente = True
+            libros[isbn] = veces
+        self.palabras_libro[isbn] = tuple(frecuencias)
+        self.largos[isbn] = len(lista)
+        self.largo_total += len(lista)
+
+    # Método para quitar un libro del índice
+    def quitar(self, isbn):
+        """
+        Quita un documento del índice.
+
+        Args:
+            isbn (str): Identificador del documento
+        """
+        for palabra in self.palabras_libro.pop(isbn, ()):
+            del self.apariciones[palabra][isbn]
+        self.largo_total -= self.largos.pop(isbn, 0)
+
+    # Método que devuelve las palabras del vocabulario que empiezan con un prefijo
+    def con_prefijo(self, prefijo, limite=50):
+        """
+        Busca palabras por prefijo y devuelve las que aparecen en más documentos.
+
+        Args:
+            prefijo (str): Comienzo de la palabra (ya plegado)
+            limite (int): Cantidad máxima de palabras a devolver
+
+        Returns:
+            list: Palabras que empiezan con el prefijo
+        """
+        if self.vocabulario_pendiente:
+            self.vocabulario = sorted(self.apariciones)
+            self.vocabulario_pendiente = False
+        candidatas = []
+        for i in range(bisect_left(self.vocabulario, prefijo), len(self.vocabulario)):
+            palabra = self.vocabulario[i]
+            if not palabra.startswith(prefijo):
+                break
+            if self.apariciones[palabra]:
+                candidatas.append(palabra)
+        if len(candidatas) > limite:
+            candidatas = heapq.nlargest(limite, candidatas, key=lambda p: len(self.apariciones[p]))
+        return candidatas
+
+    # Método para buscar y ordenar los libros por relevancia
+    def buscar(self, consulta, k=10, prefijo=True):
+        """
+        Devuelve los k documentos más relevantes para la consulta según BM25.
+        Basta con que un documento contenga una de las palabras; con prefijo=True la última
+        palabra también coincide con las que empiezan igual ("soled" encuentra "soledad").
+
+        Args:
+            consulta (str): Texto a buscar
+            k (int): Cantidad máxima de resultados
+            prefijo (bool): Si la última palabra se toma como prefijo
+
+        Returns:
+            list: Pares (ISBN, puntaje) de mayor a menor puntaje
+        """
+        lista = palabras(consulta)
+        total = len(self.largos)
+        if not lista or not total:
+            return []
+        grupos = [[palabra] for palabra in dict.fromkeys(lista[:-1])]  # Sin repetir palabras
+        if prefijo:
+            grupos.append(self.con_prefijo(lista[-1]))
+        elif lista[-1] not in lista[:-1]:
+            grupos.append([lista[-1]])
+        # Cada término con sus palabras (las que existen) y el idf de cada una
+        terminos = []
+        for grupo in grupos:
+            con_idf = [(self.apariciones[palabra],
+                        math.log(1 + (total - len(self.apariciones[palabra]) + 0.5)
+                                 / (len(self.apariciones[palabra]) + 0.5)))
+                       for palabra in grupo if self.apariciones.get(palabra)]
+            if con_idf:
+                # Un término aporta como máximo idf * (k1 + 1), sin importar el documento
+                terminos.append((max(idf for _, idf in con_idf) * (self.k1 + 1), con_idf))
+        terminos.sort(key=lambda termino: termino[0], reverse=True)  # Primero los términos más raros
+        restante = sum(maximo for maximo, _ in terminos)
+        promedio = self.largo_total / total
+        puntajes = {}
+        for maximo, con_idf in terminos:
+            restante -= maximo
+            # Poda MaxScore: si lo que aún pueden sumar los términos que faltan (incluido este) no
+            # alcanza al k-ésimo mejor puntaje, un libro nuevo ya no puede entrar entre los k primeros
+            # y basta con completar el puntaje de los candidatos que ya tenemos
+            solo_candidatos = False
+            if len(puntajes) >= k:
+                umbral = heapq.nlargest(k, puntajes.values())[-1]
+                solo_candidatos = restante + maximo < umbral
+            mejor = {}  # Con varias palabras para un mismo término (prefijo) cada libro suma solo la mejor
+            for libros, idf in con_idf:
+                if solo_candidatos and len(puntajes) < len(libros):
+                    pares = ((isbn, libros[isbn]) for isbn in puntajes if isbn in libros)
+                else:
+                    pares = libros.items()
+                for isbn, veces in pares:
+                    if solo_candidatos and isbn not in puntajes:
+                        continue
+                    normal = self.k1 * (1 - self.b + self.b * self.largos[isbn] / promedio)
+                    puntaje = idf * veces * (self.k1 + 1) / (veces + normal)
+                    if puntaje > mejor.get(isbn, 0.0):
+                        mejor[isbn] = puntaje
+            for isbn, puntaje in mejor.items():
+                puntajes[isbn] = puntajes.get(isbn, 0.0) + puntaje
+        return heapq.nlargest(k, puntajes.items(), key=lambda par: par[1])
+
 # Clase que representa un libro
 class Libro:
+    __slots__ = ("datos_basicos", "categoria", "isbn")  # Sin __dict__ por libro: menos memoria con catálogos grandes
+
     def __init__(self, titulo, autor, categoria, isbn):
         """
         Inicializa un nuevo libro con sus datos básicos.
@@ -40,7 +262,10 @@ class Usuario:
         """
         self.nombre = nombre
         self.id_usuario = id_usuario
-        self.libros_prestados = []  # Lista para gestionar los libros actualmente prestados por el usuario
+        # Libros actualmente prestados al usuario: ISBN como clave, así devolver es O(1) y se conserva el orden
+        self.libros_prestados = {}
+        self.ejemplares = {}  # ISBN -> número del ejemplar que tiene de cada libro prestado
+        self.reservas = set()  # ISBN de los libros que espera en una lista de reservas
 
     def __str__(self):
         """
@@ -49,45 +274,387 @@ class Usuario:
         Returns:
             str: Descripción del usuario y sus libros prestados
         """
-        return f"Usuario: {self.nombre} (ID: {self.id_usuario}, Libros Prestados: {[libro.datos_basicos[0] for libro in self.libros_prestados]})"
+        return f"Usuario: {self.nombre} (ID: {self.id_usuario}, Libros Prestados: {[libro.datos_basicos[0] for libro in self.libros_prestados.values()]})"
+
+
+# Clase que agrupa los ejemplares de un mismo título (un ISBN)
+class Existencias:
+    __slots__ = ("libro", "total", "disponibles", "prestados", "reservas")  # Una por título: sin __dict__
+
+    def __init__(self, libro, total=1):
+        """
+        Inicializa las existencias de un título con todos sus ejemplares disponibles.
+        Los ejemplares se numeran de 1 a total; su identificador es el ISBN seguido del número.
+
+        Args:
+            libro (Libro): Datos del título que comparten todos los ejemplares
+            total (int): Cantidad de ejemplares
+        """
+        self.libro = libro
+        self.total = total
+        self.disponibles = list(range(total, 0, -1))  # Pila de ejemplares en estante: sacar y reponer son O(1)
+        self.prestados = {}  # Número de ejemplar -> Usuario que lo tiene, en el orden en que se prestaron
+        self.reservas = None  # Cola (deque) de usuarios que esperan un ejemplar; se crea con la primera reserva
+
+    def __str__(self):
+        """
+        Retorna una representación en texto del título y su disponibilidad.
+
+        Returns:
+            str: Descripción del libro con sus ejemplares disponibles
+        """
+        return f"{self.libro} [{len(self.disponibles)} de {self.total} ejemplares disponibles]"
+
+
+def id_ejemplar(isbn, numero):
+    """
+    Arma el identificador de un ejemplar.
+
+    Args:
+        isbn (str): ISBN del libro
+        numero (int): Número del ejemplar dentro del título
+
+    Returns:
+        str: Identificador con la forma ISBN-número
+    """
+    return f"{isbn}-{numero}"
+
+
+def separar_ejemplar(identificador):
+    """
+    Separa el identificador de un ejemplar en ISBN y número. El ISBN puede tener guiones.
+
+    Args:
+        identificador (str): Identificador con la forma ISBN-número
+
+    Returns:
+        tuple: (isbn, numero), o (identificador, None) si no tiene esa forma
+    """
+    isbn, _, numero = identificador.rpartition("-")
+    if not isbn or not numero.isdigit():
+        return identificador, None
+    return isbn, int(numero)
+
+
+@contextmanager
+def sin_recolector():
+    """
+    Pausa el recolector de basura de Python mientras se crean muchos objetos de una vez.
+    Los libros y sus existencias no forman ciclos, y con el recolector activo cada tanda de
+    objetos nuevos dispara un recorrido de todos los anteriores.
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
 
 
 # Clase principal que administra la biblioteca
 class Biblioteca:
-    def __init__(self):
+    # Esquema de la base: el catálogo con la cantidad de ejemplares de cada título, los usuarios,
+    # un registro por ejemplar prestado y las listas de reservas (en orden de llegada)
+    SQL_TABLA_PRESTAMOS = ("CREATE TABLE IF NOT EXISTS prestamos (isbn TEXT NOT NULL, ejemplar INTEGER NOT NULL, "
+                           "id_usuario TEXT NOT NULL, nombre_usuario TEXT NOT NULL, PRIMARY KEY (isbn, ejemplar))")
+    SQL_TABLAS = (
+        "CREATE TABLE IF NOT EXISTS libros (isbn TEXT PRIMARY KEY, titulo TEXT NOT NULL, "
+        "autor TEXT NOT NULL, categoria TEXT NOT NULL, ejemplares INTEGER NOT NULL DEFAULT 1)",
+        "CREATE TABLE IF NOT EXISTS usuarios (id_usuario TEXT PRIMARY KEY, nombre TEXT NOT NULL)",
+        SQL_TABLA_PRESTAMOS,
+        "CREATE TABLE IF NOT EXISTS reservas (isbn TEXT NOT NULL, id_usuario TEXT NOT NULL, "
+        "nombre_usuario TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS reservas_isbn ON reservas (isbn, id_usuario)",
+    )
+    SQL_AÑADIR_LIBRO = "INSERT INTO libros (isbn, titulo, autor, categoria, ejemplares) VALUES (?, ?, ?, ?, ?)"
+    SQL_QUITAR_LIBRO = "DELETE FROM libros WHERE isbn = ?"
+    SQL_EJEMPLARES = "UPDATE libros SET ejemplares = ? WHERE isbn = ?"
+    SQL_AÑADIR_USUARIO = "INSERT INTO usuarios (id_usuario, nombre) VALUES (?, ?)"
+    SQL_QUITAR_USUARIO = "DELETE FROM usuarios WHERE id_usuario = ?"
+    SQL_PRESTAR = "INSERT INTO prestamos (isbn, ejemplar, id_usuario, nombre_usuario) VALUES (?, ?, ?, ?)"
+    SQL_DEVOLVER = "DELETE FROM prestamos WHERE isbn = ? AND ejemplar = ?"
+    SQL_RESERVAR = "INSERT INTO reservas (isbn, id_usuario, nombre_usuario) VALUES (?, ?, ?)"
+    SQL_QUITAR_RESERVA = "DELETE FROM reservas WHERE isbn = ? AND id_usuario = ?"
+
+    def __init__(self, archivo=None):
         """
-        Inicializa una nueva biblioteca con colecciones vacías.
+        Inicializa una nueva biblioteca. Sin archivo vive solo en memoria; con archivo los datos
+        se guardan en una base SQLite y se cargan de ella al iniciar.
+
+        Args:
+            archivo (str): Ruta de la base de datos (opcional)
         """
-        self.libros_disponibles = {}  # Diccionario: ISBN como clave, objeto Libro como valor
+        self.existencias = {}  # Catálogo completo: ISBN como clave, Existencias del título como valor
+        self.libros_disponibles = {}  # Títulos con algún ejemplar en estante: ISBN como clave, Libro como valor
         self.usuarios_registrados = {}  # Diccionario: ID como clave, objeto Usuario como valor
+        # Índices de búsqueda exacta: criterio -> valor normalizado -> {ISBN: Libro} de los libros disponibles.
+        # El diccionario interior conserva el orden de libros_disponibles y permite quitar en O(1)
+        self.indices = {criterio: {} for criterio in CRITERIOS}
+        self.indice_texto = IndiceTexto()  # Búsqueda por palabras en título y autor de los libros disponibles
+        # Tras cargar de la base los índices se arman recién en la primera búsqueda que los necesita
+        self.indices_pendientes = False
+        self.texto_pendiente = False
+        self.conexion = None
+        if archivo is not None:
+            # isolation_level=None: cada cambio se confirma solo, salvo dentro de transaccion()
+            self.conexion = sqlite3.connect(archivo, isolation_level=None)
+            self.conexion.execute("PRAGMA journal_mode=WAL")  # Cada cambio se anexa al registro WAL
+            self.conexion.execute("PRAGMA synchronous=NORMAL")
+            for sql in self.SQL_TABLAS:
+                self.conexion.execute(sql)
+            self.migrar_base()
+            self.cargar_base()
+
+    # Método para adaptar una base creada cuando cada ISBN era un único ejemplar
+    def migrar_base(self):
+        """
+        Agrega la cantidad de ejemplares al catálogo (uno por libro) y rehace la tabla de
+        préstamos con el número de ejemplar. No hace nada si la base ya tiene el esquema actual.
+        """
+        columnas = {fila[1] for fila in self.conexion.execute("PRAGMA table_info(libros)")}
+        if "ejemplares" in columnas:
+            return
+        with self.transaccion():
+            self.conexion.execute("ALTER TABLE libros ADD COLUMN ejemplares INTEGER NOT NULL DEFAULT 1")
+            self.conexion.execute("ALTER TABLE prestamos RENAME TO prestamos_anterior")
+            self.conexion.execute(self.SQL_TABLA_PRESTAMOS)
+            self.conexion.execute("INSERT INTO prestamos (isbn, ejemplar, id_usuario, nombre_usuario) "
+                                  "SELECT isbn, 1, id_usuario, nombre_usuario FROM prestamos_anterior ORDER BY rowid")
+            self.conexion.execute("DROP TABLE prestamos_anterior")
+
+    # Método para leer el catálogo, los usuarios, los préstamos y las reservas de la base
+    def cargar_base(self):
+        """
+        Carga el contenido de la base sin imprimir cada libro ni armar los índices.
+        """
+        with sin_recolector():  # Se crea un Libro y sus Existencias por cada título
+            for id_usuario, nombre in self.conexion.execute("SELECT id_usuario, nombre FROM usuarios"):
+                self.usuarios_registrados[id_usuario] = Usuario(nombre, id_usuario)
+            otros = {}  # Usuarios con préstamos o reservas que no están registrados en la biblioteca
+
+            def buscar_usuario(id_usuario, nombre):
+                usuario = self.usuarios_registrados.get(id_usuario)
+                if usuario is None:
+                    usuario = otros.setdefault(id_usuario, Usuario(nombre, id_usuario))
+                return usuario
+
+            existencias = self.existencias  # Variables locales: este ciclo se repite por cada libro
+            disponibles = self.libros_disponibles
+            for isbn, titulo, autor, categoria, total in self.conexion.execute(
+                    "SELECT isbn, titulo, autor, categoria, ejemplares FROM libros ORDER BY rowid"):
+                libro = Libro(titulo, autor, categoria, isbn)
+                existencias[isbn] = Existencias(libro, total)
+                disponibles[isbn] = libro
+            con_prestamos = set()
+            prestados = 0
+            for isbn, numero, id_usuario, nombre in self.conexion.execute(
+                    "SELECT isbn, ejemplar, id_usuario, nombre_usuario FROM prestamos ORDER BY rowid"):
+                usuario = buscar_usuario(id_usuario, nombre)
+                titulo = existencias[isbn]
+                titulo.prestados[numero] = usuario  # En el orden en que se prestaron
+                usuario.libros_prestados[isbn] = titulo.libro
+                usuario.ejemplares[isbn] = numero
+                con_prestamos.add(isbn)
+                prestados += 1
+            for isbn in con_prestamos:
+                titulo = existencias[isbn]
+                titulo.disponibles = [numero for numero in titulo.disponibles if numero not in titulo.prestados]
+                if not titulo.disponibles:
+                    del disponibles[isbn]  # Todos sus ejemplares están prestados
+            for isbn, id_usuario, nombre in self.conexion.execute(
+                    "SELECT isbn, id_usuario, nombre_usuario FROM reservas ORDER BY rowid"):
+                usuario = buscar_usuario(id_usuario, nombre)
+                titulo = existencias[isbn]
+                if titulo.reservas is None:
+                    titulo.reservas = deque()
+                titulo.reservas.append(usuario)
+                usuario.reservas.add(isbn)
+        self.indices_pendientes = self.texto_pendiente = bool(self.libros_disponibles)
+        print(f"Biblioteca cargada: {len(existencias)} títulos ({len(self.libros_disponibles)} disponibles), "
+              f"{prestados} ejemplares prestados, {len(self.usuarios_registrados)} usuarios.")
+
+    # Método para guardar un cambio en la base (si la biblioteca tiene archivo)
+    def escribir(self, sql, parametros):
+        if self.conexion is not None:
+            self.conexion.execute(sql, parametros)
+
+    # Context manager para confirmar varios cambios en la base con una sola escritura
+    @contextmanager
+    def transaccion(self):
+        if self.conexion is None or self.conexion.in_transaction:
+            yield self
+            return
+        self.conexion.execute("BEGIN")
+        try:
+            yield self
+        except BaseException:
+            self.conexion.execute("ROLLBACK")
+            raise
+        else:
+            self.conexion.execute("COMMIT")
+
+    # Método para cerrar la base de datos
+    def cerrar(self):
+        if self.conexion is not None:
+            self.conexion.close()
+            self.conexion = None
+
+    # Método que arma los índices de búsqueda exacta si quedaron pendientes
+    def preparar_indices(self):
+        if self.indices_pendientes:
+            self.indices_pendientes = False
+            # Partimos de cero: mientras estaban pendientes no se quitaron los libros prestados o eliminados
+            self.indices = {criterio: {} for criterio in CRITERIOS}
+            for libro in self.libros_disponibles.values():
+                for criterio, obtener in CRITERIOS.items():
+                    self.indices[criterio].setdefault(normalizar(obtener(libro)), {})[libro.isbn] = libro
+
+    # Método que arma el índice de texto si quedó pendiente
+    def preparar_texto(self):
+        if self.texto_pendiente:
+            self.texto_pendiente = False
+            self.indice_texto = IndiceTexto()  # Igual que arriba, el índice viejo puede tener libros de más
+            for libro in self.libros_disponibles.values():
+                self.indice_texto.agregar(libro.isbn, f"{libro.datos_basicos[0]} {libro.datos_basicos[1]}")
+
+    # Método para agregar un libro disponible a los índices de búsqueda
+    def indexar(self, libro):
+        """
+        Registra un libro en los índices de búsqueda.
+
+        Args:
+            libro (Libro): Libro que pasa a estar disponible
+        """
+        if not self.indices_pendientes:  # Si están pendientes se armarán con todos los libros disponibles
+            for criterio, obtener in CRITERIOS.items():
+                self.indices[criterio].setdefault(normalizar(obtener(libro)), {})[libro.isbn] = libro
+        if not self.texto_pendiente:
+            self.indice_texto.agregar(libro.isbn, f"{libro.datos_basicos[0]} {libro.datos_basicos[1]}")
+
+    # Método para quitar un libro de los índices de búsqueda
+    def desindexar(self, libro):
+        """
+        Quita un libro de los índices de búsqueda.
+
+        Args:
+            libro (Libro): Libro que deja de estar disponible
+        """
+        if not self.indices_pendientes:
+            for criterio, obtener in CRITERIOS.items():
+                indice = self.indices[criterio]
+                clave = normalizar(obtener(libro))
+                libros = indice[clave]
+                del libros[libro.isbn]
+                if not libros:
+                    del indice[clave]  # No dejamos entradas vacías
+        if not self.texto_pendiente:
+            self.indice_texto.quitar(libro.isbn)
 
     # Método para añadir un libro a la biblioteca
-    def añadir_libro(self, libro):
+    def añadir_libro(self, libro, ejemplares=1):
         """
         Añade un libro nuevo a la biblioteca.
 
         Args:
             libro (Libro): Objeto libro a añadir
+            ejemplares (int): Cantidad de ejemplares del título
         """
-        if libro.isbn not in self.libros_disponibles:
+        if ejemplares < 1:
+            print(f"La cantidad de ejemplares debe ser al menos 1 (se indicó {ejemplares}).")
+        elif libro.isbn not in self.existencias:
+            self.escribir(self.SQL_AÑADIR_LIBRO, (libro.isbn, libro.datos_basicos[0], libro.datos_basicos[1],
+                                                  libro.categoria, ejemplares))
+            existencias = self.existencias[libro.isbn] = Existencias(libro, ejemplares)
             self.libros_disponibles[libro.isbn] = libro
-            print(f"Libro añadido: {libro}")
+            self.indexar(libro)
+            print(f"Libro añadido: {existencias}")
         else:
-            print(f"El libro con ISBN {libro.isbn} ya está registrado.")
+            print(f"El libro con ISBN {libro.isbn} ya está registrado; use añadir_ejemplares para sumar copias.")
+
+    # Método para añadir muchos libros de una vez (por ejemplo al migrar un catálogo)
+    def añadir_libros(self, libros, ejemplares=1):
+        """
+        Añade varios libros sin imprimir cada uno y con una sola transacción en la base.
+        Los ISBN ya registrados o repetidos se descartan.
+
+        Args:
+            libros (iterable): Objetos Libro a añadir
+            ejemplares (int): Cantidad de ejemplares de cada título
+
+        Returns:
+            int: Cantidad de libros añadidos
+        """
+        nuevos = {}
+        repetidos = 0
+        for libro in libros:
+            if libro.isbn in self.existencias or libro.isbn in nuevos:
+                repetidos += 1
+            else:
+                nuevos[libro.isbn] = libro
+        if self.conexion is not None:
+            with self.transaccion():
+                self.conexion.executemany(self.SQL_AÑADIR_LIBRO, (
+                    (libro.isbn, libro.datos_basicos[0], libro.datos_basicos[1], libro.categoria, ejemplares)
+                    for libro in nuevos.values()))
+        if len(nuevos) > len(self.libros_disponibles):
+            # Más barato rearmar los índices en la próxima búsqueda que actualizarlos libro por libro
+            self.indices_pendientes = self.texto_pendiente = True
+        with sin_recolector():
+            for isbn, libro in nuevos.items():
+                self.existencias[isbn] = Existencias(libro, ejemplares)
+        self.libros_disponibles.update(nuevos)
+        for libro in nuevos.values():
+            self.indexar(libro)
+        print(f"Libros añadidos: {len(nuevos)} ({repetidos} ya estaban registrados).")
+        return len(nuevos)
+
+    # Método para sumar ejemplares a un título que ya está en el catálogo
+    def añadir_ejemplares(self, isbn, cantidad=1):
+        """
+        Añade copias de un libro registrado. Si hay reservas, los ejemplares nuevos se prestan
+        primero a quienes esperan, en orden de llegada.
+
+        Args:
+            isbn (str): ISBN del libro
+            cantidad (int): Cantidad de ejemplares a añadir
+        """
+        existencias = self.existencias.get(isbn)
+        if existencias is None:
+            print(f"No se encontró ningún libro con ISBN {isbn}.")
+            return
+        if cantidad < 1:
+            print(f"La cantidad de ejemplares debe ser al menos 1 (se indicó {cantidad}).")
+            return
+        with self.transaccion():
+            self.escribir(self.SQL_EJEMPLARES, (existencias.total + cantidad, isbn))
+            numeros = range(existencias.total + 1, existencias.total + cantidad + 1)
+            existencias.total += cantidad
+            for numero in numeros:
+                self.reponer(existencias, numero)
+        print(f"Ejemplares añadidos: {existencias}")
 
     # Método para eliminar un libro de la biblioteca
     def quitar_libro(self, isbn):
         """
-        Elimina un libro de la biblioteca por su ISBN.
+        Elimina un libro de la biblioteca por su ISBN, con todos sus ejemplares. Solo se puede
+        si ninguno está prestado (y entonces tampoco hay reservas).
 
         Args:
             isbn (str): ISBN del libro a eliminar
         """
-        if isbn in self.libros_disponibles:
+        existencias = self.existencias.get(isbn)
+        if existencias is None:
+            print(f"No se encontró ningún libro con ISBN {isbn}.")
+        elif existencias.prestados:
+            print(f"El libro con ISBN {isbn} tiene {len(existencias.prestados)} ejemplares prestados; "
+                  f"deben devolverse antes de quitarlo.")
+        else:
+            self.escribir(self.SQL_QUITAR_LIBRO, (isbn,))
+            del self.existencias[isbn]
             eliminado = self.libros_disponibles.pop(isbn)
+            self.desindexar(eliminado)
             print(f"Libro eliminado: {eliminado}")
-        else:
-            print(f"No se encontró ningún libro con ISBN {isbn}.")
 
     # Método para registrar un usuario
     def registrar_usuario(self, usuario):
@@ -98,6 +665,7 @@ class Biblioteca:
             usuario (Usuario): Objeto usuario a registrar
         """
         if usuario.id_usuario not in self.usuarios_registrados:
+            self.escribir(self.SQL_AÑADIR_USUARIO, (usuario.id_usuario, usuario.nombre))
             self.usuarios_registrados[usuario.id_usuario] = usuario
             print(f"Usuario registrado: {usuario}")
         else:
@@ -106,32 +674,148 @@ class Biblioteca:
     # Método para dar de baja a un usuario
     def dar_baja_usuario(self, id_usuario):
         """
-        Elimina un usuario de la biblioteca.
+        Elimina un usuario de la biblioteca y cancela sus reservas.
 
         Args:
             id_usuario (str): ID del usuario a eliminar
         """
-        if id_usuario in self.usuarios_registrados:
+        usuario = self.usuarios_registrados.get(id_usuario)
+        if usuario is not None and usuario.libros_prestados:
+            print(f"El usuario con ID {id_usuario} tiene {len(usuario.libros_prestados)} libros prestados; "
+                  f"debe devolverlos antes de darse de baja.")
+        elif usuario is not None:
+            with self.transaccion():
+                for isbn in list(usuario.reservas):
+                    self.cancelar_reserva(isbn, usuario)
+                self.escribir(self.SQL_QUITAR_USUARIO, (id_usuario,))
             del self.usuarios_registrados[id_usuario]
             print(f"Usuario con ID {id_usuario} eliminado del sistema.")
         else:
             print(f"No se encontró ningún usuario con ID {id_usuario}.")
 
+    # Método para consultar cuántos ejemplares de un libro hay en estante
+    def disponibilidad(self, isbn):
+        """
+        Consulta en O(1) los ejemplares disponibles y totales de un libro.
+
+        Args:
+            isbn (str): ISBN del libro
+
+        Returns:
+            tuple: (disponibles, total); (0, 0) si el libro no está en el catálogo
+        """
+        existencias = self.existencias.get(isbn)
+        if existencias is None:
+            return 0, 0
+        return len(existencias.disponibles), existencias.total
+
+    # Método que entrega un ejemplar concreto a un usuario
+    def entregar(self, existencias, numero, usuario):
+        """
+        Registra el préstamo de un ejemplar que ya salió del estante.
+
+        Args:
+            existencias (Existencias): Título al que pertenece el ejemplar
+            numero (int): Número del ejemplar
+            usuario (Usuario): Usuario que se lo lleva
+        """
+        isbn = existencias.libro.isbn
+        self.escribir(self.SQL_PRESTAR, (isbn, numero, usuario.id_usuario, usuario.nombre))  # Una fila por préstamo
+        existencias.prestados[numero] = usuario
+        usuario.libros_prestados[isbn] = existencias.libro
+        usuario.ejemplares[isbn] = numero
+
+    # Método que saca del estante un ejemplar y se lo presta a un usuario
+    def sacar_ejemplar(self, existencias, usuario):
+        """
+        Presta el próximo ejemplar disponible; si era el último, el título deja de estar disponible.
+
+        Args:
+            existencias (Existencias): Título con al menos un ejemplar disponible
+            usuario (Usuario): Usuario que se lo lleva
+
+        Returns:
+            int: Número del ejemplar prestado
+        """
+        numero = existencias.disponibles[-1]
+        self.entregar(existencias, numero, usuario)
+        existencias.disponibles.pop()
+        if not existencias.disponibles:
+            libro = self.libros_disponibles.pop(existencias.libro.isbn)
+            self.desindexar(libro)
+        return numero
+
+    # Método que vuelve a poner en circulación un ejemplar devuelto o nuevo
+    def reponer(self, existencias, numero):
+        """
+        Si alguien espera el título, le presta el ejemplar; si no, lo deja en el estante.
+
+        Args:
+            existencias (Existencias): Título al que pertenece el ejemplar
+            numero (int): Número del ejemplar
+        """
+        libro = existencias.libro
+        if existencias.reservas:
+            usuario = existencias.reservas[0]
+            self.escribir(self.SQL_QUITAR_RESERVA, (libro.isbn, usuario.id_usuario))
+            self.entregar(existencias, numero, usuario)  # Escribe en la base antes de tocar la memoria
+            existencias.reservas.popleft()
+            usuario.reservas.discard(libro.isbn)
+            print(f"Libro prestado: {libro} (ejemplar {numero}) a {usuario.nombre}, primero en la lista de reservas")
+            return
+        existencias.disponibles.append(numero)
+        if len(existencias.disponibles) == 1:  # Vuelve a haber un ejemplar en estante
+            self.libros_disponibles[libro.isbn] = libro
+            self.indexar(libro)
+
     # Método para prestar un libro
     def prestar_libro(self, isbn, usuario):
         """
-        Presta un libro a un usuario.
+        Presta un ejemplar de un libro a un usuario. Cada usuario puede tener un solo
+        ejemplar de cada título.
 
         Args:
             isbn (str): ISBN del libro a prestar
             usuario (Usuario): Usuario que solicita el préstamo
+
+        Returns:
+            bool: True si se prestó un ejemplar
         """
-        if isbn in self.libros_disponibles:
-            libro = self.libros_disponibles.pop(isbn)
-            usuario.libros_prestados.append(libro)
-            print(f"Libro prestado: {libro} a {usuario.nombre}")
-        else:
+        existencias = self.existencias.get(isbn)
+        if existencias is None or not existencias.disponibles:
             print(f"El libro con ISBN {isbn} no está disponible.")
+        elif isbn in usuario.libros_prestados:
+            print(f"{usuario.nombre} ya tiene un ejemplar del libro con ISBN {isbn}.")
+        else:
+            numero = self.sacar_ejemplar(existencias, usuario)
+            print(f"Libro prestado: {existencias.libro} (ejemplar {numero}) a {usuario.nombre}")
+            return True
+        return False
+
+    # Método para procesar muchos préstamos de una vez (por ejemplo el mostrador de una sucursal)
+    def prestar_libros(self, pedidos):
+        """
+        Presta varios libros sin imprimir cada préstamo y con una sola transacción en la base.
+        Los pedidos de libros sin ejemplares disponibles o que el usuario ya tiene se descartan.
+
+        Args:
+            pedidos (iterable): Pares (isbn, usuario)
+
+        Returns:
+            int: Cantidad de préstamos realizados
+        """
+        prestados = rechazados = 0
+        existencias = self.existencias  # Variable local: este ciclo se repite por cada pedido
+        with self.transaccion():
+            for isbn, usuario in pedidos:
+                titulo = existencias.get(isbn)
+                if titulo is None or not titulo.disponibles or isbn in usuario.libros_prestados:
+                    rechazados += 1
+                else:
+                    self.sacar_ejemplar(titulo, usuario)
+                    prestados += 1
+        print(f"Libros prestados: {prestados} ({rechazados} pedidos no se pudieron atender).")
+        return prestados
 
     # Método para devolver un libro
     def devolver_libro(self, isbn, usuario):
@@ -142,32 +826,176 @@ class Biblioteca:
             isbn (str): ISBN del libro a devolver
             usuario (Usuario): Usuario que devuelve el libro
         """
-        for libro in usuario.libros_prestados:
-            if libro.isbn == isbn:
-                usuario.libros_prestados.remove(libro)
-                self.libros_disponibles[isbn] = libro
-                print(f"Libro devuelto: {libro}")
-                return
-        print(f"El usuario {usuario.nombre} no tiene ningún libro con ISBN {isbn}.")
+        if isbn not in usuario.libros_prestados:
+            print(f"El usuario {usuario.nombre} no tiene ningún libro con ISBN {isbn}.")
+            return
+        numero = usuario.ejemplares[isbn]
+        existencias = self.existencias[isbn]
+        # Si alguien espera el libro, la devolución, la reserva atendida y el préstamo nuevo se
+        # confirman juntos: un corte en el medio no deja el ejemplar en estante con la reserva en cola.
+        # reponer escribe en la base antes de tocar la memoria, y los datos de quien devuelve se
+        # cambian al final: si una escritura falla, la memoria queda como estaba
+        with self.transaccion():
+            self.escribir(self.SQL_DEVOLVER, (isbn, numero))
+            print(f"Libro devuelto: {existencias.libro} (ejemplar {numero})")
+            self.reponer(existencias, numero)
+            if existencias.prestados[numero] is usuario:  # Nadie lo esperaba: el ejemplar volvió al estante
+                del existencias.prestados[numero]
+            del usuario.libros_prestados[isbn]
+            del usuario.ejemplares[isbn]
+
+    # Método para procesar devoluciones en lote, sin saber de antemano quién tiene cada ejemplar
+    def devolver_libros(self, ejemplares):
+        """
+        Registra la devolución de varios ejemplares buscando quién tiene cada uno en el registro.
+
+        Args:
+            ejemplares (iterable): Identificadores de los ejemplares devueltos (ISBN-número)
+
+        Returns:
+            int: Cantidad de ejemplares devueltos
+        """
+        devueltos = 0
+        with self.transaccion():  # Con archivo, todo el lote se confirma de una vez
+            for identificador in ejemplares:
+                isbn, numero = separar_ejemplar(identificador)
+                existencias = self.existencias.get(isbn)
+                usuario = existencias.prestados.get(numero) if existencias is not None else None
+                if usuario is None:
+                    print(f"El ejemplar {identificador} no figura como prestado.")
+                    continue
+                self.devolver_libro(isbn, usuario)
+                devueltos += 1
+        return devueltos
+
+    # Método para anotar a un usuario en la lista de espera de un libro
+    def reservar_libro(self, isbn, usuario):
+        """
+        Reserva un libro sin ejemplares disponibles. El primer ejemplar que se devuelva (o se
+        añada) se presta al primero de la lista.
+
+        Args:
+            isbn (str): ISBN del libro
+            usuario (Usuario): Usuario que reserva
+
+        Returns:
+            int: Posición en la lista de reservas, o 0 si no se registró la reserva
+        """
+        existencias = self.existencias.get(isbn)
+        if existencias is None:
+            print(f"No se encontró ningún libro con ISBN {isbn}.")
+        elif isbn in usuario.libros_prestados:
+            print(f"{usuario.nombre} ya tiene un ejemplar del libro con ISBN {isbn}.")
+        elif isbn in usuario.reservas:
+            print(f"{usuario.nombre} ya está en la lista de reservas del libro con ISBN {isbn}.")
+        elif existencias.disponibles:
+            print(f"El libro con ISBN {isbn} tiene {len(existencias.disponibles)} ejemplares disponibles; "
+                  f"puede pedirse prestado.")
+        else:
+            self.escribir(self.SQL_RESERVAR, (isbn, usuario.id_usuario, usuario.nombre))
+            if existencias.reservas is None:
+                existencias.reservas = deque()
+            existencias.reservas.append(usuario)
+            usuario.reservas.add(isbn)
+            posicion = len(existencias.reservas)
+            print(f"Reserva registrada: {usuario.nombre} es el número {posicion} en espera de {existencias.libro}")
+            return posicion
+        return 0
+
+    # Método para sacar a un usuario de la lista de espera de un libro
+    def cancelar_reserva(self, isbn, usuario):
+        """
+        Cancela la reserva de un usuario.
+
+        Args:
+            isbn (str): ISBN del libro reservado
+            usuario (Usuario): Usuario que cancela
+        """
+        if isbn not in usuario.reservas:
+            print(f"{usuario.nombre} no tiene reservado el libro con ISBN {isbn}.")
+            return
+        self.escribir(self.SQL_QUITAR_RESERVA, (isbn, usuario.id_usuario))
+        self.existencias[isbn].reservas.remove(usuario)  # La lista de espera de un título es corta
+        usuario.reservas.discard(isbn)
+        print(f"Reserva cancelada: {usuario.nombre} ya no espera el libro con ISBN {isbn}.")
+
+    # Método para saber quién tiene un libro
+    def quien_tiene(self, isbn):
+        """
+        Busca en el registro de préstamos a los usuarios que tienen ejemplares de un libro.
+
+        Args:
+            isbn (str): ISBN del libro
+
+        Returns:
+            dict: Número de ejemplar -> Usuario que lo tiene (vacío si no hay ejemplares prestados)
+        """
+        existencias = self.existencias.get(isbn)
+        return dict(existencias.prestados) if existencias is not None else {}
+
+    # Método para comprobar que el registro de préstamos coincide con los libros de cada usuario
+    def verificar_prestamos(self):
+        """
+        Revisa la consistencia entre las existencias de cada título, los libros de cada usuario,
+        las reservas y los libros disponibles.
+
+        Returns:
+            list: Descripción de cada problema encontrado (vacía si todo está bien)
+        """
+        problemas = []
+        usuarios = {id(usuario): usuario for usuario in self.usuarios_registrados.values()}
+        for isbn, existencias in self.existencias.items():
+            disponibles = existencias.disponibles
+            if sorted(disponibles + list(existencias.prestados)) != list(range(1, existencias.total + 1)):
+                problemas.append(f"ISBN {isbn}: los ejemplares disponibles y prestados no suman "
+                                 f"los {existencias.total} del título")
+            if bool(disponibles) != (isbn in self.libros_disponibles):
+                problemas.append(f"ISBN {isbn}: la lista de libros disponibles no coincide con sus ejemplares")
+            if disponibles and existencias.reservas:
+                problemas.append(f"ISBN {isbn}: hay ejemplares en estante y reservas en espera")
+            for numero, usuario in existencias.prestados.items():
+                usuarios[id(usuario)] = usuario
+                if usuario.ejemplares.get(isbn) != numero:
+                    problemas.append(f"Ejemplar {id_ejemplar(isbn, numero)}: registrado a {usuario.id_usuario} "
+                                     f"pero no está en sus préstamos")
+            for usuario in existencias.reservas or ():
+                usuarios[id(usuario)] = usuario
+                if isbn not in usuario.reservas:
+                    problemas.append(f"ISBN {isbn}: {usuario.id_usuario} está en la lista de reservas "
+                                     f"pero no tiene la reserva")
+        for isbn in self.libros_disponibles:
+            if isbn not in self.existencias:
+                problemas.append(f"ISBN {isbn}: figura disponible pero no está en el catálogo")
+        for usuario in usuarios.values():
+            if usuario.libros_prestados.keys() != usuario.ejemplares.keys():
+                problemas.append(f"Usuario {usuario.id_usuario}: sus libros y sus ejemplares prestados no coinciden")
+            for isbn, numero in usuario.ejemplares.items():
+                existencias = self.existencias.get(isbn)
+                if existencias is None or existencias.prestados.get(numero) is not usuario:
+                    problemas.append(f"Ejemplar {id_ejemplar(isbn, numero)}: está en los préstamos de "
+                                     f"{usuario.id_usuario} pero no en el registro")
+            for isbn in usuario.reservas:
+                existencias = self.existencias.get(isbn)
+                if existencias is None or usuario not in (existencias.reservas or ()):
+                    problemas.append(f"ISBN {isbn}: {usuario.id_usuario} tiene la reserva pero no está en la lista")
+        return problemas
 
     # Método para buscar libros por criterio
     def buscar_libros(self, criterio, valor):
         """
-        Busca libros según un criterio específico.
+        Busca libros disponibles según un criterio específico, sin distinguir mayúsculas.
+        Usa los índices, así el costo depende de la cantidad de resultados y no del catálogo.
 
         Args:
-            criterio (str): Campo por el que buscar ('categoria', 'datos_basicos', etc.)
+            criterio (str): Campo por el que buscar ('titulo', 'autor' o 'categoria')
             valor (str): Valor a buscar
-        """
-        resultados = []
 
-        for libro in self.libros_disponibles.values():
-            if criterio == 'titulo' and libro.datos_basicos[0].lower() == valor.lower():
-                resultados.append(libro)
-            elif criterio == 'autor' and libro.datos_basicos[1].lower() == valor.lower():
-                resultados.append(libro)
-            elif criterio == 'categoria' and libro.categoria.lower() == valor.lower():
-                resultados.append(libro)
+        Returns:
+            list: Libros encontrados
+        """
+        self.preparar_indices()
+        indice = self.indices.get(criterio, {})
+        resultados = list(indice.get(normalizar(valor), {}).values())
 
         if resultados:
             print("Resultados de búsqueda:")
@@ -175,6 +1003,31 @@ class Biblioteca:
                 print(libro)
         else:
             print(f"No se encontraron libros con {criterio}: {valor}.")
+        return resultados
+
+    # Método para buscar libros por palabras del título o del autor
+    def buscar_texto(self, consulta, k=10):
+        """
+        Busca libros disponibles por palabras del título o del autor, sin importar tildes ni
+        mayúsculas, y los ordena por relevancia (BM25). La última palabra puede estar incompleta.
+
+        Args:
+            consulta (str): Palabras a buscar, por ejemplo "garcia marquez soled"
+            k (int): Cantidad máxima de resultados
+
+        Returns:
+            list: Pares (Libro, puntaje) de mayor a menor relevancia
+        """
+        self.preparar_texto()
+        resultados = [(self.libros_disponibles[isbn], puntaje)
+                      for isbn, puntaje in self.indice_texto.buscar(consulta, k)]
+        if resultados:
+            print("Resultados de búsqueda:")
+            for libro, puntaje in resultados:
+                print(f"{libro} [{puntaje:.2f}]")
+        else:
+            print(f"No se encontraron libros para: {consulta}.")
+        return resultados
 
     # Método para listar libros prestados a un usuario
     def listar_libros_prestados(self, usuario):
@@ -186,12 +1039,243 @@ class Biblioteca:
         """
         if usuario.libros_prestados:
             print(f"Libros prestados a {usuario.nombre}:")
-            for libro in usuario.libros_prestados:
-                print(libro)
+            for isbn, libro in usuario.libros_prestados.items():
+                print(f"{libro} (ejemplar {usuario.ejemplares[isbn]})")
         else:
             print(f"{usuario.nombre} no tiene libros prestados actualmente.")
 
 
+# Búsqueda recorriendo todo el catálogo, como se hacía antes de los índices (para comparar)
+def buscar_por_recorrido(biblioteca, criterio, valor):
+    """
+    Busca libros disponibles comparando cada entrada del catálogo.
+
+    Args:
+        biblioteca (Biblioteca): Biblioteca donde buscar
+        criterio (str): 'titulo', 'autor' o 'categoria'
+        valor (str): Valor a buscar
+
+    Returns:
+        list: Libros encontrados
+    """
+    obtener = CRITERIOS[criterio]
+    valor = normalizar(valor)
+    return [libro for libro in biblioteca.libros_disponibles.values() if normalizar(obtener(libro)) == valor]
+
+
+def benchmark_busqueda(cantidad_libros=1000000, busquedas=100):
+    """
+    Compara buscar_libros (con índices) contra el recorrido completo del catálogo.
+
+    Args:
+        cantidad_libros (int): Tamaño del catálogo de prueba
+        busquedas (int): Búsquedas por criterio
+    """
+    biblioteca = Biblioteca()
+    with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+        for i in range(cantidad_libros):
+            biblioteca.añadir_libro(Libro(f"Título {i}", f"Autor {i % 50000}", f"Categoría {i % 200}", str(i)))
+    consultas = {"titulo": [f"título {i * 7919 % cantidad_libros}" for i in range(busquedas)],
+                 "autor": [f"AUTOR {i * 31 % 50000}" for i in range(busquedas)],
+                 "categoria": [f"categoría {i % 200}" for i in range(busquedas)]}
+    print(f"{'Criterio':<10} {'Recorrido (ms)':>15} {'Índice (ms)':>12} {'Resultados':>11}")
+    for criterio, valores in consultas.items():
+        inicio = time.perf_counter()
+        for valor in valores[:5]:  # El recorrido es lento, con pocas repeticiones alcanza
+            esperado = buscar_por_recorrido(biblioteca, criterio, valor)
+        t_recorrido = (time.perf_counter() - inicio) / len(valores[:5])
+        with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+            inicio = time.perf_counter()
+            for valor in valores:
+                resultados = biblioteca.buscar_libros(criterio, valor)
+            t_indice = (time.perf_counter() - inicio) / len(valores)
+        # Los dos métodos deben devolver los mismos libros en el mismo orden
+        assert resultados == buscar_por_recorrido(biblioteca, criterio, valores[-1])
+        print(f"{criterio:<10} {t_recorrido * 1000:>15.2f} {t_indice * 1000:>12.4f} {len(esperado):>11}")
+
+
+def benchmark_texto(cantidad_libros=1000000, busquedas=200):
+    """
+    Mide el armado del índice de texto y el tiempo de buscar_texto con consultas de una palabra,
+    de varias palabras y con prefijo, comparado con recorrer todos los títulos.
+
+    Args:
+        cantidad_libros (int): Tamaño del catálogo de prueba
+        busquedas (int): Búsquedas por tipo de consulta
+    """
+    azar = random.Random(1)
+    raices = ["soledad", "años", "amor", "cólera", "tiempo", "ciudad", "perros", "casa", "espíritus",
+              "guerra", "paz", "noche", "mar", "montaña", "río", "sombra", "canción", "invierno"]
+    vocabulario = raices + [f"{raiz}{i}" for raiz in raices for i in range(2000)]  # ~36.000 palabras
+    autores = [f"{azar.choice(['García', 'Márquez', 'Núñez', 'Peña', 'López'])} {i}" for i in range(20000)]
+    libros = [Libro(" ".join(azar.choices(vocabulario, k=azar.randint(2, 6))), azar.choice(autores),
+                    "Ficción", str(i)) for i in range(cantidad_libros)]
+    biblioteca = Biblioteca()
+    inicio = time.perf_counter()
+    with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+        for libro in libros:
+            biblioteca.añadir_libro(libro)
+    print(f"Catálogo de {cantidad_libros} libros cargado e indexado en {time.perf_counter() - inicio:.1f} s")
+    consultas = {
+        "una palabra": [azar.choice(vocabulario) for _ in range(busquedas)],
+        "tres palabras": [" ".join(azar.choices(vocabulario, k=3)) for _ in range(busquedas)],
+        "prefijo": [azar.choice(vocabulario)[:5] for _ in range(busquedas)],
+        "autor sin tildes": [plegar(azar.choice(autores)) for _ in range(busquedas)],
+    }
+    print(f"{'Consulta':<18} {'Índice (ms)':>12}")
+    for tipo, lista in consultas.items():
+        with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+            inicio = time.perf_counter()
+            for consulta in lista:
+                biblioteca.buscar_texto(consulta)
+            duracion = time.perf_counter() - inicio
+        print(f"{tipo:<18} {duracion / len(lista) * 1000:>12.2f}")
+    buscada = plegar(consultas["una palabra"][0])
+    inicio = time.perf_counter()
+    [libro for libro in biblioteca.libros_disponibles.values() if buscada in plegar(libro.datos_basicos[0])]
+    print(f"{'recorrido':<18} {(time.perf_counter() - inicio) * 1000:>12.2f}")
+
+
+def benchmark_prestamos(cantidad_libros=200000, usuarios=10):
+    """
+    Presta todo el catálogo a pocos usuarios (cada uno con muchos libros) y procesa la devolución
+    en lote en orden aleatorio; compara con devolver recorriendo una lista por usuario como antes.
+
+    Args:
+        cantidad_libros (int): Libros prestados en total
+        usuarios (int): Cantidad de usuarios entre los que se reparten
+    """
+    biblioteca = Biblioteca()
+    lectores = [Usuario(f"Lector {i}", f"USR{i}") for i in range(usuarios)]
+    isbns = [str(i) for i in range(cantidad_libros)]
+    with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+        for i, isbn in enumerate(isbns):
+            biblioteca.añadir_libro(Libro(f"Título {i}", f"Autor {i}", "Ficción", isbn))
+        inicio = time.perf_counter()
+        for i, isbn in enumerate(isbns):
+            biblioteca.prestar_libro(isbn, lectores[i % usuarios])
+        t_prestar = time.perf_counter() - inicio
+        assert not biblioteca.verificar_prestamos()
+        random.Random(1).shuffle(isbns)
+        ejemplares = [id_ejemplar(isbn, 1) for isbn in isbns]
+        inicio = time.perf_counter()
+        biblioteca.devolver_libros(ejemplares)
+        t_devolver = time.perf_counter() - inicio
+    assert not biblioteca.verificar_prestamos() and len(biblioteca.libros_disponibles) == cantidad_libros
+    # Referencia: devolver buscando en una lista por usuario (solo una muestra, es cuadrático)
+    listas = [[isbn for isbn in map(str, range(u, cantidad_libros, usuarios))] for u in range(usuarios)]
+    muestra = isbns[:1000]
+    inicio = time.perf_counter()
+    for isbn in muestra:
+        listas[int(isbn) % usuarios].remove(isbn)
+    t_lista = (time.perf_counter() - inicio) / len(muestra)
+    print(f"Prestar:  {cantidad_libros / t_prestar:>10.0f} préstamos/s")
+    print(f"Devolver: {cantidad_libros / t_devolver:>10.0f} devoluciones/s (registro)")
+    print(f"Devolver: {1 / t_lista:>10.0f} devoluciones/s (lista por usuario, solo la búsqueda)")
+
+
+def benchmark_ejemplares(titulos=20000, copias=40, usuarios=50000, pedidos=500000):
+    """
+    Con muchos ejemplares por título: mide consultas de disponibilidad, préstamos en lote con
+    prestar_libros, reservas de títulos agotados y devoluciones que atienden esas reservas.
+    Como referencia, consulta la disponibilidad como antes, con un ISBN falso por ejemplar.
+
+    Args:
+        titulos (int): Cantidad de títulos del catálogo
+        copias (int): Ejemplares de cada título
+        usuarios (int): Cantidad de lectores
+        pedidos (int): Pedidos de préstamo a procesar
+    """
+    azar = random.Random(1)
+    biblioteca = Biblioteca()
+    lectores = [Usuario(f"Lector {i}", f"USR{i}") for i in range(usuarios)]
+    isbns = [str(i) for i in range(titulos)]
+    populares = isbns[:titulos // 100]  # Pocos títulos reciben la mitad de los pedidos y se agotan
+    with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+        biblioteca.añadir_libros((Libro(f"Título {i}", f"Autor {i}", "Ficción", isbn)
+                                  for i, isbn in enumerate(isbns)), ejemplares=copias)
+        lista = [(azar.choice(populares if azar.random() < 0.5 else isbns), azar.choice(lectores))
+                 for _ in range(pedidos)]
+        inicio = time.perf_counter()
+        prestados = biblioteca.prestar_libros(lista)
+        t_prestar = time.perf_counter() - inicio
+        consultas = [azar.choice(isbns) for _ in range(100000)]
+        inicio = time.perf_counter()
+        for isbn in consultas:
+            biblioteca.disponibilidad(isbn)
+        t_consulta = (time.perf_counter() - inicio) / len(consultas)
+        inicio = time.perf_counter()
+        reservas = sum(1 for isbn in populares for lector in azar.sample(lectores, 20)
+                       if biblioteca.reservar_libro(isbn, lector))
+        t_reservar = (time.perf_counter() - inicio) / (len(populares) * 20)
+        ejemplares = [id_ejemplar(isbn, numero) for isbn, titulo in biblioteca.existencias.items()
+                      for numero in titulo.prestados]
+        azar.shuffle(ejemplares)
+        inicio = time.perf_counter()
+        devueltos = biblioteca.devolver_libros(ejemplares)
+        t_devolver = time.perf_counter() - inicio
+    assert not biblioteca.verificar_prestamos()
+    # Referencia: un ISBN falso por ejemplar; contar los disponibles de un título recorre todas sus copias
+    falsos = {f"{isbn}-{n}" for isbn in isbns for n in range(1, copias + 1, 2)}
+    inicio = time.perf_counter()
+    for isbn in consultas[:10000]:
+        sum(1 for n in range(1, copias + 1) if f"{isbn}-{n}" in falsos)
+    t_falsos = (time.perf_counter() - inicio) / 10000
+    print(f"Préstamos en lote:        {prestados / t_prestar:>10.0f} por segundo ({prestados} de {pedidos} pedidos)")
+    print(f"Disponibilidad:           {t_consulta * 1e6:>10.2f} µs por consulta")
+    print(f"Disponibilidad (ISBN falso por ejemplar): {t_falsos * 1e6:>6.2f} µs por consulta")
+    print(f"Reservar:                 {t_reservar * 1e6:>10.2f} µs ({reservas} reservas)")
+    print(f"Devolver (con reservas):  {devueltos / t_devolver:>10.0f} por segundo")
+
+
+def benchmark_persistencia(cantidad_libros=1000000, operaciones=20000):
+    """
+    Con una base SQLite temporal: importa el catálogo con añadir_libros, mide cuánto tarda en
+    abrirse la biblioteca, el ritmo de préstamos y devoluciones (una escritura pequeña cada uno)
+    y la primera búsqueda, que arma los índices pendientes.
+
+    Args:
+        cantidad_libros (int): Tamaño del catálogo
+        operaciones (int): Préstamos (y luego devoluciones) a medir
+    """
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = os.path.join(directorio, "biblioteca.db")
+        with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+            biblioteca = Biblioteca(archivo)
+            inicio = time.perf_counter()
+            biblioteca.añadir_libros(Libro(f"Título {i}", f"Autor {i % 50000}", f"Categoría {i % 200}", str(i))
+                                     for i in range(cantidad_libros))
+            t_importar = time.perf_counter() - inicio
+            biblioteca.registrar_usuario(Usuario("Lector", "USR1"))
+            biblioteca.cerrar()
+            inicio = time.perf_counter()
+            biblioteca = Biblioteca(archivo)
+            t_abrir = time.perf_counter() - inicio
+            lector = biblioteca.usuarios_registrados["USR1"]
+            inicio = time.perf_counter()
+            for i in range(operaciones):
+                biblioteca.prestar_libro(str(i), lector)
+            t_prestar = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            for i in range(operaciones):
+                biblioteca.devolver_libro(str(i), lector)
+            t_devolver = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            biblioteca.buscar_libros("autor", "Autor 7")
+            t_indices = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            biblioteca.buscar_texto("titulo 12345")
+            t_texto = time.perf_counter() - inicio
+            biblioteca.cerrar()
+        megas = os.path.getsize(archivo) / 1e6
+    print(f"Importar {cantidad_libros} libros:   {t_importar:8.2f} s  (base de {megas:.0f} MB)")
+    print(f"Abrir la biblioteca:          {t_abrir:8.2f} s")
+    print(f"Prestar (una fila cada uno):  {operaciones / t_prestar:8.0f} por segundo")
+    print(f"Devolver (una fila cada uno): {operaciones / t_devolver:8.0f} por segundo")
+    print(f"Primera búsqueda exacta:      {t_indices:8.2f} s  (arma los índices)")
+    print(f"Primera búsqueda de texto:    {t_texto:8.2f} s  (arma el índice de texto)")
+
+
 # Demostración del sistema
 if __name__ == "__main__":
     # Instanciar objetos de las clases Libro, Usuario y Biblioteca
@@ -201,8 +1285,8 @@ if __name__ == "__main__":
     usuario2 = Usuario("Andrea", "USR002")
     biblioteca = Biblioteca()
 
-    # Añadir libros a la biblioteca
-    biblioteca.añadir_libro(libro1)
+    # Añadir libros a la biblioteca (dos ejemplares del primero)
+    biblioteca.añadir_libro(libro1, ejemplares=2)
     biblioteca.añadir_libro(libro2)
 
     # Registrar usuarios en la biblioteca
@@ -212,14 +1296,25 @@ if __name__ == "__main__":
     # Prestar un libro a un usuario
     biblioteca.prestar_libro("9788437604947", usuario1)
 
-    # Mostrar libros prestados al usuario
+    # Mostrar libros prestados al usuario y consultar quién tiene el libro
+    biblioteca.listar_libros_prestados(usuario1)
+    tienen = biblioteca.quien_tiene("9788437604947")
+    print(f"El libro 9788437604947 lo tienen: {[usuario.nombre for usuario in tienen.values()]}")
+
+    # Prestar el otro ejemplar, reservar el libro agotado y devolver: pasa al primero de la lista
+    biblioteca.prestar_libro("9788437604947", usuario2)
+    print(f"Ejemplares disponibles de 9788437604947 (disponibles, total): {biblioteca.disponibilidad('9788437604947')}")
+    biblioteca.prestar_libro("9788498381492", usuario2)
+    biblioteca.reservar_libro("9788498381492", usuario1)
+    biblioteca.devolver_libro("9788498381492", usuario2)
     biblioteca.listar_libros_prestados(usuario1)
 
-    # Devolver el libro prestado
-    biblioteca.devolver_libro("9788437604947", usuario1)
+    # Devolver los libros prestados
+    biblioteca.devolver_libros(["9788437604947-1", "9788437604947-2", "9788498381492-1"])
 
     # Buscar libros en la biblioteca
     biblioteca.buscar_libros("categoria", "Infantil")
+    biblioteca.buscar_texto("garcia marquez soled")
 
     # Mostrar el estado final del sistema
     print("\nEstado final:")
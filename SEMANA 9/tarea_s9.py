@@ -1,27 +1,11 @@
-class Item:  # Creamos nuestra clase Item
-    def __init__(self, id_item, nombre, cantidad, precio):  # Constructor con atributos
-        self.id_item = id_item
-        self.nombre = nombre
-        self.cantidad = cantidad
-        self.precio = precio
+import os
+import sys
 
-    def get_id(self):  #Metodo para el id
-        return self.id_item
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Carpeta que contiene el paquete inventario
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
 
-    def get_nombre(self):  # metodo para el nombre
-        return self.nombre
-
-    def get_cantidad(self):  # metodo para obtener la cantidad
-        return self.cantidad
-
-    def get_precio(self):  # metodo para obtener el precio
-        return self.precio
-
-    def set_cantidad(self, cantidad):  # metodo para establecer la cantidad
-        self.cantidad = cantidad
-
-    def set_precio(self, precio):  # metodo para establecer el precio 
-        self.precio = precio
+from inventario.modelo import Item  # El mismo Item que usan las semanas 10 y 11
 
 
 class Inventario:
@@ -0,0 +1,16 @@
+# Paquete del inventario: lo comparten las tareas de las semanas 9, 10 y 11.
+# Uso: from inventario import Inventario, Item, crear_inventario (o python -m inventario desde la raíz)
+
+from .modelo import Item, ItemVista, validar_fila, trigramas
+from .archivos import (
+    leer_json_por_partes, permisos_destino, escribir_atomico, FormatoJSON, FormatoJSONCompacto, FormatoBinario,
+    FORMATOS, convertir_archivo, EscritorSegundoPlano, tipo_de_archivo, leer_filas,
+)
+from .almacenes import AlmacenColumnar, AlmacenMmap
+from .reportes import MetricasInventario, AnaliticaInventario, CLAVES_ORDEN, paginar, escribir_tabla, IndicesRango
+from .core import Inventario
+from .estrategias import (
+    CerrojoLectoresEscritores, InventarioConcurrente, InventarioSQLite, ESTRATEGIAS, crear_inventario,
+    fragmento_de, InventarioFragmentado,
+)
+from .servidor import PublicadorCambios, seguir_cambios, ServidorInventario, servir
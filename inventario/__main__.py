@@ -0,0 +1,6 @@
+# python -m inventario: el mismo menú y opciones que SEMANA 11/inventario_2.py
+
+from .cli import main
+
+if __name__ == "__main__":
+    main()
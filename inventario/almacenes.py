@@ -0,0 +1,243 @@
+# Almacenes que reemplazan al diccionario de items: columnas en memoria o registros fijos con mmap
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from .modelo import Item, ItemVista
+
+
+class AlmacenColumnar:
+    """
+    Guarda los items en columnas paralelas en lugar de un objeto por producto:
+    array('q') para las cantidades, array('d') para los precios y nombres internados.
+    Se usa como el diccionario self.items de Inventario y devuelve ItemVista.
+    """
+
+    def __init__(self):
+        self.filas = {}  # ID -> número de fila en las columnas
+        self.ids = []  # ID de cada fila (None si la fila fue borrada)
+        self.nombres = []  # Nombre de cada fila (internado para compartir textos repetidos)
+        self.cantidades = array("q")  # Cantidad de cada fila como entero de 64 bits
+        self.precios = array("d")  # Precio de cada fila como flotante de 64 bits
+        self.huecos = 0  # Filas borradas que todavía ocupan lugar en las columnas
+
+    def __len__(self):
+        return len(self.filas)
+
+    def __contains__(self, id_item):
+        return id_item in self.filas
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __getitem__(self, id_item):
+        if id_item not in self.filas:
+            raise KeyError(id_item)
+        return ItemVista(self, id_item)
+
+    def nombre_de(self, id_item):
+        return self.nombres[self.filas[id_item]]
+
+    def cantidad_de(self, id_item):
+        return self.cantidades[self.filas[id_item]]
+
+    def precio_de(self, id_item):
+        return self.precios[self.filas[id_item]]
+
+    def poner_cantidad(self, id_item, cantidad):
+        self.cantidades[self.filas[id_item]] = cantidad
+
+    def poner_precio(self, id_item, precio):
+        self.precios[self.filas[id_item]] = precio
+
+    def __setitem__(self, id_item, item):
+        fila = self.filas.get(id_item)
+        if fila is None:  # Producto nuevo: agregamos una fila al final de cada columna
+            self.filas[id_item] = len(self.ids)
+            self.ids.append(id_item)
+            self.nombres.append(sys.intern(item.get_nombre()))
+            self.cantidades.append(item.get_cantidad())
+            self.precios.append(item.get_precio())
+        else:
+            self.nombres[fila] = sys.intern(item.get_nombre())
+            self.cantidades[fila] = item.get_cantidad()
+            self.precios[fila] = item.get_precio()
+
+    def pop(self, id_item, *defecto):
+        if id_item not in self.filas:
+            if defecto:
+                return defecto[0]
+            raise KeyError(id_item)
+        fila = self.filas.pop(id_item)
+        eliminado = Item(id_item, self.nombres[fila], self.cantidades[fila], self.precios[fila])
+        # Marcamos la fila como hueco para conservar el orden de inserción
+        self.ids[fila] = None
+        self.nombres[fila] = None
+        self.huecos += 1
+        if self.huecos > len(self.ids) // 2:
+            self.compactar()  # Cuando la mitad son huecos reescribimos las columnas (costo amortizado O(1))
+        return eliminado
+
+    # Metodo para quitar los huecos de las columnas
+    def compactar(self):
+        vivas = [fila for fila, id_item in enumerate(self.ids) if id_item is not None]
+        self.ids = [self.ids[fila] for fila in vivas]
+        self.nombres = [self.nombres[fila] for fila in vivas]
+        self.cantidades = array("q", (self.cantidades[fila] for fila in vivas))
+        self.precios = array("d", (self.precios[fila] for fila in vivas))
+        self.filas = {id_item: fila for fila, id_item in enumerate(self.ids)}
+        self.huecos = 0
+
+    def __delitem__(self, id_item):
+        self.pop(id_item)
+
+    def keys(self):
+        return [id_item for id_item in self.ids if id_item is not None]
+
+    # values() e items() son generadores para poder leer solo los primeros productos sin recorrer todos
+    def values(self):
+        return (ItemVista(self, id_item) for id_item in self.ids if id_item is not None)
+
+    def items(self):
+        return ((id_item, ItemVista(self, id_item)) for id_item in self.ids if id_item is not None)
+
+
+class AlmacenMmap:
+    """
+    Guarda los items en un archivo de registros de tamaño fijo accedido con mmap.
+    Cada registro tiene una marca de vigencia, la cantidad, el precio, el ID (32 bytes) y el nombre (64 bytes).
+    Cambiar cantidad o precio escribe solo esos bytes en su lugar, y abrir el archivo no decodifica
+    nombres ni crea objetos: solo se recorren los IDs para armar el índice ID -> fila.
+    """
+    firma = b"INVM\x01"
+    cabecera = struct.Struct("<5sq")  # firma, cantidad de registros usados (incluye los borrados)
+    registro = struct.Struct("<?qd32s64s")  # vigente, cantidad, precio, ID, nombre
+    desplazamiento_cantidad = 1
+    desplazamiento_precio = 9
+    desplazamiento_id = 17
+    desplazamiento_nombre = 49
+    capacidad_inicial = 1024  # Registros reservados al crear el archivo
+
+    def __init__(self, ruta, vaciar=False):
+        self.ruta = ruta
+        if vaciar or not os.path.exists(ruta):
+            with open(ruta, "wb") as f:
+                f.write(self.cabecera.pack(self.firma, 0))
+                f.truncate(self.cabecera.size + self.capacidad_inicial * self.registro.size)
+        self.archivo = open(ruta, "r+b")
+        self.mapa = mmap.mmap(self.archivo.fileno(), 0)
+        firma, self.total = self.cabecera.unpack_from(self.mapa, 0)
+        if firma != self.firma:
+            self.cerrar()
+            raise ValueError(f"el archivo {ruta} no tiene el formato de registros de inventario")
+        self.filas = {}  # ID -> número de registro, en el orden del archivo
+        tam = self.registro.size
+        inicio = self.cabecera.size
+        for fila in range(self.total):
+            pos = inicio + fila * tam
+            if self.mapa[pos]:  # Saltamos los registros borrados
+                id_item = self.mapa[pos + self.desplazamiento_id:pos + self.desplazamiento_nombre]
+                self.filas[id_item.rstrip(b"\0").decode("utf-8")] = fila
+
+    def posicion(self, id_item):
+        return self.cabecera.size + self.filas[id_item] * self.registro.size
+
+    def sincronizar(self, pos, largo):
+        # Enviamos al disco solo las páginas que contienen los bytes modificados
+        inicio = pos - pos % mmap.PAGESIZE
+        self.mapa.flush(inicio, pos + largo - inicio)
+
+    def __len__(self):
+        return len(self.filas)
+
+    def __contains__(self, id_item):
+        return id_item in self.filas
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __getitem__(self, id_item):
+        if id_item not in self.filas:
+            raise KeyError(id_item)
+        return ItemVista(self, id_item)
+
+    def nombre_de(self, id_item):
+        pos = self.posicion(id_item) + self.desplazamiento_nombre
+        return self.mapa[pos:pos + 64].rstrip(b"\0").decode("utf-8")
+
+    def cantidad_de(self, id_item):
+        return struct.unpack_from("<q", self.mapa, self.posicion(id_item) + self.desplazamiento_cantidad)[0]
+
+    def precio_de(self, id_item):
+        return struct.unpack_from("<d", self.mapa, self.posicion(id_item) + self.desplazamiento_precio)[0]
+
+    def poner_cantidad(self, id_item, cantidad):
+        pos = self.posicion(id_item) + self.desplazamiento_cantidad
+        struct.pack_into("<q", self.mapa, pos, cantidad)
+        self.sincronizar(pos, 8)
+
+    def poner_precio(self, id_item, precio):
+        pos = self.posicion(id_item) + self.desplazamiento_precio
+        struct.pack_into("<d", self.mapa, pos, precio)
+        self.sincronizar(pos, 8)
+
+    def __setitem__(self, id_item, item):
+        id_bytes = str(id_item).encode("utf-8")
+        nombre_bytes = item.get_nombre().encode("utf-8")
+        if len(id_bytes) > 32 or len(nombre_bytes) > 64:
+            raise ValueError("el ID admite hasta 32 bytes y el nombre hasta 64 bytes en este modo")
+        if id_item in self.filas:
+            pos = self.posicion(id_item)
+        else:
+            fila = self.total
+            pos = self.cabecera.size + fila * self.registro.size
+            if pos + self.registro.size > len(self.mapa):
+                self.agrandar()
+            self.total += 1
+            self.cabecera.pack_into(self.mapa, 0, self.firma, self.total)
+            self.sincronizar(0, self.cabecera.size)
+            self.filas[id_item] = fila
+        self.registro.pack_into(self.mapa, pos, True, item.get_cantidad(), item.get_precio(),
+                                id_bytes, nombre_bytes)
+        self.sincronizar(pos, self.registro.size)
+
+    # Metodo para duplicar el tamaño del archivo cuando se llena
+    def agrandar(self):
+        nuevo_tamaño = len(self.mapa) * 2
+        self.mapa.close()
+        self.archivo.truncate(nuevo_tamaño)
+        self.mapa = mmap.mmap(self.archivo.fileno(), 0)
+
+    def pop(self, id_item, *defecto):
+        if id_item not in self.filas:
+            if defecto:
+                return defecto[0]
+            raise KeyError(id_item)
+        eliminado = Item(id_item, self.nombre_de(id_item), self.cantidad_de(id_item), self.precio_de(id_item))
+        pos = self.posicion(id_item)
+        self.mapa[pos] = 0  # Marcamos el registro como borrado
+        self.sincronizar(pos, 1)
+        del self.filas[id_item]
+        return eliminado
+
+    def __delitem__(self, id_item):
+        self.pop(id_item)
+
+    def keys(self):
+        return list(self.filas)
+
+    def values(self):
+        return (ItemVista(self, id_item) for id_item in self.filas)
+
+    def items(self):
+        return ((id_item, ItemVista(self, id_item)) for id_item in self.filas)
+
+    def cerrar(self):
+        if self.mapa.closed:
+            return  # Ya estaba cerrado (cerrar() puede llamarse más de una vez)
+        self.mapa.flush()
+        self.mapa.close()
+        self.archivo.close()
@@ -0,0 +1,282 @@
+# Lectura y escritura de archivos: JSON por partes, escritura atómica, formatos de la foto,
+# guardado en segundo plano e importación/exportación
+
+import csv
+import json
+import os
+import stat
+import struct
+import tempfile
+import threading
+
+
+def leer_json_por_partes(f, tam_bloque=1 << 16):
+    """
+    Lee un archivo con un arreglo JSON elemento por elemento, sin cargarlo completo en memoria.
+    Lanza json.JSONDecodeError si el contenido no es un arreglo JSON válido.
+    """
+    decodificador = json.JSONDecoder()
+    espacios = " \t\r\n"
+    buf = f.read(tam_bloque)
+    pos = 0
+    fin = not buf
+
+    def rellenar():
+        # Descartamos lo ya leído y añadimos el siguiente bloque del archivo
+        nonlocal buf, pos, fin
+        bloque = f.read(tam_bloque)
+        fin = not bloque
+        buf = buf[pos:] + bloque
+        pos = 0
+
+    def siguiente_caracter():
+        # Avanzamos sobre los espacios y devolvemos el siguiente carácter ("" al final del archivo)
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in espacios:
+                pos += 1
+            if pos < len(buf) or fin:
+                return buf[pos] if pos < len(buf) else ""
+            rellenar()
+
+    if siguiente_caracter() != "[":
+        raise json.JSONDecodeError("Se esperaba '['", buf, pos)
+    pos += 1
+    if siguiente_caracter() == "]":
+        pos += 1
+    else:
+        while True:
+            siguiente_caracter()
+            while True:
+                try:
+                    elemento, final = decodificador.raw_decode(buf, pos)
+                    if final < len(buf) or fin:  # Si llega justo al final del bloque podría estar cortado
+                        break
+                except json.JSONDecodeError:
+                    if fin:
+                        raise
+                rellenar()
+            pos = final
+            yield elemento
+            c = siguiente_caracter()
+            pos += 1
+            if c == "]":
+                break
+            if c != ",":
+                raise json.JSONDecodeError("Se esperaba ',' o ']'", buf, pos - 1)
+    if siguiente_caracter() != "":
+        raise json.JSONDecodeError("Contenido extra después del arreglo", buf, pos)
+
+
+def permisos_destino(ruta):
+    """
+    Devuelve los permisos que debe tener el archivo nuevo: los del archivo que reemplaza o, si no
+    existe, los de un archivo recién creado (0o666 menos la umask). mkstemp crea el temporal con
+    0o600 y el renombrado los conservaría, dejando el archivo ilegible para otros usuarios.
+    """
+    try:
+        return stat.S_IMODE(os.stat(ruta).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)  # La única forma de leer la umask es cambiarla y restaurarla
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def escribir_atomico(ruta, escribir, modo="w", encoding=None, newline=None):
+    """
+    Llama a escribir(f) sobre un archivo temporal, lo sincroniza con el disco (fsync) y lo renombra
+    sobre el destino. Si el programa se corta a mitad de escritura el archivo anterior queda intacto,
+    y los lectores nunca ven un archivo a medio escribir.
+    encoding y newline se pasan a open() en modo texto, igual que al abrir el destino directamente.
+    """
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    fd, temporal = tempfile.mkstemp(prefix=".inventario-", suffix=".tmp", dir=directorio)
+    try:
+        with os.fdopen(fd, modo, encoding=encoding, newline=newline) as f:
+            escribir(f)
+            f.flush()
+            os.fsync(f.fileno())  # Nos aseguramos de que los datos estén en el disco antes de renombrar
+            if hasattr(os, "fchmod"):  # En Windows no existe ni hace falta
+                os.fchmod(f.fileno(), permisos_destino(ruta))
+        os.replace(temporal, ruta)  # El renombrado es atómico dentro del mismo sistema de archivos
+    except BaseException:
+        os.unlink(temporal)  # No dejamos archivos temporales si algo falla
+        raise
+    try:
+        # Sincronizamos también el directorio para que el renombrado sobreviva a un corte de luz
+        fd_dir = os.open(directorio, os.O_RDONLY)
+        try:
+            os.fsync(fd_dir)
+        finally:
+            os.close(fd_dir)
+    except OSError:
+        pass  # Algunos sistemas (por ejemplo Windows) no permiten abrir directorios
+
+
+class FormatoJSON:
+    """Formato original: JSON con indentación, fácil de leer a mano pero el más lento y grande"""
+    nombre = "json"
+    extension = ".json"
+    indent = 4
+
+    def guardar(self, ruta, datos):
+        escribir_atomico(ruta, lambda f: json.dump(datos, f, indent=self.indent), encoding="utf-8")
+
+    def cargar(self, ruta):
+        with open(ruta, "r", encoding="utf-8") as f:
+            # Leemos el arreglo JSON por partes para no tener en memoria el archivo completo
+            yield from leer_json_por_partes(f)
+
+
+class FormatoJSONCompacto(FormatoJSON):
+    """JSON sin espacios ni saltos de línea"""
+    nombre = "json_compacto"
+
+    def guardar(self, ruta, datos):
+        escribir_atomico(ruta, lambda f: json.dump(datos, f, separators=(",", ":")), encoding="utf-8")
+
+
+class FormatoBinario:
+    """
+    Registros binarios: cantidad (entero de 8 bytes), precio (flotante de 8 bytes) y las longitudes
+    del ID y del nombre en una cabecera de tamaño fijo, seguidas del ID y el nombre en UTF-8.
+    """
+    nombre = "binario"
+    extension = ".bin"
+    firma = b"INVB\x01"  # Identifica el archivo y la versión del formato
+    cabecera = struct.Struct("<qdII")  # cantidad, precio, largo del ID, largo del nombre
+
+    def guardar(self, ruta, datos):
+        def escribir(f):
+            f.write(self.firma)
+            empaquetar = self.cabecera.pack
+            for dato in datos:
+                id_bytes = str(dato["id_item"]).encode("utf-8")
+                nombre_bytes = dato["nombre"].encode("utf-8")
+                f.write(empaquetar(int(dato["cantidad"]), float(dato["precio"]),
+                                   len(id_bytes), len(nombre_bytes)))
+                f.write(id_bytes)
+                f.write(nombre_bytes)
+        escribir_atomico(ruta, escribir, modo="wb")
+
+    def cargar(self, ruta):
+        # Se lee registro por registro (cabecera y luego ID y nombre): la memoria no depende del archivo
+        with open(ruta, "rb") as f:
+            if f.read(len(self.firma)) != self.firma:
+                raise ValueError(f"el archivo {ruta} no tiene el formato binario de inventario")
+            desempaquetar = self.cabecera.unpack
+            tam_cabecera = self.cabecera.size
+            leer = f.read
+            while True:
+                cabecera = leer(tam_cabecera)
+                if not cabecera:
+                    break
+                if len(cabecera) < tam_cabecera:
+                    raise ValueError(f"el archivo {ruta} está incompleto")
+                cantidad, precio, largo_id, largo_nombre = desempaquetar(cabecera)
+                textos = leer(largo_id + largo_nombre)
+                if len(textos) < largo_id + largo_nombre:
+                    raise ValueError(f"el archivo {ruta} está incompleto")
+                yield {
+                    "id_item": textos[:largo_id].decode("utf-8"),
+                    "nombre": textos[largo_id:].decode("utf-8"),
+                    "cantidad": cantidad,
+                    "precio": precio
+                }
+
+
+# Formatos disponibles para guardar el inventario, por nombre
+FORMATOS = {formato.nombre: formato for formato in (FormatoJSON(), FormatoJSONCompacto(), FormatoBinario())}
+
+
+def convertir_archivo(origen, formato_origen, destino, formato_destino):
+    """Convierte un archivo de inventario de un formato a otro, devuelve la cantidad de productos"""
+    datos = list(FORMATOS[formato_origen].cargar(origen))
+    FORMATOS[formato_destino].guardar(destino, datos)
+    return len(datos)
+
+
+class EscritorSegundoPlano:
+    """
+    Hilo que escribe las fotos del inventario en el disco para no bloquear el menú.
+    Si llegan varias fotos mientras se escribe una, solo se guarda la más reciente.
+    Si se indica, al_guardar(ruta) se llama (desde el hilo escritor) después de cada foto escrita.
+    """
+
+    def __init__(self, ruta, formato, al_guardar=None):
+        self.ruta = ruta
+        self.formato = formato
+        self.al_guardar = al_guardar
+        self.condicion = threading.Condition()
+        self.pendiente = None  # Última foto que falta escribir
+        self.escribiendo = False
+        self.activo = True
+        self.ultimo_error = None
+        self.hilo = threading.Thread(target=self.ejecutar, name="escritor-inventario", daemon=True)
+        self.hilo.start()
+
+    def encolar(self, datos):
+        with self.condicion:
+            self.pendiente = datos  # Reemplazamos la foto anterior si todavía no se escribió
+            self.condicion.notify_all()
+
+    def ejecutar(self):
+        while True:
+            with self.condicion:
+                while self.pendiente is None and self.activo:
+                    self.condicion.wait()
+                if self.pendiente is None:
+                    return  # Nos pidieron cerrar y no queda nada por escribir
+                datos, self.pendiente = self.pendiente, None
+                self.escribiendo = True
+            try:
+                self.formato.guardar(self.ruta, datos)
+                if self.al_guardar is not None:
+                    self.al_guardar(self.ruta)
+                error = None
+            except Exception as e:
+                error = e
+                print(f"Error al guardar en archivo: {str(e)}")
+            with self.condicion:
+                self.escribiendo = False
+                self.ultimo_error = error
+                self.condicion.notify_all()
+
+    def esperar(self):
+        """Espera a que se escriban todas las fotos pendientes, devuelve True si no hubo error"""
+        with self.condicion:
+            while self.pendiente is not None or self.escribiendo:
+                self.condicion.wait()
+            return self.ultimo_error is None
+
+    def cerrar(self):
+        with self.condicion:
+            self.activo = False
+            self.condicion.notify_all()
+        self.hilo.join()
+
+
+def tipo_de_archivo(ruta, formato=None):
+    """Devuelve "csv" o "jsonl" según el formato indicado o la extensión del archivo"""
+    formato = formato or os.path.splitext(ruta)[1].lstrip(".").lower()
+    if formato not in ("csv", "jsonl"):
+        raise ValueError(f"formato de importación/exportación no soportado: {formato}")
+    return formato
+
+
+def leer_filas(ruta, formato):
+    """Generador de (número de línea, diccionario o None si la línea no se pudo leer) de un CSV o JSON por líneas"""
+    with open(ruta, "r", encoding="utf-8", newline="") as f:
+        if formato == "csv":
+            lector = csv.DictReader(f)
+            for fila in lector:
+                yield lector.line_num, fila
+        else:
+            for numero, linea in enumerate(f, start=1):
+                if not linea.strip():
+                    continue
+                try:
+                    fila = json.loads(linea)
+                except json.JSONDecodeError:
+                    fila = None
+                yield numero, fila if isinstance(fila, dict) else None
@@ -0,0 +1,15 @@
+# Benchmarks del inventario, por nombre (inventario_2.py --benchmark NOMBRE)
+
+from .disco import benchmark_guardado, benchmark_importacion, benchmark_formatos
+from .carga import benchmark_servidor, benchmark_concurrencia, benchmark_estrategias, benchmark_fragmentos
+
+
+BENCHMARKS = {
+    "servidor": benchmark_servidor,
+    "guardado": benchmark_guardado,
+    "importacion": benchmark_importacion,
+    "formatos": benchmark_formatos,
+    "concurrencia": benchmark_concurrencia,
+    "estrategias": benchmark_estrategias,
+    "fragmentos": benchmark_fragmentos,
+}
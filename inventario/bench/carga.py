@@ -0,0 +1,226 @@
+# Benchmarks de carga: servicio, hilos, estrategias de almacenamiento y fragmentos
+
+import asyncio
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+
+from ..modelo import Item
+from ..core import Inventario
+from ..estrategias import InventarioConcurrente, ESTRATEGIAS, crear_inventario, InventarioFragmentado
+from ..servidor import ServidorInventario
+
+
+def benchmark_servidor(clientes=8, solicitudes=5000, ventana=32, cantidad_items=1000):
+    """
+    Generador de carga: varios clientes envían solicitudes (90% actualizar, 10% buscar) con hasta
+    'ventana' solicitudes en vuelo por conexión, e informa solicitudes por segundo y latencia p50/p99.
+    """
+    async def cliente(puerto, semilla, latencias):
+        azar = random.Random(semilla)
+        lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+        enviados = []  # Momento de envío de cada solicitud en vuelo, en orden
+        pendientes = asyncio.Semaphore(ventana)
+
+        async def recibir():
+            for _ in range(solicitudes):
+                await lector.readline()
+                latencias.append(time.perf_counter() - enviados.pop(0))
+                pendientes.release()
+
+        receptor = asyncio.create_task(recibir())
+        for _ in range(solicitudes):
+            await pendientes.acquire()
+            if azar.random() < 0.9:
+                solicitud = {"op": "actualizar", "id_item": str(azar.randrange(cantidad_items)),
+                             "cantidad": azar.randrange(100)}
+            else:
+                solicitud = {"op": "buscar", "nombre": f"producto {azar.randrange(cantidad_items)}"}
+            enviados.append(time.perf_counter())
+            escritor.write(json.dumps(solicitud).encode("utf-8") + b"\n")
+            await escritor.drain()
+        await receptor
+        escritor.close()
+        await escritor.wait_closed()
+
+    async def principal():
+        with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+            inventario = Inventario(usar_diario=True, limite_compactacion=10 ** 9)
+            with inventario.lote():
+                for i in range(cantidad_items):
+                    inventario.aña_item(Item(str(i), f"producto {i}", 0, 1.0))
+        servidor = ServidorInventario(inventario, puerto=0)
+        await servidor.iniciar()
+        latencias = []
+        inicio = time.perf_counter()
+        await asyncio.gather(*(cliente(servidor.puerto, c, latencias) for c in range(clientes)))
+        duracion = time.perf_counter() - inicio
+        await servidor.detener()
+        latencias.sort()
+        total = clientes * solicitudes
+        print(f"{total} solicitudes en {duracion:.2f} s: {total / duracion:.0f} sol/s, "
+              f"p50 {latencias[len(latencias) // 2] * 1000:.2f} ms, "
+              f"p99 {latencias[int(len(latencias) * 0.99)] * 1000:.2f} ms")
+
+    directorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as directorio:
+        os.chdir(directorio)
+        try:
+            asyncio.run(principal())
+        finally:
+            os.chdir(directorio_original)
+
+
+def benchmark_concurrencia(hilos=(1, 2, 4, 8), operaciones=40000, cantidad_items=10000, altas=100):
+    """
+    Varios hilos aplican ajustar_cantidad sobre IDs al azar (con una búsqueda cada 50 operaciones)
+    contra un InventarioConcurrente en modo diario, y se informa el rendimiento por cantidad de hilos.
+    Mientras tanto otro hilo añade productos (cerrojo de escritura) y se informa su espera máxima.
+    """
+    directorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as directorio:
+        os.chdir(directorio)
+        try:
+            for n in hilos:
+                for archivo in ("inventarios.json", "inventarios.log"):
+                    if os.path.exists(archivo):
+                        os.remove(archivo)
+                with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+                    inventario = InventarioConcurrente(usar_diario=True, limite_compactacion=10 ** 9)
+                    with inventario.lote():
+                        for i in range(cantidad_items):
+                            inventario.aña_item(Item(str(i), f"producto {i}", 0, 1.0))
+
+                    def trabajar(semilla, cantidad):
+                        azar = random.Random(semilla)
+                        for k in range(cantidad):
+                            inventario.ajustar_cantidad(str(azar.randrange(cantidad_items)), 1)
+                            if k % 50 == 0:
+                                inventario.bus_item("producto 12")
+
+                    esperas = []
+
+                    def añadir():
+                        for i in range(altas):
+                            inicio_alta = time.perf_counter()
+                            inventario.aña_item(Item(f"nuevo {i}", f"producto nuevo {i}", 0, 1.0))
+                            esperas.append(time.perf_counter() - inicio_alta)
+
+                    trabajadores = [threading.Thread(target=trabajar, args=(h, operaciones // n)) for h in range(n)]
+                    inicio = time.perf_counter()
+                    for t in trabajadores:
+                        t.start()
+                    alta = threading.Thread(target=añadir)
+                    alta.start()
+                    for t in trabajadores:
+                        t.join()
+                    duracion = time.perf_counter() - inicio
+                    alta.join()
+                total = sum(item.get_cantidad() for item in inventario.items.values())
+                print(f"{n:>2} hilos: {operaciones / duracion:>10.0f} op/s  (suma de cantidades {total}, "
+                      f"{len(esperas)} altas, espera máxima {max(esperas, default=0) * 1000:.1f} ms)")
+        finally:
+            os.chdir(directorio_original)
+
+
+def benchmark_estrategias(tamaños=(1000, 10000, 100000), operaciones=1000, estrategias=None):
+    """
+    Mide las operaciones principales con cada estrategia de almacenamiento y varios tamaños.
+    Añadir, actualizar y eliminar se hacen dentro de un lote (se mide el trabajo en memoria más
+    una sola escritura); guardar y cargar se miden aparte, cargar abriendo de nuevo el archivo.
+    Devuelve una lista de filas (estrategia, tamaño, operación, segundos por operación).
+    """
+    estrategias = estrategias or list(ESTRATEGIAS)
+    filas = []
+    print(f"{'Estrategia':<12} {'Items':>8} {'Añadir':>9} {'Actualizar':>11} {'Buscar':>9} "
+          f"{'Eliminar':>9} {'Guardar':>9} {'Cargar':>9}")
+    print(f"{'':<12} {'':>8} {'(µs/op)':>9} {'(µs/op)':>11} {'(µs/op)':>9} {'(µs/op)':>9} {'(ms)':>9} {'(ms)':>9}")
+    directorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as raiz:
+        try:
+            for estrategia in estrategias:
+                for tamaño in tamaños:
+                    directorio = os.path.join(raiz, f"{estrategia}_{tamaño}")
+                    os.mkdir(directorio)
+                    os.chdir(directorio)
+                    azar = random.Random(tamaño)
+                    cuantas = min(operaciones, max(1, tamaño // 10))  # Se elimina a lo sumo el 10%
+                    muestra = [str(azar.randrange(tamaño)) for _ in range(cuantas)]
+                    borrar = azar.sample(range(tamaño), cuantas)
+                    tiempos = {}
+                    with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+                        inventario = crear_inventario(estrategia)
+                        inicio = time.perf_counter()
+                        with inventario.lote():
+                            for i in range(tamaño):
+                                inventario.aña_item(Item(str(i), f"producto {i}", i % 500, i * 0.01))
+                        tiempos["añadir"] = (time.perf_counter() - inicio) / tamaño
+                        inicio = time.perf_counter()
+                        with inventario.lote():
+                            for k, id_item in enumerate(muestra):
+                                inventario.act_item(id_item, cantidad=k, precio=k * 0.5)
+                        tiempos["actualizar"] = (time.perf_counter() - inicio) / len(muestra)
+                        inicio = time.perf_counter()
+                        for id_item in muestra:
+                            inventario.bus_item(f"producto {id_item}")
+                        tiempos["buscar"] = (time.perf_counter() - inicio) / len(muestra)
+                        inicio = time.perf_counter()
+                        with inventario.lote():
+                            for i in borrar:
+                                inventario.el_item(str(i))
+                        tiempos["eliminar"] = (time.perf_counter() - inicio) / len(borrar)
+                        if hasattr(inventario, "guardar_archivo"):
+                            inicio = time.perf_counter()
+                            inventario.guardar_archivo()
+                            inventario.esperar_guardado()
+                            tiempos["guardar"] = time.perf_counter() - inicio
+                        inventario.cerrar()
+                        inicio = time.perf_counter()
+                        crear_inventario(estrategia).cerrar()
+                        tiempos["cargar"] = time.perf_counter() - inicio
+                    for operacion, segundos in tiempos.items():
+                        filas.append((estrategia, tamaño, operacion, segundos))
+                    guardar = f"{tiempos['guardar'] * 1e3:>9.2f}" if "guardar" in tiempos else f"{'-':>9}"
+                    print(f"{estrategia:<12} {tamaño:>8} {tiempos['añadir'] * 1e6:>9.2f} "
+                          f"{tiempos['actualizar'] * 1e6:>11.2f} {tiempos['buscar'] * 1e6:>9.2f} "
+                          f"{tiempos['eliminar'] * 1e6:>9.2f} {guardar} {tiempos['cargar'] * 1e3:>9.2f}")
+        finally:
+            os.chdir(directorio_original)
+    return filas
+
+
+def benchmark_fragmentos(fragmentos=(1, 2, 4, 8), cantidad_items=200000, busquedas=20, actualizaciones=200000):
+    """
+    Inventario fragmentado con un proceso por fragmento: tiempo medio de una búsqueda con índice
+    ("producto 1234"), de una búsqueda corta que recorre todos los nombres ("12") y de una
+    actualización masiva de 'actualizaciones' productos dentro de un lote, por cantidad de fragmentos.
+    """
+    print(f"{'Fragmentos':>10} {'Búsqueda (ms)':>14} {'Recorrido (ms)':>15} {'Actualizar (s)':>15} {'act/s':>10}")
+    for n in fragmentos:
+        with tempfile.TemporaryDirectory() as directorio:
+            with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+                inventario = InventarioFragmentado(n, procesos=True, directorio=directorio)
+                with inventario.lote():
+                    for i in range(cantidad_items):
+                        inventario.aña_item(Item(str(i), f"producto {i}", i % 500, 1.0))
+                inicio = time.perf_counter()
+                for _ in range(busquedas):
+                    inventario.bus_item("producto 1234")
+                t_busqueda = (time.perf_counter() - inicio) / busquedas
+                inicio = time.perf_counter()
+                for _ in range(busquedas):
+                    inventario.bus_item("12")
+                t_recorrido = (time.perf_counter() - inicio) / busquedas
+                azar = random.Random(n)
+                inicio = time.perf_counter()
+                with inventario.lote():
+                    for k in range(actualizaciones):
+                        inventario.act_item(str(azar.randrange(cantidad_items)), cantidad=k, precio=2.0)
+                t_actualizar = time.perf_counter() - inicio
+                inventario.cerrar()
+            print(f"{n:>10} {t_busqueda * 1000:>14.2f} {t_recorrido * 1000:>15.2f} {t_actualizar:>15.2f} "
+                  f"{actualizaciones / t_actualizar:>10.0f}")
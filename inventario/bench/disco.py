@@ -0,0 +1,100 @@
+# Benchmarks de escritura y lectura en disco: guardado, importación y formatos de la foto
+
+import csv
+import json
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from ..modelo import Item
+from ..archivos import FORMATOS
+from ..core import Inventario
+
+
+def benchmark_guardado(cantidad_items=10000, repeticiones=50):
+    """
+    Mide cuánto tarda act_item en devolver el control con el guardado en primer plano
+    y con el guardado en segundo plano. Trabaja en un directorio temporal.
+    """
+    directorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as directorio:
+        os.chdir(directorio)
+        try:
+            for segundo_plano in (False, True):
+                if os.path.exists("inventarios.json"):
+                    os.remove("inventarios.json")
+                with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+                    inventario = Inventario(guardado_en_segundo_plano=segundo_plano)
+                    with inventario.lote():
+                        for i in range(cantidad_items):
+                            inventario.aña_item(Item(str(i), f"producto {i}", i, 1.0))
+                    inventario.esperar_guardado()
+                    tiempos = []
+                    for r in range(repeticiones):
+                        inicio = time.perf_counter()
+                        inventario.act_item(str(r % cantidad_items), cantidad=r)
+                        tiempos.append(time.perf_counter() - inicio)
+                    inventario.cerrar()
+                tiempos.sort()
+                modo = "segundo plano" if segundo_plano else "primer plano"
+                print(f"{modo:<14} mediana {tiempos[len(tiempos) // 2] * 1000:8.2f} ms"
+                               f"   p95 {tiempos[int(len(tiempos) * 0.95)] * 1000:8.2f} ms")
+        finally:
+            os.chdir(directorio_original)
+
+
+def benchmark_importacion(filas=1000000):
+    """Mide importación y exportación de CSV y JSON por líneas con 'filas' productos (1% de filas inválidas)"""
+    directorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as directorio:
+        os.chdir(directorio)
+        try:
+            for formato in ("csv", "jsonl"):
+                ruta = "proveedor." + formato
+                with open(ruta, "w", encoding="utf-8", newline="") as f:
+                    if formato == "csv":
+                        escritor = csv.writer(f)
+                        escritor.writerow(["id_item", "nombre", "cantidad", "precio"])
+                        for i in range(filas):
+                            escritor.writerow([i, f"producto {i}", "x" if i % 100 == 0 else i % 500, i * 0.01])
+                    else:
+                        for i in range(filas):
+                            cantidad = "x" if i % 100 == 0 else i % 500
+                            f.write(json.dumps({"id_item": str(i), "nombre": f"producto {i}",
+                                                "cantidad": cantidad, "precio": i * 0.01}) + "\n")
+                for archivo in ("inventarios.json", "inventarios.log"):
+                    if os.path.exists(archivo):
+                        os.remove(archivo)
+                with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+                    inventario = Inventario()
+                    inicio = time.perf_counter()
+                    importados, rechazados = inventario.importar_archivo(ruta)
+                    t_importar = time.perf_counter() - inicio
+                    inicio = time.perf_counter()
+                    inventario.exportar_archivo("exportado." + formato)
+                    t_exportar = time.perf_counter() - inicio
+                print(f"{formato:<6} importar {t_importar:6.2f} s ({filas / t_importar:>9.0f} filas/s, "
+                      f"{importados} ok, {len(rechazados)} rechazadas)   "
+                      f"exportar {t_exportar:6.2f} s ({importados / t_exportar:>9.0f} filas/s)")
+        finally:
+            os.chdir(directorio_original)
+
+
+def benchmark_formatos(tamaños=(10000, 100000, 1000000)):
+    """Compara tiempo de guardado, tiempo de carga y tamaño de archivo de cada formato"""
+    print(f"{'Items':>9} {'Formato':<14} {'Guardar (s)':>12} {'Cargar (s)':>11} {'Tamaño (MB)':>12}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for tamaño in tamaños:
+            datos = [Item(str(i), f"producto {i}", i, i * 0.25).to_dict() for i in range(tamaño)]
+            for formato in FORMATOS.values():
+                ruta = os.path.join(directorio, "inventario" + formato.extension)
+                inicio = time.perf_counter()
+                formato.guardar(ruta, datos)
+                t_guardar = time.perf_counter() - inicio
+                inicio = time.perf_counter()
+                for dato in formato.cargar(ruta):
+                    Item(dato["id_item"], dato["nombre"], int(dato["cantidad"]), float(dato["precio"]))
+                t_cargar = time.perf_counter() - inicio
+                megas = os.path.getsize(ruta) / 1e6
+                print(f"{tamaño:>9} {formato.nombre:<14} {t_guardar:>12.3f} {t_cargar:>11.3f} {megas:>12.2f}")
@@ -0,0 +1,118 @@
+# Menú interactivo y línea de comandos
+
+import argparse
+from itertools import chain, islice
+
+from .modelo import Item
+from .reportes import escribir_tabla
+from .core import Inventario
+from .estrategias import ESTRATEGIAS, crear_inventario
+from .servidor import servir
+from .bench import BENCHMARKS
+
+
+def mostrar_por_paginas(items, titulo, tamaño_pagina=20):
+    """Muestra los items de a una página y pregunta antes de mostrar la siguiente"""
+    items = iter(items)
+    pagina = list(islice(items, tamaño_pagina))
+    while True:
+        siguiente = list(islice(items, tamaño_pagina))  # Leemos la próxima para saber si hay más
+        escribir_tabla(pagina, titulo)
+        if not siguiente:
+            return  # No quedan más productos
+        if input("Enter para ver más, 'q' para volver al menú: ").strip().lower() == "q":
+            return
+        pagina = siguiente
+
+
+def mostrar(inventario=None):
+    if inventario is None:
+        inventario = Inventario()
+    while True:  # Bucle para el menú
+        print("1. Añadir producto")
+        print("2. Eliminar producto")
+        print("3. Actualizar producto")
+        print("4. Buscar producto")
+        print("5. Mostrar todos los productos")
+        print("6. Salir")
+
+        try: # Comienza el bloque de manejo de errores
+            opcion = input("Seleccione una opción: ") #Pedimos al usuario que ingrese una opcion
+
+            if opcion == '1':  # Añadir producto
+                id_item = input("Ingrese ID del producto: ")
+                nombre = input("Ingrese nombre del producto: ")
+                cantidad = int(input("Ingrese cantidad: "))
+                precio = float(input("Ingrese precio: "))
+                item = Item(id_item, nombre, cantidad, precio)  #
+                inventario.aña_item(item)
+
+            elif opcion == '2':  # Eliminar producto
+                id_item = input("Ingrese ID del producto a eliminar: ")
+                inventario.el_item(id_item)
+
+            elif opcion == '3':  # Actualizar producto
+                id_item = input("Ingrese ID del item a actualizar: ")
+                cantidad = input("Ingrese nueva cantidad : ")
+                precio = input("Ingrese nuevo precio : ")
+                inventario.act_item(id_item, int(cantidad) if cantidad else None,
+                                            float(precio) if precio else None)
+
+
+            elif opcion == '4':  # Buscar producto
+
+                nombre = input("Ingrese nombre del item a buscar: ")
+
+                resultados = inventario.bus_item(nombre)
+
+                if resultados:  # Si hay resultados
+
+                    mostrar_por_paginas(resultados, "Resultados de la búsqueda:")
+
+                else:
+
+                    print("No se encontraron productos.")  # Mensaje de no encontrado
+
+            elif opcion == '5':  # Mostrar items
+                productos = iter(inventario.listar_items())  # Todas las estrategias tienen listar_items
+                primero = next(productos, None)
+                if primero is None:
+                    print("No hay productos en el inventario.")
+                else:
+                    mostrar_por_paginas(chain([primero], productos), "Lista de productos:")
+
+            elif opcion == '6':  # Salir
+                inventario.cerrar()  # Esperamos a que se escriban los cambios pendientes
+                print("Saliendo.")
+                break  # Salimos del bucle
+
+        except ValueError:   # Verificamos si hay error al convertir números
+            print("Error: Por favor ingrese números válidos para cantidad y precio.")  #Imprimimos un mensaje de qu eingrese
+        except Exception as e: #Colcoamos otro except para ver si hay cualquier otro tipo de error
+            print(f"Error: {str(e)}")  #Imprimimos que hay un error
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos: menú interactivo (por defecto), servicio o benchmark"""
+    parser = argparse.ArgumentParser(description="Sistema de gestión de inventario")
+    parser.add_argument("--estrategia", choices=list(ESTRATEGIAS), default="dict",
+                        help="almacenamiento a usar (por defecto dict)")
+    parser.add_argument("--servir", action="store_true", help="arranca el servicio JSON por líneas en lugar del menú")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--benchmark", choices=list(BENCHMARKS), help="ejecuta un benchmark y termina")
+    parser.add_argument("--metricas", metavar="RUTA",
+                        help="mide las operaciones y al salir del menú escribe las métricas (Prometheus) en RUTA")
+    argumentos = parser.parse_args(argv)
+    if argumentos.metricas and argumentos.estrategia == "sqlite":
+        parser.error("--metricas no está disponible con la estrategia sqlite")
+    if argumentos.benchmark:
+        BENCHMARKS[argumentos.benchmark]()
+    elif argumentos.servir:
+        servir(argumentos.host, argumentos.puerto, argumentos.estrategia)
+    elif argumentos.metricas:
+        inventario = crear_inventario(argumentos.estrategia, metricas=True)
+        mostrar(inventario)
+        inventario.volcar_prometheus(argumentos.metricas)
+    else:
+        mostrar(crear_inventario(argumentos.estrategia))
@@ -0,0 +1,584 @@
+# Inventario principal: diccionario de items con diario, lotes, índices y suscriptores
+
+import csv
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from .modelo import Item, validar_fila, trigramas
+from .archivos import escribir_atomico, FORMATOS, EscritorSegundoPlano, tipo_de_archivo, leer_filas
+from .almacenes import AlmacenColumnar, AlmacenMmap
+from .reportes import MetricasInventario, AnaliticaInventario, paginar, escribir_tabla, IndicesRango
+
+
+class Inventario:
+
+    # Métodos que se miden con metricas=True: nombre del método -> operación en las estadísticas
+    OPERACIONES_MEDIDAS = {
+        "aña_item": "añadir", "el_item": "eliminar", "act_item": "actualizar", "ajustar_cantidad": "ajustar",
+        "bus_item": "buscar", "guardar_archivo": "guardar", "cargar_archivo": "cargar",
+        "registrar_cambios": "diario", "compactar": "compactar",
+    }
+
+    def __init__(self, usar_diario=False, limite_compactacion=1000, almacen_columnar=False,
+                 guardado_en_segundo_plano=False, formato="json", almacen_mmap=False, carga_diferida=False,
+                 nombre="inventarios", metricas=False):
+        self.carga_pendiente = False  # Con carga diferida el archivo se lee la primera vez que se usan los items
+        self.cargando = False  # Evita que la propia carga vuelva a dispararla
+        self.cerrojo_carga = threading.RLock()  # Si varios hilos llegan a la vez, uno carga y el resto espera
+        self.almacen_columnar = almacen_columnar  # Si es True los items se guardan en columnas (menos memoria)
+        self.almacen_mmap = almacen_mmap  # Si es True los items viven en un archivo de registros fijos con mmap
+        self.formato = FORMATOS[formato]  # Formato del archivo: "json", "json_compacto" o "binario"
+        self.archivo = nombre + self.formato.extension  # Nombre del archivo donde se almacenarán los datos
+        if self.almacen_mmap:
+            self.archivo = nombre + ".dat"
+        # Usamos un diccionario en lugar de una lista para acceso más rápido por ID
+        # (con mmap el almacén se abre en cargar_archivo)
+        self.items = {} if self.almacen_mmap else self.nuevo_almacen()
+        self.archivo_diario = nombre + ".log"  # Diario donde se anexan los cambios (un registro por línea)
+        self.usar_diario = usar_diario  # Si es True cada cambio se anexa al diario en lugar de reescribir el JSON
+        self.limite_compactacion = limite_compactacion  # Registros en el diario antes de compactar en el JSON
+        self.cambios_diario = 0  # Cantidad de registros pendientes en el diario
+        self.archivos_danados = []  # Foto (y diario) que no se pudieron cargar: se apartan antes de escribir
+        self.en_lote = False  # Indica si estamos dentro de un lote (persistencia diferida)
+        self.registros_lote = []  # Cambios acumulados durante el lote
+        self.deshacer = None  # Durante un lote, cómo deshacer cada cambio hecho en memoria (lista de pasos)
+        self.indice_nombres = {}  # Índice invertido: trigrama -> conjunto de IDs cuyo nombre lo contiene
+        self.orden_items = {}  # ID -> número de secuencia, para devolver las búsquedas en orden de inserción
+        self.secuencia = 0  # Contador para el orden de inserción
+        self.indice_pendiente = False  # Con mmap el índice de nombres se arma en la primera búsqueda
+        self.reportes = None  # AnaliticaInventario, se crea en la primera llamada a analitica()
+        self.indices_rango = None  # IndicesRango, se crea en la primera consulta por rango
+        self.derivados = []  # Estructuras que se actualizan con cada cambio (reportes, índices por rango)
+        self.suscriptores = []  # Funciones que reciben cada cambio confirmado (ver suscribir)
+        self.secuencia_eventos = 0  # Número del último evento publicado
+        # Con métricas cada método medido se reemplaza en esta instancia por uno que toma el tiempo;
+        # sin métricas los métodos quedan tal cual y no hay ningún costo extra
+        self.metricas = MetricasInventario() if metricas else None
+        if self.metricas is not None:
+            for metodo, operacion in self.OPERACIONES_MEDIDAS.items():
+                setattr(self, metodo, self.metricas.medir(operacion, getattr(self, metodo)))
+        # Si se pide, un hilo escribe el JSON en el disco mientras el menú sigue respondiendo
+        # (con métricas, el hilo cuenta los bytes de cada foto que termina de escribir)
+        self.escritor = None
+        if guardado_en_segundo_plano:
+            al_guardar = self.contar_bytes_guardados if self.metricas is not None else None
+            self.escritor = EscritorSegundoPlano(self.archivo, self.formato, al_guardar)
+        if carga_diferida:
+            self.carga_pendiente = True  # Crear el inventario no toca el disco
+        else:
+            self.cargar_archivo()  # Cargamos los datos del archivo al inicializar
+
+    # Los productos por ID; con carga diferida el archivo se lee en el primer acceso
+    @property
+    def items(self):
+        if self.carga_pendiente:
+            self.cargar_pendiente()
+        return self.datos_items
+
+    @items.setter
+    def items(self, items):
+        self.datos_items = items
+
+    # Metodo que hace la carga diferida una sola vez, aunque la pidan varios hilos
+    def cargar_pendiente(self):
+        with self.cerrojo_carga:
+            if self.carga_pendiente and not self.cargando:
+                self.cargando = True
+                try:
+                    self.cargar_archivo()
+                    self.carga_pendiente = False  # Si la carga falla, el próximo acceso vuelve a intentarla
+                finally:
+                    self.cargando = False
+
+    # Creamos el metodo para el archivo json
+    def guardar_archivo(self):
+        if self.almacen_mmap:
+            return True  # Con mmap cada cambio ya se escribió en su lugar dentro del archivo
+        try:
+            self.apartar_danados()
+            # Convertimos todos los items a diccionarios
+            items_dict = [item.to_dict() for item in self.items.values()]
+
+            if self.escritor is not None:
+                self.escritor.encolar(items_dict)  # El hilo escritor se encarga del disco
+                return True
+
+            # Guardamos en formato JSON con indentación para mejor legibilidad, de forma atómica
+            self.formato.guardar(self.archivo, items_dict)
+            if self.metricas is not None:
+                self.contar_bytes_guardados(self.archivo)
+
+            print(f"Cambios guardados en archivo: {os.path.abspath(self.archivo)}")
+            return True
+        except Exception as e:
+            print(f"Error al guardar en archivo: {str(e)}")
+            return False
+
+    # Metodo que suma a las métricas el tamaño de una foto ya escrita
+    def contar_bytes_guardados(self, ruta):
+        self.metricas.sumar_bytes("guardar", os.path.getsize(ruta))
+
+    # Metodo para esperar a que el hilo escritor termine las escrituras pendientes
+    def esperar_guardado(self):
+        if self.escritor is not None:
+            return self.escritor.esperar()
+        return True
+
+    # Metodo para terminar el hilo escritor guardando lo pendiente y cerrar el archivo mmap
+    def cerrar(self):
+        if self.escritor is not None:
+            self.escritor.cerrar()
+            self.escritor = None
+        if self.almacen_mmap and isinstance(self.datos_items, AlmacenMmap):
+            self.items.cerrar()
+
+    # metodo json
+    def cargar_archivo(self):
+        if self.almacen_mmap:
+            self.cargar_mmap()
+            return
+        try:
+            for dato in self.formato.cargar(self.archivo):  # Iteramos a través de cada elemento del archivo
+                # Creamos un nuevo objeto Item con los datos leídos
+                item = Item(
+                    dato["id_item"],  # ID del producto
+                    dato["nombre"],   # Nombre del producto
+                    int(dato["cantidad"]),  # Convertimos cantidad a entero
+                    float(dato["precio"])   # Convertimos precio a flotante
+                )
+                self.agregar_en_memoria(item)  # Almacenamos el item usando su ID como clave para búsqueda O(1)
+            print(f"Inventario cargado del archivo: {len(self.items)} productos.")  # Mostramos cuántos productos se cargaron
+        except FileNotFoundError:  # Capturamos error si el archivo no existe
+            print("Archivo de inventario no encontrado. Se creará uno nuevo al guardar.")
+        except json.JSONDecodeError:
+            print(f"Error: El archivo {self.archivo} no tiene un formato JSON válido.")
+            self.descartar_carga()
+        except Exception as e:  # Capturamos cualquier otro tipo de error (por ejemplo un binario truncado)
+            print(f"Error al cargar el archivo: {str(e)}")  # Mostramos el mensaje de error
+            self.descartar_carga()
+        if self.usar_diario and not self.archivos_danados:
+            self.reproducir_diario()  # Aplicamos sobre la foto los cambios anexados después de ella
+
+    # Metodo para cuando la foto no se pudo leer completa: el inventario queda vacío (no a medias)
+    # y la foto y el diario se apartan antes de la primera escritura, así no se pisan sin aviso
+    def descartar_carga(self):
+        self.reconstruir_indice([])  # Descartamos los productos leídos antes del error
+        self.archivos_danados = [self.archivo]
+        if self.usar_diario:
+            self.archivos_danados.append(self.archivo_diario)  # Sus cambios eran sobre la foto perdida
+        print(f"Aviso: el inventario queda vacío. Al guardar, {self.archivo} se conservará "
+              f"como {self.archivo}.danado.")
+
+    # Metodo que renombra los archivos que no se pudieron cargar, antes de escribir encima
+    def apartar_danados(self):
+        for ruta in self.archivos_danados:
+            if os.path.exists(ruta):
+                os.replace(ruta, ruta + ".danado")
+                print(f"Aviso: {ruta} no se pudo cargar y se conservó como {ruta}.danado.")
+        self.archivos_danados = []
+
+    # Metodo para abrir el archivo de registros sin leer los productos uno por uno
+    def cargar_mmap(self):
+        try:
+            self.items = AlmacenMmap(self.archivo)
+            self.indice_pendiente = True  # Los nombres se leerán recién cuando se busque
+            print(f"Inventario abierto con mmap: {len(self.items)} productos.")
+        except Exception as e:
+            print(f"Error al abrir el archivo: {str(e)}")
+            # Sin almacén no hay dónde escribir: seguir con un diccionario vacío perdería cada cambio
+            raise
+
+    # Metodo para anexar cambios al diario, el costo no depende del tamaño del inventario
+    def registrar_cambios(self, registros):
+        try:
+            self.apartar_danados()
+            with open(self.archivo_diario, "a") as f:
+                inicio = f.tell()
+                # Una línea JSON compacta por cambio
+                f.writelines(json.dumps(r, separators=(",", ":")) + "\n" for r in registros)
+                if self.metricas is not None:
+                    self.metricas.sumar_bytes("diario", f.tell() - inicio)
+            self.cambios_diario += len(registros)
+            if self.cambios_diario >= self.limite_compactacion:
+                self.compactar()  # Pasamos los cambios acumulados a la foto del JSON
+        except Exception as e:
+            print(f"Error al escribir en el diario: {str(e)}")
+
+    # Metodo para guardar los cambios, segun el modo elegido
+    def persistir_cambio(self, registro):
+        if self.en_lote:
+            self.registros_lote.append(registro)  # Dentro de un lote solo acumulamos el cambio
+            return
+        if self.almacen_mmap:
+            pass  # El cambio ya quedó escrito en el archivo
+        elif self.usar_diario:
+            self.registrar_cambios([registro])
+        else:
+            self.guardar_archivo()
+        self.publicar([registro])
+
+    # Metodo para recibir los cambios confirmados: funcion(evento) se llama una vez por cambio con un
+    # diccionario como los del diario ("op", "id_item" y solo los campos que cambiaron) más "sec",
+    # un número creciente para detectar eventos perdidos. Los cambios de un lote se publican al
+    # confirmarse y los de un lote cancelado nunca se publican. También sirve una cola: suscribir(cola.put)
+    def suscribir(self, funcion):
+        self.suscriptores.append(funcion)
+        return funcion
+
+    def desuscribir(self, funcion):
+        self.suscriptores.remove(funcion)
+
+    def publicar(self, registros):
+        if not self.suscriptores:
+            return  # Sin suscriptores no hay ningún costo extra
+        for registro in registros:
+            self.secuencia_eventos += 1
+            evento = dict(registro, sec=self.secuencia_eventos)
+            for funcion in list(self.suscriptores):
+                try:
+                    funcion(evento)
+                except Exception as e:  # Un suscriptor con errores no debe deshacer un cambio ya guardado
+                    print(f"Error en un suscriptor: {str(e)}")
+
+    # Metodo que crea el contenedor de items según el modo elegido
+    def nuevo_almacen(self):
+        if self.almacen_mmap:
+            return AlmacenMmap(self.archivo, vaciar=True)
+        return AlmacenColumnar() if self.almacen_columnar else {}
+
+    # Context manager para aplicar muchos cambios en memoria y guardar una sola vez al final
+    # Uso: with inventario.lote(): inventario.aña_item(...); inventario.act_item(...)
+    @contextmanager
+    def lote(self):
+        if self.en_lote:  # Un lote dentro de otro se integra al lote exterior
+            yield self
+            return
+        # En lugar de copiar todo el inventario, cada cambio anota cómo deshacerse:
+        # cancelar el lote cuesta lo mismo que los cambios que alcanzó a hacer
+        self.deshacer = []
+        self.en_lote = True
+        try:
+            yield self
+        except BaseException:
+            self.deshacer_lote()  # Si ocurre un error restauramos el inventario en memoria
+            print("Lote cancelado, se restauró el inventario.")
+            raise
+        else:
+            if self.registros_lote:
+                if self.almacen_mmap:
+                    pass  # Con mmap los cambios ya están en el archivo
+                elif self.usar_diario:
+                    self.registrar_cambios(self.registros_lote)  # Una sola escritura para todo el lote
+                else:
+                    self.guardar_archivo()  # Una sola reescritura del JSON para todo el lote
+                self.publicar(self.registros_lote)
+        finally:
+            self.en_lote = False
+            self.registros_lote = []
+            self.deshacer = None
+
+    # Metodo que deshace, del último al primero, los cambios en memoria del lote en curso
+    def deshacer_lote(self):
+        pasos, self.deshacer = self.deshacer, None  # Lo que se hace al deshacer no se anota
+        for paso in reversed(pasos):
+            if paso[0] == "agregar":
+                _, item, orden = paso
+                self.agregar_en_memoria(item)
+                if orden is not None and not self.indice_pendiente:
+                    self.orden_items[item.get_id()] = orden  # Las búsquedas lo devuelven en su lugar de antes
+            elif paso[0] == "quitar":
+                self.quitar_de_memoria(paso[1])
+            else:
+                _, id_item, cantidad, precio = paso
+                self.actualizar_en_memoria(id_item, cantidad, precio)
+
+    # Metodo para leer el diario y aplicar cada cambio en memoria
+    def reproducir_diario(self):
+        try:
+            with open(self.archivo_diario, "r") as f:
+                for linea in f:
+                    linea = linea.strip()
+                    if not linea:
+                        continue
+                    try:
+                        registro = json.loads(linea)
+                    except json.JSONDecodeError:
+                        # Una última línea incompleta (por ejemplo tras un corte de luz) se descarta
+                        print("Aviso: se ignoró un registro incompleto del diario.")
+                        continue
+                    self.aplicar_registro(registro)
+                    self.cambios_diario += 1
+            print(f"Diario aplicado: {self.cambios_diario} cambios.")
+        except FileNotFoundError:
+            pass  # Sin diario no hay cambios pendientes
+        except Exception as e:
+            print(f"Error al leer el diario: {str(e)}")
+
+    # Metodo que aplica un registro del diario sobre el diccionario de items
+    def aplicar_registro(self, registro):
+        op = registro["op"]
+        id_item = registro["id_item"]
+        if op == "añadir":
+            self.agregar_en_memoria(Item(id_item, registro["nombre"],
+                                         int(registro["cantidad"]), float(registro["precio"])))
+        elif op == "eliminar":
+            self.quitar_de_memoria(id_item)
+        elif op == "actualizar" and id_item in self.items:
+            cantidad = registro.get("cantidad")
+            precio = registro.get("precio")
+            self.actualizar_en_memoria(id_item, int(cantidad) if cantidad is not None else None,
+                                       float(precio) if precio is not None else None)
+
+    # Metodo para escribir la foto completa en el JSON y vaciar el diario
+    def compactar(self):
+        # Solo vaciamos el diario si la foto quedó escrita en el disco
+        if not (self.guardar_archivo() and self.esperar_guardado()):
+            return
+        try:
+            open(self.archivo_diario, "w").close()  # Vaciamos el diario, ya está incluido en el JSON
+            self.cambios_diario = 0
+        except Exception as e:
+            print(f"Error al vaciar el diario: {str(e)}")
+
+    # Metodo para guardar un item en el diccionario y en el índice de nombres
+    def agregar_en_memoria(self, item):
+        id_item = item.get_id()
+        if id_item in self.items:
+            self.quitar_de_memoria(id_item)  # Si reemplazamos un item quitamos sus trigramas viejos
+        self.items[id_item] = item
+        if self.deshacer is not None:
+            self.deshacer.append(("quitar", id_item))
+        for derivado in self.derivados:
+            derivado.al_agregar(id_item, item.get_cantidad(), item.get_precio())
+        if self.indice_pendiente:
+            return  # El índice se armará completo en la primera búsqueda
+        for t in trigramas(item.get_nombre()):
+            self.indice_nombres.setdefault(t, set()).add(id_item)
+        self.orden_items[id_item] = self.secuencia
+        self.secuencia += 1
+
+    # Metodo para quitar un item del diccionario y del índice de nombres
+    def quitar_de_memoria(self, id_item):
+        if self.deshacer is not None and id_item in self.items:
+            # Copia simple: con mmap el item es una vista del registro que se va a borrar
+            item = self.items[id_item]
+            self.deshacer.append(("agregar", Item(id_item, item.get_nombre(), item.get_cantidad(),
+                                                  item.get_precio()), self.orden_items.get(id_item)))
+        item = self.items.pop(id_item, None)
+        if item is None:
+            return
+        for derivado in self.derivados:
+            derivado.al_quitar(id_item, item.get_cantidad(), item.get_precio())
+        if self.indice_pendiente:
+            return
+        for t in trigramas(item.get_nombre()):
+            ids = self.indice_nombres.get(t)
+            if ids is not None:
+                ids.discard(id_item)
+                if not ids:
+                    del self.indice_nombres[t]  # No dejamos trigramas vacíos en el índice
+        del self.orden_items[id_item]
+
+    # Metodo para cambiar cantidad y/o precio de un item que ya está en memoria
+    def actualizar_en_memoria(self, id_item, cantidad=None, precio=None):
+        item = self.items[id_item]
+        cantidad_anterior, precio_anterior = item.get_cantidad(), item.get_precio()
+        if self.deshacer is not None:
+            self.deshacer.append(("actualizar", id_item, cantidad_anterior, precio_anterior))
+        if cantidad is not None:
+            item.set_cantidad(cantidad)
+        if precio is not None:
+            item.set_precio(precio)
+        for derivado in self.derivados:
+            derivado.al_actualizar(id_item, cantidad_anterior, precio_anterior,
+                                   item.get_cantidad(), item.get_precio())
+
+    # Metodo para volver a generar el índice a partir de los items dados (por defecto self.items)
+    def reconstruir_indice(self, items=None):
+        if items is None:
+            items = [Item(i.get_id(), i.get_nombre(), i.get_cantidad(), i.get_precio())
+                     for i in self.items.values()]
+        if isinstance(self.items, AlmacenMmap):
+            self.items.cerrar()  # El archivo se vuelve a crear vacío en nuevo_almacen
+        self.items = self.nuevo_almacen()
+        self.indice_nombres = {}
+        self.orden_items = {}
+        self.indice_pendiente = False
+        for derivado in self.derivados:
+            derivado.reiniciar()
+        for item in items:
+            self.agregar_en_memoria(item)
+
+    # Metodo para armar el índice de nombres a partir de self.items, sin tocar el almacén
+    def construir_indice_nombres(self):
+        self.indice_nombres = {}
+        self.orden_items = {}
+        self.indice_pendiente = False
+        for id_item, item in self.items.items():
+            for t in trigramas(item.get_nombre()):
+                self.indice_nombres.setdefault(t, set()).add(id_item)
+            self.orden_items[id_item] = self.secuencia
+            self.secuencia += 1
+
+    def aña_item(self, item):
+        if item.get_id() in self.items:  # Verificamos si el ID ya existe (búsqueda O(1) en diccionario)
+            print("Error: El ID ya existe.")  # Mensaje de error
+            return
+        self.agregar_en_memoria(item)  # Agregamos el nuevo item usando su ID como clave
+        registro = item.to_dict()
+        registro["op"] = "añadir"
+        self.persistir_cambio(registro)  # Guardamos los cambios
+        print("Producto añadido.")  # Mensaje de éxito
+
+    def el_item(self, id_item):
+        if id_item in self.items:  # Verificamos si el ID existe (búsqueda O(1) en diccionario)
+            self.quitar_de_memoria(id_item)  # Eliminamos el item del diccionario
+            self.persistir_cambio({"op": "eliminar", "id_item": id_item})  # Guardamos los cambios
+            print("Producto eliminado.")  # Mensaje de éxito
+            return
+        print("Error: Producto no encontrado.")  # Mensaje de error
+
+    def act_item(self, id_item, cantidad=None, precio=None):
+        if id_item in self.items:  # Verificamos si el ID existe (búsqueda O(1) en diccionario)
+            self.actualizar_en_memoria(id_item, cantidad, precio)  # Actualizamos cantidad y/o precio si no son None
+            registro = {"op": "actualizar", "id_item": id_item}
+            if cantidad is not None:  # El registro lleva solo los campos que cambiaron
+                registro["cantidad"] = cantidad
+            if precio is not None:
+                registro["precio"] = precio
+            self.persistir_cambio(registro)  # Guardamos los cambios
+            print("Producto actualizado exitosamente.")  # Mensaje de éxito
+            return
+        print("Error: Producto no encontrado.")  # Mensaje de error
+
+    # Metodo que devuelve contadores y latencias por operación (con metricas=True) y el tamaño actual
+    def estadisticas(self):
+        resultado = {"productos": len(self.items), "metricas_activas": self.metricas is not None}
+        if self.metricas is not None:
+            resultado.update(self.metricas.estadisticas())
+        return resultado
+
+    # Metodo para escribir las métricas en formato de texto de Prometheus (por ejemplo para node_exporter)
+    def volcar_prometheus(self, ruta):
+        if self.metricas is None:
+            print("Las métricas no están activas (use Inventario(metricas=True)).")
+            return False
+        texto = self.metricas.prometheus({"inventario_productos": len(self.items)})
+        escribir_atomico(ruta, lambda f: f.write(texto.encode("utf-8")), modo="wb")
+        return True
+
+    # Metodo que devuelve el motor de reportes, creándolo la primera vez a partir de los items
+    def analitica(self):
+        if self.reportes is None:
+            self.reportes = AnaliticaInventario(self.items.values())
+            self.derivados.append(self.reportes)
+        return self.reportes
+
+    # Metodo que devuelve los índices por rango, creándolos la primera vez a partir de los items
+    def rangos(self):
+        if self.indices_rango is None:
+            self.indices_rango = IndicesRango(self.items.values())
+            self.derivados.append(self.indices_rango)
+        return self.indices_rango
+
+    # Productos con precio entre minimo y maximo (incluidos), ordenados por precio
+    def items_por_precio(self, minimo=None, maximo=None):
+        return [self.items[id_item] for id_item in self.rangos().rango("precio", minimo, maximo)]
+
+    # Productos con cantidad entre minimo y maximo (incluidos), ordenados por cantidad
+    def items_por_cantidad(self, minimo=None, maximo=None):
+        return [self.items[id_item] for id_item in self.rangos().rango("cantidad", minimo, maximo)]
+
+    # Metodo para obtener un producto por su ID, None si no existe
+    def obtener_item(self, id_item):
+        return self.items[id_item] if id_item in self.items else None
+
+    # Metodo para sumar (o restar, con delta negativo) a la cantidad de un producto
+    def ajustar_cantidad(self, id_item, delta):
+        if id_item not in self.items:
+            print("Error: Producto no encontrado.")
+            return None
+        nueva = self.items[id_item].get_cantidad() + delta
+        self.actualizar_en_memoria(id_item, nueva)
+        self.persistir_cambio({"op": "actualizar", "id_item": id_item, "cantidad": nueva})
+        print("Producto actualizado exitosamente.")
+        return nueva
+
+    def bus_item(self, nombre):
+        if self.carga_pendiente:
+            self.cargar_pendiente()  # El índice de nombres se arma al cargar los items
+        if self.indice_pendiente:
+            self.construir_indice_nombres()
+        nombre = nombre.lower()
+        if len(nombre) < 3:  # Con menos de 3 letras no hay trigramas, recorremos todos los items
+            return [item for item in self.items.values() if nombre in item.get_nombre().lower()]
+        # Intersectamos los conjuntos de IDs de cada trigrama, empezando por el más pequeño
+        conjuntos = []
+        for t in trigramas(nombre):
+            ids = self.indice_nombres.get(t)
+            if not ids:
+                return []  # Si un trigrama no aparece en ningún nombre no hay resultados
+            conjuntos.append(ids)
+        conjuntos.sort(key=len)
+        candidatos = conjuntos[0].intersection(*conjuntos[1:])
+        # Los trigramas pueden coincidir sin que el texto completo esté contenido, así que verificamos
+        result = [self.items[id_item] for id_item in candidatos
+                  if nombre in self.items[id_item].get_nombre().lower()]
+        result.sort(key=lambda item: self.orden_items[item.get_id()])  # Mismo orden que el diccionario
+        return result  # Retornamos la lista de resultados
+
+    # Metodo para cargar muchos productos de un CSV o JSON por líneas y guardar una sola vez al final.
+    # Devuelve la cantidad importada y la lista de filas rechazadas como (número de línea, motivo).
+    def importar_archivo(self, ruta, formato=None):
+        formato = tipo_de_archivo(ruta, formato)
+        importados = 0
+        rechazados = []
+        with self.lote():  # Un solo guardado para todo el archivo
+            for numero, fila in leer_filas(ruta, formato):
+                try:
+                    item = validar_fila(fila)
+                except ValueError as e:
+                    rechazados.append((numero, str(e)))
+                    continue
+                if item.get_id() in self.items:  # Descartamos IDs repetidos con una búsqueda O(1)
+                    rechazados.append((numero, f"ID duplicado: {item.get_id()}"))
+                    continue
+                self.agregar_en_memoria(item)
+                registro = item.to_dict()
+                registro["op"] = "añadir"
+                self.persistir_cambio(registro)
+                importados += 1
+        print(f"Importación terminada: {importados} productos añadidos, {len(rechazados)} filas rechazadas.")
+        return importados, rechazados
+
+    # Metodo para escribir todos los productos en un CSV o JSON por líneas
+    def exportar_archivo(self, ruta, formato=None):
+        formato = tipo_de_archivo(ruta, formato)
+        campos = ["id_item", "nombre", "cantidad", "precio"]
+
+        def escribir(f):
+            if formato == "csv":
+                escritor = csv.writer(f)
+                escritor.writerow(campos)
+                escritor.writerows((item.get_id(), item.get_nombre(), item.get_cantidad(), item.get_precio())
+                                   for item in self.items.values())
+            else:
+                f.writelines(json.dumps(item.to_dict(), ensure_ascii=False) + "\n" for item in self.items.values())
+
+        # Mismo encoding con el que leer_filas vuelve a importar; csv.writer necesita newline=""
+        escribir_atomico(ruta, escribir, modo="w", encoding="utf-8", newline="" if formato == "csv" else None)
+        print(f"Exportados {len(self.items)} productos a {os.path.abspath(ruta)}")
+        return len(self.items)
+
+    # Generador con los productos de una página (tamaño None = todos), opcionalmente ordenados
+    # por "id", "nombre", "cantidad" o "precio"
+    def listar_items(self, tamaño=None, desplazamiento=0, orden=None, descendente=False):
+        return paginar(self.items.values(), tamaño, desplazamiento, orden, descendente)
+
+    def most_items(self, tamaño=None, desplazamiento=0, orden=None, descendente=False):
+        if len(self.items) == 0:
+            print("No hay productos en el inventario.")
+        else:
+            escribir_tabla(self.listar_items(tamaño, desplazamiento, orden, descendente), "Lista de productos:")
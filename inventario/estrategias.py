@@ -0,0 +1,550 @@
+# Otras estrategias de almacenamiento (concurrente, SQLite, fragmentado en procesos) y el registro
+# para elegir una por nombre
+
+import heapq
+import multiprocessing
+import os
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager, redirect_stdout
+from itertools import chain
+
+from .modelo import Item
+from .reportes import CLAVES_ORDEN, paginar, escribir_tabla
+from .core import Inventario
+
+
+class CerrojoLectoresEscritores:
+    """
+    Permite varios lectores a la vez o un solo escritor. El hilo que tiene el cerrojo de escritura
+    puede volver a tomarlo (o tomar el de lectura) sin bloquearse, así un lote puede llamar a los
+    demás métodos del inventario. Si un escritor espera, los lectores nuevos esperan detrás de él;
+    si no, un flujo continuo de lecturas (por ejemplo ajustes de cantidad) lo dejaría esperando para
+    siempre. Un hilo que ya lee puede volver a tomar la lectura aunque haya escritores esperando.
+    """
+
+    def __init__(self):
+        self.condicion = threading.Condition()
+        self.lectores = {}  # Hilo -> veces que tomó el cerrojo de lectura
+        self.escritores_esperando = 0
+        self.escritor = None  # Hilo que tiene el cerrojo de escritura
+        self.profundidad = 0  # Veces que el escritor tomó el cerrojo
+
+    @contextmanager
+    def lectura(self):
+        actual = threading.get_ident()
+        with self.condicion:
+            if self.escritor == actual:  # El escritor ya tiene acceso exclusivo
+                self.profundidad += 1
+                es_escritor = True
+            else:
+                if actual not in self.lectores:  # Una lectura anidada no espera: bloquearía al escritor
+                    while self.escritor is not None or self.escritores_esperando:
+                        self.condicion.wait()
+                self.lectores[actual] = self.lectores.get(actual, 0) + 1
+                es_escritor = False
+        try:
+            yield
+        finally:
+            with self.condicion:
+                if es_escritor:
+                    self.profundidad -= 1
+                else:
+                    self.lectores[actual] -= 1
+                    if self.lectores[actual] == 0:
+                        del self.lectores[actual]
+                        if not self.lectores:
+                            self.condicion.notify_all()
+
+    @contextmanager
+    def escritura(self):
+        actual = threading.get_ident()
+        with self.condicion:
+            if self.escritor == actual:
+                self.profundidad += 1
+            else:
+                self.escritores_esperando += 1  # Desde ahora no entran lectores nuevos
+                try:
+                    while self.escritor is not None or self.lectores:
+                        self.condicion.wait()
+                finally:
+                    self.escritores_esperando -= 1
+                self.escritor = actual
+                self.profundidad = 1
+        try:
+            yield
+        finally:
+            with self.condicion:
+                self.profundidad -= 1
+                if self.profundidad == 0:
+                    self.escritor = None
+                    self.condicion.notify_all()
+
+
+class InventarioConcurrente(Inventario):
+    """
+    Inventario que se puede usar desde varios hilos a la vez.
+    - Añadir, eliminar y los lotes cambian la estructura: toman el cerrojo de escritura (exclusivo).
+    - Actualizar un producto toma el cerrojo de lectura (compartido) y el cerrojo de la franja de su ID,
+      así hilos que tocan productos distintos no se esperan entre sí.
+    - Búsquedas y listados toman el cerrojo de lectura.
+    - La escritura al archivo o al diario se hace de a un hilo a la vez.
+    """
+
+    def __init__(self, *args, franjas=64, **kwargs):
+        self.cerrojo = CerrojoLectoresEscritores()
+        self.franjas = [threading.Lock() for _ in range(franjas)]  # Un cerrojo por grupo de IDs
+        self.cerrojo_persistencia = threading.RLock()
+        super().__init__(*args, **kwargs)
+
+    def cerrojo_de(self, id_item):
+        return self.franjas[hash(id_item) % len(self.franjas)]
+
+    def persistir_cambio(self, registro):
+        with self.cerrojo_persistencia:
+            super().persistir_cambio(registro)
+
+    @contextmanager
+    def lote(self):
+        with self.cerrojo.escritura():
+            with super().lote():
+                yield self
+
+    def aña_item(self, item):
+        with self.cerrojo.escritura():
+            super().aña_item(item)
+
+    def el_item(self, id_item):
+        with self.cerrojo.escritura():
+            super().el_item(id_item)
+
+    def act_item(self, id_item, cantidad=None, precio=None):
+        with self.cerrojo.lectura(), self.cerrojo_de(id_item):
+            super().act_item(id_item, cantidad, precio)
+
+    def ajustar_cantidad(self, id_item, delta):
+        # Leer, sumar y guardar la cantidad ocurre sin que otro hilo toque el mismo producto
+        with self.cerrojo.lectura(), self.cerrojo_de(id_item):
+            return super().ajustar_cantidad(id_item, delta)
+
+    def obtener_item(self, id_item):
+        with self.cerrojo.lectura():
+            return super().obtener_item(id_item)
+
+    def bus_item(self, nombre):
+        if self.carga_pendiente:
+            self.cargar_pendiente()  # Fuera de los cerrojos: la carga puede dejar pendiente el índice (mmap)
+        if self.indice_pendiente:
+            with self.cerrojo.escritura():  # Armar el índice cambia estructuras compartidas
+                return super().bus_item(nombre)
+        with self.cerrojo.lectura():
+            return super().bus_item(nombre)
+
+    def exportar_archivo(self, ruta, formato=None):
+        with self.cerrojo.lectura():
+            return super().exportar_archivo(ruta, formato)
+
+    def listar_items(self, *args, **kwargs):
+        with self.cerrojo.lectura():
+            return list(super().listar_items(*args, **kwargs))  # Copiamos la página mientras tenemos el cerrojo
+
+    def most_items(self, *args, **kwargs):
+        with self.cerrojo.lectura():
+            super().most_items(*args, **kwargs)
+
+    def analitica(self):
+        with self.cerrojo.escritura():  # Crear los reportes recorre todos los items
+            return super().analitica()
+
+    def rangos(self):
+        with self.cerrojo.escritura():
+            return super().rangos()
+
+    def items_por_precio(self, minimo=None, maximo=None):
+        indices = self.rangos()
+        with self.cerrojo.lectura():
+            return [self.items[id_item] for id_item in indices.rango("precio", minimo, maximo)]
+
+    def items_por_cantidad(self, minimo=None, maximo=None):
+        indices = self.rangos()
+        with self.cerrojo.lectura():
+            return [self.items[id_item] for id_item in indices.rango("cantidad", minimo, maximo)]
+
+    def guardar_archivo(self):
+        with self.cerrojo.lectura(), self.cerrojo_persistencia:
+            return super().guardar_archivo()
+
+
+class InventarioSQLite:
+    """
+    Inventario con la misma interfaz que Inventario, pero guardado en una base SQLite.
+    Los cambios se escriben por fila (sin reescribir todo el archivo), el catálogo no necesita
+    caber en memoria y varios procesos pueden leer la misma base a la vez (modo WAL).
+    """
+
+    # Consultas fijas: sqlite3 guarda las sentencias ya preparadas y las reutiliza
+    SQL_EXISTE = "SELECT 1 FROM items WHERE id_item = ?"
+    SQL_OBTENER = "SELECT id_item, nombre, cantidad, precio FROM items WHERE id_item = ?"
+    SQL_INSERTAR = "INSERT INTO items (id_item, nombre, nombre_min, cantidad, precio) VALUES (?, ?, ?, ?, ?)"
+    SQL_ELIMINAR = "DELETE FROM items WHERE id_item = ?"
+    SQL_ACT_CANTIDAD = "UPDATE items SET cantidad = ? WHERE id_item = ?"
+    SQL_ACT_PRECIO = "UPDATE items SET precio = ? WHERE id_item = ?"
+    SQL_PAGINA = "SELECT id_item, nombre, cantidad, precio FROM items ORDER BY {orden} LIMIT ? OFFSET ?"
+    COLUMNAS_ORDEN = {None: "rowid", "id": "id_item", "nombre": "nombre_min", "cantidad": "cantidad", "precio": "precio"}
+    SQL_BUSCAR_FTS = ("SELECT id_item, nombre, cantidad, precio FROM items WHERE rowid IN "
+                      "(SELECT rowid FROM nombres_fts WHERE nombres_fts MATCH ?) "
+                      "AND instr(nombre_min, ?) > 0 ORDER BY rowid")
+    SQL_BUSCAR = ("SELECT id_item, nombre, cantidad, precio FROM items "
+                  "WHERE instr(nombre_min, ?) > 0 ORDER BY rowid")
+
+    def __init__(self, archivo="inventarios.db"):
+        self.archivo = archivo  # Archivo de la base de datos
+        self.en_lote = False
+        # isolation_level=None: cada cambio se confirma solo, salvo dentro de lote()
+        self.conexion = sqlite3.connect(archivo, isolation_level=None, check_same_thread=False)
+        self.conexion.execute("PRAGMA journal_mode=WAL")  # Lectores y escritor no se bloquean entre sí
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        self.conexion.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            "id_item TEXT PRIMARY KEY, nombre TEXT NOT NULL, nombre_min TEXT NOT NULL, "
+            "cantidad INTEGER NOT NULL, precio REAL NOT NULL)"
+        )
+        # Índices ordenados para las consultas por rango de precio y cantidad
+        self.conexion.execute("CREATE INDEX IF NOT EXISTS items_precio ON items (precio)")
+        self.conexion.execute("CREATE INDEX IF NOT EXISTS items_cantidad ON items (cantidad)")
+        self.usar_fts = self.crear_indice_nombres()
+        total = self.conexion.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        print(f"Inventario SQLite abierto: {total} productos.")
+
+    # Metodo que crea el índice de trigramas (FTS5) sobre el nombre, si la versión de SQLite lo permite
+    def crear_indice_nombres(self):
+        try:
+            self.conexion.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS nombres_fts "
+                "USING fts5(nombre_min, content='items', content_rowid='rowid', tokenize='trigram')"
+            )
+        except sqlite3.OperationalError:
+            return False  # Sin FTS5 con trigramas las búsquedas recorren la tabla
+        # Disparadores para mantener el índice al día con la tabla de items
+        self.conexion.executescript("""
+            CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+                INSERT INTO nombres_fts(rowid, nombre_min) VALUES (new.rowid, new.nombre_min);
+            END;
+            CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+                INSERT INTO nombres_fts(nombres_fts, rowid, nombre_min) VALUES ('delete', old.rowid, old.nombre_min);
+            END;
+        """)
+        return True
+
+    # Context manager: todos los cambios del bloque en una sola transacción
+    @contextmanager
+    def lote(self):
+        if self.en_lote:
+            yield self
+            return
+        self.en_lote = True
+        self.conexion.execute("BEGIN")
+        try:
+            yield self
+        except BaseException:
+            self.conexion.execute("ROLLBACK")
+            print("Lote cancelado, se restauró el inventario.")
+            raise
+        else:
+            self.conexion.execute("COMMIT")
+        finally:
+            self.en_lote = False
+
+    def aña_item(self, item):
+        if self.conexion.execute(self.SQL_EXISTE, (item.get_id(),)).fetchone():  # Búsqueda por clave primaria
+            print("Error: El ID ya existe.")
+            return
+        self.conexion.execute(self.SQL_INSERTAR, (item.get_id(), item.get_nombre(), item.get_nombre().lower(),
+                                                  item.get_cantidad(), item.get_precio()))
+        print("Producto añadido.")
+
+    def el_item(self, id_item):
+        if self.conexion.execute(self.SQL_ELIMINAR, (id_item,)).rowcount:
+            print("Producto eliminado.")
+            return
+        print("Error: Producto no encontrado.")
+
+    def act_item(self, id_item, cantidad=None, precio=None):
+        if not self.conexion.execute(self.SQL_EXISTE, (id_item,)).fetchone():
+            print("Error: Producto no encontrado.")
+            return
+        with self.lote():  # Cantidad y precio se actualizan juntos
+            if cantidad is not None:
+                self.conexion.execute(self.SQL_ACT_CANTIDAD, (cantidad, id_item))
+            if precio is not None:
+                self.conexion.execute(self.SQL_ACT_PRECIO, (precio, id_item))
+        print("Producto actualizado exitosamente.")
+
+    def obtener_item(self, id_item):
+        fila = self.conexion.execute(self.SQL_OBTENER, (id_item,)).fetchone()
+        return Item(*fila) if fila is not None else None
+
+    def bus_item(self, nombre):
+        nombre = nombre.lower()
+        if self.usar_fts and len(nombre) >= 3:
+            frase = '"' + nombre.replace('"', '""') + '"'  # Buscamos el texto exacto como frase
+            filas = self.conexion.execute(self.SQL_BUSCAR_FTS, (frase, nombre))
+        else:
+            filas = self.conexion.execute(self.SQL_BUSCAR, (nombre,))
+        return [Item(id_item, nombre_item, cantidad, precio) for id_item, nombre_item, cantidad, precio in filas]
+
+    def items_por_rango(self, columna, minimo, maximo):
+        condiciones, parametros = [], []
+        if minimo is not None:
+            condiciones.append(f"{columna} >= ?")
+            parametros.append(minimo)
+        if maximo is not None:
+            condiciones.append(f"{columna} <= ?")
+            parametros.append(maximo)
+        donde = ("WHERE " + " AND ".join(condiciones)) if condiciones else ""
+        filas = self.conexion.execute(f"SELECT id_item, nombre, cantidad, precio FROM items {donde} "
+                                      f"ORDER BY {columna}, id_item", parametros)
+        return [Item(id_item, nombre, cantidad, precio) for id_item, nombre, cantidad, precio in filas]
+
+    def items_por_precio(self, minimo=None, maximo=None):
+        return self.items_por_rango("precio", minimo, maximo)
+
+    def items_por_cantidad(self, minimo=None, maximo=None):
+        return self.items_por_rango("cantidad", minimo, maximo)
+
+    def listar_items(self, tamaño=None, desplazamiento=0, orden=None, descendente=False):
+        # Con empates se respeta el orden de inserción, igual que en Inventario
+        columna = self.COLUMNAS_ORDEN[orden] + (" DESC" if descendente else "") + ", rowid"
+        filas = self.conexion.execute(self.SQL_PAGINA.format(orden=columna),
+                                      (-1 if tamaño is None else tamaño, desplazamiento))
+        return (Item(id_item, nombre, cantidad, precio) for id_item, nombre, cantidad, precio in filas)
+
+    def most_items(self, tamaño=None, desplazamiento=0, orden=None, descendente=False):
+        if self.conexion.execute("SELECT 1 FROM items LIMIT 1").fetchone() is None:
+            print("No hay productos en el inventario.")
+        else:
+            escribir_tabla(self.listar_items(tamaño, desplazamiento, orden, descendente), "Lista de productos:")
+
+    def cerrar(self):
+        self.conexion.close()
+
+
+# Estrategias de almacenamiento intercambiables: todas ofrecen aña_item, el_item, act_item,
+# obtener_item, bus_item, listar_items y cerrar, así que el resto del código no depende de cuál se use
+ESTRATEGIAS = {
+    "dict": lambda **opciones: Inventario(**opciones),
+    "diario": lambda **opciones: Inventario(usar_diario=True, **opciones),
+    "columnar": lambda **opciones: Inventario(almacen_columnar=True, **opciones),
+    "mmap": lambda **opciones: Inventario(almacen_mmap=True, **opciones),
+    "concurrente": lambda **opciones: InventarioConcurrente(**opciones),
+    "sqlite": lambda **opciones: InventarioSQLite(**opciones),
+}
+
+
+def crear_inventario(estrategia="dict", **opciones):
+    """Crea un inventario con la estrategia de almacenamiento indicada (ver ESTRATEGIAS)"""
+    if estrategia not in ESTRATEGIAS:
+        raise ValueError(f"Estrategia desconocida: {estrategia} (opciones: {', '.join(ESTRATEGIAS)})")
+    return ESTRATEGIAS[estrategia](**opciones)
+
+
+def fragmento_de(id_item, fragmentos):
+    """Número de fragmento de un ID; crc32 da lo mismo en todos los procesos y ejecuciones (hash() no)"""
+    return zlib.crc32(str(id_item).encode("utf-8")) % fragmentos
+
+
+def aplicar_operaciones(inventario, operaciones):
+    """Aplica una lista de (metodo, argumentos) dentro de un solo lote del inventario"""
+    with inventario.lote():
+        for metodo, argumentos in operaciones:
+            getattr(inventario, metodo)(*argumentos)
+    return len(operaciones)
+
+
+# Operaciones de un fragmento que no son un método directo de Inventario
+OPERACIONES_FRAGMENTO = {
+    "aplicar_operaciones": aplicar_operaciones,
+    "contar": lambda inventario: len(inventario.items),
+    "listar_items": lambda inventario, *argumentos: list(inventario.listar_items(*argumentos)),
+}
+
+
+def ejecutar_en_fragmento(inventario, metodo, argumentos):
+    funcion = OPERACIONES_FRAGMENTO.get(metodo)
+    if funcion is not None:
+        return funcion(inventario, *argumentos)
+    return getattr(inventario, metodo)(*argumentos)
+
+
+def trabajador_fragmento(conexion, opciones):
+    """Proceso dueño de un fragmento: recibe (metodo, argumentos) por la tubería y responde (ok, resultado)"""
+    with open(os.devnull, "w") as nulo, redirect_stdout(nulo):  # Los mensajes de cada operación no se muestran
+        inventario = Inventario(**opciones)
+        while True:
+            try:
+                pedido = conexion.recv()
+            except EOFError:
+                break  # El proceso principal se cerró
+            if pedido is None:
+                break
+            try:
+                conexion.send((True, ejecutar_en_fragmento(inventario, *pedido)))
+            except Exception as e:
+                conexion.send((False, e))
+        inventario.cerrar()
+    conexion.close()
+
+
+class InventarioFragmentado:
+    """
+    Inventario repartido en N fragmentos según el hash del ID, cada uno con su propio archivo
+    (inventarios_0.json, inventarios_1.json, ...). Con procesos=True cada fragmento vive en un
+    proceso aparte: las operaciones sobre un ID van a un solo proceso y las búsquedas y listados
+    se envían a todos a la vez y se combinan, así se aprovechan varios núcleos.
+    Dentro de lote() los cambios se acumulan y al salir cada fragmento los aplica en un solo lote
+    propio (las lecturas hechas dentro del lote todavía no ven esos cambios).
+    """
+
+    def __init__(self, fragmentos=4, procesos=False, directorio=".", **opciones):
+        self.cantidad = fragmentos
+        self.fragmentos = []  # Inventarios locales (sin procesos)
+        self.procesos = []
+        self.conexiones = []  # Extremo de la tubería de cada proceso
+        self.cerrojo = threading.Lock()  # Un pedido a la vez por tubería
+        self.en_lote = False
+        self.operaciones_lote = None  # Por fragmento, lista de (metodo, argumentos) pendientes
+        for k in range(fragmentos):
+            opciones_fragmento = dict(opciones, nombre=os.path.join(directorio, f"inventarios_{k}"))
+            if procesos:
+                conexion, conexion_hijo = multiprocessing.Pipe()
+                proceso = multiprocessing.Process(target=trabajador_fragmento,
+                                                  args=(conexion_hijo, opciones_fragmento), daemon=True)
+                proceso.start()
+                conexion_hijo.close()
+                self.procesos.append(proceso)
+                self.conexiones.append(conexion)
+            else:
+                self.fragmentos.append(Inventario(**opciones_fragmento))
+        print(f"Inventario fragmentado abierto: {len(self)} productos en {fragmentos} fragmentos.")
+
+    def __len__(self):
+        return sum(self.a_todos("contar"))
+
+    # Metodo que envía un pedido a varios fragmentos: con procesos se envían todos antes de
+    # esperar la primera respuesta, así los fragmentos trabajan en paralelo
+    def llamar_varios(self, pedidos):
+        if not self.procesos:
+            return {k: ejecutar_en_fragmento(self.fragmentos[k], metodo, argumentos)
+                    for k, (metodo, argumentos) in pedidos.items()}
+        with self.cerrojo:
+            for k, pedido in pedidos.items():
+                self.conexiones[k].send(pedido)
+            resultados = {}
+            error = None
+            for k in pedidos:  # Leemos todas las respuestas aunque alguna falle, para no desfasar las tuberías
+                ok, resultado = self.conexiones[k].recv()
+                if ok:
+                    resultados[k] = resultado
+                elif error is None:
+                    error = resultado
+        if error is not None:
+            raise error
+        return resultados
+
+    def a_todos(self, metodo, *argumentos):
+        resultados = self.llamar_varios({k: (metodo, argumentos) for k in range(self.cantidad)})
+        return [resultados[k] for k in range(self.cantidad)]
+
+    # Metodo para las operaciones sobre un ID: van solo al fragmento dueño (o al lote pendiente)
+    def al_fragmento(self, id_item, metodo, *argumentos):
+        k = fragmento_de(id_item, self.cantidad)
+        if self.en_lote:
+            self.operaciones_lote[k].append((metodo, argumentos))
+            return None
+        return self.llamar_varios({k: (metodo, argumentos)})[k]
+
+    @contextmanager
+    def lote(self):
+        if self.en_lote:  # Un lote dentro de otro se integra al lote exterior
+            yield self
+            return
+        self.en_lote = True
+        self.operaciones_lote = [[] for _ in range(self.cantidad)]
+        try:
+            yield self
+        except BaseException:
+            print("Lote cancelado, no se envió ningún cambio.")
+            raise
+        else:
+            pedidos = {k: ("aplicar_operaciones", (operaciones,))
+                       for k, operaciones in enumerate(self.operaciones_lote) if operaciones}
+            self.en_lote = False
+            self.llamar_varios(pedidos)  # Todos los fragmentos aplican su parte a la vez
+        finally:
+            self.en_lote = False
+            self.operaciones_lote = None
+
+    def aña_item(self, item):
+        return self.al_fragmento(item.get_id(), "aña_item", item)
+
+    def el_item(self, id_item):
+        return self.al_fragmento(id_item, "el_item", id_item)
+
+    def act_item(self, id_item, cantidad=None, precio=None):
+        return self.al_fragmento(id_item, "act_item", id_item, cantidad, precio)
+
+    def ajustar_cantidad(self, id_item, delta):
+        return self.al_fragmento(id_item, "ajustar_cantidad", id_item, delta)
+
+    # Las lecturas no pasan por el lote pendiente: se consulta directo al fragmento dueño
+    def obtener_item(self, id_item):
+        k = fragmento_de(id_item, self.cantidad)
+        return self.llamar_varios({k: ("obtener_item", (id_item,))})[k]
+
+    # Cada fragmento busca en su parte y se concatenan los resultados (fragmento 0, 1, ...)
+    def bus_item(self, nombre):
+        return list(chain.from_iterable(self.a_todos("bus_item", nombre)))
+
+    # Cada fragmento devuelve ya ordenadas sus primeras tamaño + desplazamiento filas y se combinan
+    def listar_items(self, tamaño=None, desplazamiento=0, orden=None, descendente=False):
+        limite = None if tamaño is None else tamaño + desplazamiento
+        partes = self.a_todos("listar_items", limite, 0, orden, descendente)
+        if orden is None:
+            # Sin orden el listado es la concatenación de los fragmentos. En descendente cada parte ya
+            # viene invertida: solo falta invertir el orden de los fragmentos, no volver a invertir todo
+            if descendente:
+                partes.reverse()
+            return paginar(chain.from_iterable(partes), tamaño, desplazamiento)
+        return paginar(chain.from_iterable(partes), tamaño, desplazamiento, orden, descendente)
+
+    def most_items(self, tamaño=None, desplazamiento=0, orden=None, descendente=False):
+        escribir_tabla(self.listar_items(tamaño, desplazamiento, orden, descendente), "Lista de productos:")
+
+    def items_por_precio(self, minimo=None, maximo=None):
+        return list(heapq.merge(*self.a_todos("items_por_precio", minimo, maximo), key=CLAVES_ORDEN["precio"]))
+
+    def items_por_cantidad(self, minimo=None, maximo=None):
+        return list(heapq.merge(*self.a_todos("items_por_cantidad", minimo, maximo),
+                                key=CLAVES_ORDEN["cantidad"]))
+
+    def guardar_archivo(self):
+        return all(self.a_todos("guardar_archivo"))
+
+    # Estadísticas de cada fragmento (ver Inventario.estadisticas)
+    def estadisticas(self):
+        return self.a_todos("estadisticas")
+
+    def cerrar(self):
+        if self.procesos:
+            with self.cerrojo:
+                for conexion in self.conexiones:
+                    conexion.send(None)  # Cada proceso guarda lo pendiente y termina
+                for proceso, conexion in zip(self.procesos, self.conexiones):
+                    proceso.join()
+                    conexion.close()
+            self.procesos = []
+            self.conexiones = []
+        else:
+            for fragmento in self.fragmentos:
+                fragmento.cerrar()
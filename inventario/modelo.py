@@ -0,0 +1,114 @@
+# Modelo de datos del inventario: el producto y las utilidades que no dependen del almacenamiento
+
+
+class Item:  # Creamos nuestra clase Item
+    __slots__ = ("id_item", "nombre", "cantidad", "precio")  # Sin __dict__ por instancia, ocupa menos memoria
+
+    def __init__(self, id_item, nombre, cantidad, precio):  # Constructor con atributos
+        self.id_item = id_item
+        self.nombre = nombre
+        self.cantidad = cantidad
+        self.precio = precio
+
+    def get_id(self):
+        return self.id_item
+
+    def get_nombre(self):
+        return self.nombre
+
+    def get_cantidad(self):
+        return self.cantidad
+
+    def get_precio(self):
+        return self.precio
+
+    def set_cantidad(self, cantidad):  # metodo para la cantidad
+        self.cantidad = cantidad
+
+    def set_precio(self, precio):  # metodo precio
+        self.precio = precio
+
+    def to_dict(self):
+        """Convierte el objeto Item a un diccionario para serialización JSON"""
+        return {
+            "id_item": self.id_item,
+            "nombre": self.nombre,
+            "cantidad": self.cantidad,
+            "precio": self.precio
+        }
+
+
+class ItemVista:
+    """Vista liviana de un producto guardado en AlmacenColumnar o AlmacenMmap, con la misma interfaz que Item"""
+    __slots__ = ("almacen", "id_item")
+
+    def __init__(self, almacen, id_item):
+        self.almacen = almacen
+        self.id_item = id_item
+
+    @property
+    def nombre(self):
+        return self.almacen.nombre_de(self.id_item)
+
+    @property
+    def cantidad(self):
+        return self.almacen.cantidad_de(self.id_item)
+
+    @property
+    def precio(self):
+        return self.almacen.precio_de(self.id_item)
+
+    def get_id(self):
+        return self.id_item
+
+    def get_nombre(self):
+        return self.nombre
+
+    def get_cantidad(self):
+        return self.cantidad
+
+    def get_precio(self):
+        return self.precio
+
+    def set_cantidad(self, cantidad):
+        self.almacen.poner_cantidad(self.id_item, cantidad)
+
+    def set_precio(self, precio):
+        self.almacen.poner_precio(self.id_item, precio)
+
+    def to_dict(self):
+        """Convierte el producto a un diccionario para serialización JSON"""
+        return {
+            "id_item": self.id_item,
+            "nombre": self.nombre,
+            "cantidad": self.cantidad,
+            "precio": self.precio
+        }
+
+
+def validar_fila(fila):
+    """Convierte una fila importada en Item; lanza ValueError con el motivo si no es válida"""
+    if fila is None:
+        raise ValueError("línea con formato inválido")
+    try:
+        id_item = str(fila["id_item"]).strip()
+        nombre = str(fila["nombre"]).strip()
+        cantidad_texto, precio_texto = fila["cantidad"], fila["precio"]
+    except KeyError as e:
+        raise ValueError(f"falta el campo {e.args[0]}")
+    if not id_item or not nombre:
+        raise ValueError("ID o nombre vacío")
+    try:
+        cantidad = int(cantidad_texto)
+        precio = float(precio_texto)
+    except (TypeError, ValueError):
+        raise ValueError("cantidad o precio no numérico")
+    if cantidad < 0 or precio < 0:
+        raise ValueError("cantidad o precio negativo")
+    return Item(id_item, nombre, cantidad, precio)
+
+
+def trigramas(texto):
+    """Devuelve el conjunto de trigramas (subcadenas de 3 letras) del texto en minúsculas"""
+    texto = texto.lower()
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
@@ -0,0 +1,320 @@
+# Métricas, reportes, paginación e índices por rango que acompañan al inventario
+
+import heapq
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+
+try:
+    import numpy as np  # Opcional: si está instalado los reportes se calculan de forma vectorizada
+except ImportError:
+    np = None
+
+
+class MetricasInventario:
+    """
+    Contadores e histogramas de latencia por operación, más bytes escritos por destino.
+    Los cubos del histograma son fijos (de 1 µs a 10 s), así registrar una duración es O(log cubos)
+    y la memoria no crece con la cantidad de operaciones. Los percentiles se estiman con el
+    límite superior del cubo donde caen.
+    """
+
+    CUBOS = [float(f"{m}e{e}") for e in range(-6, 1) for m in (1, 2.5, 5)] + [10.0]  # Segundos
+
+    def __init__(self):
+        self.cerrojo = threading.Lock()  # Varias hebras pueden registrar a la vez
+        self.cuentas = {}  # operacion -> [cantidad por cubo] (el último cubo es "más de 10 s")
+        self.totales = {}  # operacion -> segundos acumulados
+        self.bytes_escritos = {}  # destino ("guardar", "diario") -> bytes
+        self.escrituras = {}  # destino -> cantidad de escrituras
+
+    def registrar(self, operacion, segundos):
+        cubo = bisect_left(self.CUBOS, segundos)
+        with self.cerrojo:
+            cuentas = self.cuentas.get(operacion)
+            if cuentas is None:
+                cuentas = self.cuentas[operacion] = [0] * (len(self.CUBOS) + 1)
+                self.totales[operacion] = 0.0
+            cuentas[cubo] += 1
+            self.totales[operacion] += segundos
+
+    def sumar_bytes(self, destino, cantidad):
+        with self.cerrojo:
+            self.bytes_escritos[destino] = self.bytes_escritos.get(destino, 0) + cantidad
+            self.escrituras[destino] = self.escrituras.get(destino, 0) + 1
+
+    def medir(self, operacion, funcion):
+        """Devuelve la función envuelta para registrar la duración de cada llamada"""
+        reloj = time.perf_counter
+        registrar = self.registrar
+
+        def medida(*args, **kwargs):
+            inicio = reloj()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                registrar(operacion, reloj() - inicio)
+        return medida
+
+    def percentil(self, cuentas, p):
+        objetivo = sum(cuentas) * p / 100
+        acumulado = 0
+        for i, cantidad in enumerate(cuentas):
+            acumulado += cantidad
+            if acumulado >= objetivo:
+                return self.CUBOS[i] if i < len(self.CUBOS) else float("inf")
+        return 0.0
+
+    def estadisticas(self):
+        with self.cerrojo:
+            cuentas = {operacion: list(c) for operacion, c in self.cuentas.items()}
+            totales = dict(self.totales)
+            resultado = {"bytes_escritos": dict(self.bytes_escritos), "escrituras": dict(self.escrituras)}
+        operaciones = {}
+        for operacion, c in cuentas.items():
+            cantidad = sum(c)
+            operaciones[operacion] = {
+                "cantidad": cantidad,
+                "total_s": totales[operacion],
+                "media_ms": totales[operacion] / cantidad * 1000,
+                "p50_ms": self.percentil(c, 50) * 1000,
+                "p95_ms": self.percentil(c, 95) * 1000,
+                "p99_ms": self.percentil(c, 99) * 1000,
+            }
+        resultado["operaciones"] = operaciones
+        return resultado
+
+    def prometheus(self, extras=None):
+        """Texto en el formato de exposición de Prometheus (extras: métricas de valor fijo)"""
+        with self.cerrojo:
+            cuentas = {operacion: list(c) for operacion, c in self.cuentas.items()}
+            totales = dict(self.totales)
+            bytes_escritos = dict(self.bytes_escritos)
+            escrituras = dict(self.escrituras)
+        lineas = ["# HELP inventario_operacion_segundos Duración de las operaciones del inventario",
+                  "# TYPE inventario_operacion_segundos histogram"]
+        for operacion, c in sorted(cuentas.items()):
+            acumulado = 0
+            for limite, cantidad in zip(self.CUBOS + ["+Inf"], c):
+                acumulado += cantidad  # Prometheus usa cuentas acumuladas por cubo
+                lineas.append(f'inventario_operacion_segundos_bucket{{operacion="{operacion}",le="{limite}"}} {acumulado}')
+            lineas.append(f'inventario_operacion_segundos_sum{{operacion="{operacion}"}} {totales[operacion]}')
+            lineas.append(f'inventario_operacion_segundos_count{{operacion="{operacion}"}} {acumulado}')
+        lineas += ["# HELP inventario_bytes_escritos_total Bytes escritos al disco",
+                   "# TYPE inventario_bytes_escritos_total counter"]
+        lineas += [f'inventario_bytes_escritos_total{{destino="{d}"}} {b}' for d, b in sorted(bytes_escritos.items())]
+        lineas += ["# HELP inventario_escrituras_total Escrituras al disco",
+                   "# TYPE inventario_escrituras_total counter"]
+        lineas += [f'inventario_escrituras_total{{destino="{d}"}} {n}' for d, n in sorted(escrituras.items())]
+        for nombre, valor in (extras or {}).items():
+            lineas += [f"# TYPE {nombre} gauge", f"{nombre} {valor}"]
+        return "\n".join(lineas) + "\n"
+
+
+class AnaliticaInventario:
+    """
+    Reportes del inventario calculados sobre columnas (cantidad y precio) que se mantienen
+    al día con cada cambio, sin recorrer los objetos Item. Si NumPy está instalado las consultas
+    se hacen de forma vectorizada; si no, se usan array y heapq. Los resultados se guardan
+    en caché hasta el próximo cambio del inventario.
+    """
+
+    def __init__(self, items):
+        self.cerrojo = threading.Lock()
+        self.reiniciar(items)
+
+    def reiniciar(self, items=()):
+        with self.cerrojo:
+            self.filas = {}  # ID -> fila en las columnas
+            self.ids = []
+            self.cantidades = array("q")
+            self.precios = array("d")
+            self.valor_total_actual = 0.0  # Suma de cantidad * precio, se actualiza en cada cambio
+            self.cache = {}
+        for item in items:
+            self.al_agregar(item.get_id(), item.get_cantidad(), item.get_precio())
+
+    def al_agregar(self, id_item, cantidad, precio):
+        with self.cerrojo:
+            self.filas[id_item] = len(self.ids)
+            self.ids.append(id_item)
+            self.cantidades.append(cantidad)
+            self.precios.append(precio)
+            self.valor_total_actual += cantidad * precio
+            self.cache.clear()
+
+    def al_quitar(self, id_item, cantidad, precio):
+        with self.cerrojo:
+            fila = self.filas.pop(id_item)
+            self.valor_total_actual -= self.cantidades[fila] * self.precios[fila]
+            ultima = len(self.ids) - 1
+            if fila != ultima:  # Movemos la última fila al hueco (el orden no importa para los reportes)
+                self.ids[fila] = self.ids[ultima]
+                self.cantidades[fila] = self.cantidades[ultima]
+                self.precios[fila] = self.precios[ultima]
+                self.filas[self.ids[fila]] = fila
+            self.ids.pop()
+            self.cantidades.pop()
+            self.precios.pop()
+            self.cache.clear()
+
+    def al_actualizar(self, id_item, cantidad_anterior, precio_anterior, cantidad, precio):
+        with self.cerrojo:
+            fila = self.filas[id_item]
+            self.valor_total_actual += cantidad * precio - self.cantidades[fila] * self.precios[fila]
+            self.cantidades[fila] = cantidad
+            self.precios[fila] = precio
+            self.cache.clear()
+
+    def consultar(self, clave, calcular):
+        # Devolvemos el resultado guardado si no hubo cambios desde el último cálculo
+        with self.cerrojo:
+            if clave not in self.cache:
+                self.cache[clave] = calcular()
+            return self.cache[clave]
+
+    def valor_total(self):
+        """Valor del stock: suma de cantidad * precio de todos los productos"""
+        return self.valor_total_actual
+
+    def bajo_stock(self, umbral):
+        """IDs de los productos con cantidad menor que el umbral"""
+        def calcular():
+            if np is not None:
+                cantidades = np.frombuffer(self.cantidades, dtype=np.int64)
+                return [self.ids[i] for i in np.flatnonzero(cantidades < umbral)]
+            return [self.ids[i] for i, cantidad in enumerate(self.cantidades) if cantidad < umbral]
+        return self.consultar(("bajo_stock", umbral), calcular)
+
+    def percentiles_precio(self, percentiles=(25, 50, 75, 90, 99)):
+        """Diccionario percentil -> precio (interpolación lineal, como numpy.percentile)"""
+        def calcular():
+            if not self.ids:
+                return {}
+            if np is not None:
+                valores = np.percentile(np.frombuffer(self.precios, dtype=np.float64), percentiles)
+                return {p: float(v) for p, v in zip(percentiles, valores)}
+            ordenados = sorted(self.precios)
+            resultado = {}
+            for p in percentiles:
+                posicion = (len(ordenados) - 1) * p / 100
+                abajo = int(posicion)
+                arriba = min(abajo + 1, len(ordenados) - 1)
+                resultado[p] = ordenados[abajo] + (ordenados[arriba] - ordenados[abajo]) * (posicion - abajo)
+            return resultado
+        return self.consultar(("percentiles", tuple(percentiles)), calcular)
+
+    def top_por_valor(self, n=10):
+        """Lista de (ID, valor) con los n productos de mayor cantidad * precio"""
+        def calcular():
+            if np is not None:
+                valores = np.frombuffer(self.cantidades, dtype=np.int64) * np.frombuffer(self.precios, dtype=np.float64)
+                k = min(n, len(valores))
+                if k == 0:
+                    return []
+                mejores = np.argpartition(-valores, k - 1)[:k]  # Los k mayores sin ordenar todo
+                mejores = mejores[np.argsort(-valores[mejores], kind="stable")]
+                return [(self.ids[i], float(valores[i])) for i in mejores]
+            return heapq.nlargest(n, ((self.ids[i], c * p) for i, (c, p) in
+                                      enumerate(zip(self.cantidades, self.precios))), key=lambda par: par[1])
+        return self.consultar(("top", n), calcular)
+
+
+# Funciones para ordenar los productos en los listados
+CLAVES_ORDEN = {
+    "id": lambda item: item.get_id(),
+    "nombre": lambda item: item.get_nombre().lower(),
+    "cantidad": lambda item: item.get_cantidad(),
+    "precio": lambda item: item.get_precio(),
+}
+
+
+def paginar(items, tamaño=None, desplazamiento=0, orden=None, descendente=False):
+    """
+    Generador con los items de una página. Sin orden solo se recorren los primeros
+    desplazamiento + tamaño items; con orden se usa heapq para no ordenar la lista completa.
+    """
+    fin = None if tamaño is None else desplazamiento + tamaño
+    if orden is not None:
+        clave = CLAVES_ORDEN[orden]
+        if fin is None:
+            items = sorted(items, key=clave, reverse=descendente)
+        elif descendente:
+            items = heapq.nlargest(fin, items, key=clave)
+        else:
+            items = heapq.nsmallest(fin, items, key=clave)
+    elif descendente:  # Sin clave, descendente es el orden de inserción invertido
+        try:
+            items = reversed(items)  # Las vistas de diccionario se invierten sin copiarse
+        except TypeError:
+            items = reversed(list(items))
+    return islice(items, desplazamiento, fin)
+
+
+def escribir_tabla(items, titulo, salida=None, filas_por_escritura=1000):
+    """
+    Muestra los items como tabla juntando las filas en un texto y escribiéndolas de a bloques,
+    en lugar de un print por producto. Devuelve la cantidad de filas mostradas.
+    """
+    salida = salida or sys.stdout
+    linea = "-" * 60 + "\n"
+    bloque = [f"\n{titulo}\n", linea, f"{'ID':<10} {'Nombre':<20} {'Cantidad':<10} {'Precio ($)':<10}\n", linea]
+    filas = 0
+    for item in items:
+        bloque.append(f"{item.get_id():<10} {item.get_nombre():<20} {item.get_cantidad():<10} {item.get_precio():<10.2f}\n")
+        filas += 1
+        if len(bloque) >= filas_por_escritura:
+            salida.write("".join(bloque))
+            bloque = []
+    bloque.append(linea)
+    salida.write("".join(bloque))
+    return filas
+
+
+class IndicesRango:
+    """
+    Índices ordenados de precio y de cantidad para consultas por rango.
+    Cada índice es una lista ordenada de pares (valor, ID) mantenida con bisect: la consulta
+    cuesta O(log N + k) y cada cambio O(log N) para ubicar el par más el corrimiento de la lista.
+    """
+
+    def __init__(self, items):
+        self.cerrojo = threading.Lock()
+        self.reiniciar(items)
+
+    def reiniciar(self, items=()):
+        with self.cerrojo:
+            # Ordenar una sola vez es mucho más rápido que insertar los pares de a uno
+            items = [(item.get_id(), item.get_cantidad(), item.get_precio()) for item in items]
+            self.por_precio = sorted((precio, id_item) for id_item, _, precio in items)
+            self.por_cantidad = sorted((cantidad, id_item) for id_item, cantidad, _ in items)
+
+    def al_agregar(self, id_item, cantidad, precio):
+        with self.cerrojo:
+            insort(self.por_precio, (precio, id_item))
+            insort(self.por_cantidad, (cantidad, id_item))
+
+    def al_quitar(self, id_item, cantidad, precio):
+        with self.cerrojo:
+            del self.por_precio[bisect_left(self.por_precio, (precio, id_item))]
+            del self.por_cantidad[bisect_left(self.por_cantidad, (cantidad, id_item))]
+
+    def al_actualizar(self, id_item, cantidad_anterior, precio_anterior, cantidad, precio):
+        with self.cerrojo:
+            if precio != precio_anterior:
+                del self.por_precio[bisect_left(self.por_precio, (precio_anterior, id_item))]
+                insort(self.por_precio, (precio, id_item))
+            if cantidad != cantidad_anterior:
+                del self.por_cantidad[bisect_left(self.por_cantidad, (cantidad_anterior, id_item))]
+                insort(self.por_cantidad, (cantidad, id_item))
+
+    def rango(self, indice, minimo=None, maximo=None):
+        """IDs con valor entre minimo y maximo (ambos incluidos; None = sin límite), ordenados por valor"""
+        with self.cerrojo:
+            lista = self.por_precio if indice == "precio" else self.por_cantidad
+            desde = 0 if minimo is None else bisect_left(lista, minimo, key=lambda par: par[0])
+            hasta = len(lista) if maximo is None else bisect_right(lista, maximo, key=lambda par: par[0])
+            return [id_item for _, id_item in lista[desde:hasta]]
@@ -0,0 +1,250 @@
+# Servicio TCP del inventario (JSON por líneas) y publicación de cambios a suscriptores remotos
+
+import asyncio
+import json
+import os
+import queue
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+from .modelo import Item
+from .estrategias import crear_inventario
+
+
+class PublicadorCambios:
+    """
+    Suscriptor que reenvía los eventos de cambio como JSON por líneas a los clientes conectados
+    a un socket local. Uso: inventario.suscribir(PublicadorCambios(puerto=8766)).
+    Recibir un evento solo lo pone en una cola, así la operación del inventario no espera a la red;
+    un hilo agrupa lo que haya en la cola y lo envía. Un cliente que no lee durante 'espera'
+    segundos se desconecta. Quien se conecta recibe los cambios desde ese momento: primero se
+    conecta, luego lee la foto (por ejemplo exportar_archivo) y aplica los eventos siguientes.
+    """
+
+    def __init__(self, host="127.0.0.1", puerto=8766, espera=1.0):
+        self.cola = queue.Queue()
+        self.clientes = []
+        self.cerrojo = threading.Lock()  # Protege la lista de clientes
+        self.espera = espera
+        self.activo = True
+        self.escucha = socket.create_server((host, puerto))
+        self.escucha.settimeout(0.2)  # Para revisar cada tanto si hay que terminar
+        self.host, self.puerto = self.escucha.getsockname()[:2]  # Con puerto=0 el sistema elige uno libre
+        self.hilo_aceptar = threading.Thread(target=self.aceptar, daemon=True, name="publicador-aceptar")
+        self.hilo_enviar = threading.Thread(target=self.enviar, daemon=True, name="publicador-enviar")
+        self.hilo_aceptar.start()
+        self.hilo_enviar.start()
+
+    def __call__(self, evento):
+        self.cola.put(evento)
+
+    def aceptar(self):
+        while self.activo:
+            try:
+                cliente, _ = self.escucha.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break  # El socket de escucha se cerró
+            cliente.settimeout(self.espera)
+            with self.cerrojo:
+                self.clientes.append(cliente)
+
+    def enviar(self):
+        terminar = False
+        while not terminar:
+            eventos = [self.cola.get()]
+            while len(eventos) < 1000 and not self.cola.empty():  # Agrupamos lo que ya está esperando
+                eventos.append(self.cola.get_nowait())
+            if None in eventos:  # None es la señal de cierre, lo anterior se envía igual
+                terminar = True
+                eventos = eventos[:eventos.index(None)]
+            if not eventos:
+                continue
+            datos = "".join(json.dumps(evento, ensure_ascii=False, separators=(",", ":")) + "\n"
+                            for evento in eventos).encode("utf-8")
+            with self.cerrojo:
+                clientes = list(self.clientes)
+            for cliente in clientes:
+                try:
+                    cliente.sendall(datos)
+                except OSError:  # Cliente desconectado o demasiado lento
+                    self.quitar_cliente(cliente)
+
+    def quitar_cliente(self, cliente):
+        with self.cerrojo:
+            if cliente in self.clientes:
+                self.clientes.remove(cliente)
+        cliente.close()
+
+    # Metodo para enviar lo pendiente y cerrar todas las conexiones
+    def cerrar(self):
+        self.cola.put(None)
+        self.hilo_enviar.join()
+        self.activo = False
+        self.hilo_aceptar.join()
+        self.escucha.close()
+        with self.cerrojo:
+            clientes, self.clientes = self.clientes, []
+        for cliente in clientes:
+            cliente.close()
+
+
+def seguir_cambios(host="127.0.0.1", puerto=8766):
+    """Se conecta a un PublicadorCambios y devuelve los eventos a medida que llegan"""
+    with socket.create_connection((host, puerto)) as conexion, conexion.makefile("r", encoding="utf-8") as f:
+        for linea in f:
+            yield json.loads(linea)
+
+
+class ServidorInventario:
+    """
+    Servicio asyncio que expone un Inventario por TCP con JSON por líneas.
+    Cada línea es una solicitud, por ejemplo {"op": "añadir", "id_item": "1", "nombre": "pan",
+    "cantidad": 3, "precio": 0.5}, y se responde una línea {"ok": true, ...} en el mismo orden.
+    Operaciones: añadir, eliminar, actualizar, buscar (campo "nombre") y listar.
+    El cliente puede enviar varias solicitudes sin esperar las respuestas (pipelining).
+    Una solicitud de más de limite_linea bytes se responde con {"ok": false, ...} sin cortar la conexión.
+    Las operaciones sobre el inventario corren en un único hilo aparte, de modo que el guardado
+    en disco no bloquea la atención de las conexiones y las operaciones no se pisan entre sí.
+    """
+
+    def __init__(self, inventario, host="127.0.0.1", puerto=8765):
+        self.inventario = inventario
+        self.host = host
+        self.puerto = puerto
+        self.ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inventario")
+        self.maximo_lote = 256  # Solicitudes que se procesan juntas como máximo
+        self.limite_linea = 2 ** 16  # Bytes máximos de una solicitud; una más larga se responde con error
+        self.nulo = open(os.devnull, "w")
+        self.servidor = None
+        self.conexiones = {}  # Tarea que atiende cada conexión -> su escritor
+
+    async def iniciar(self):
+        self.servidor = await asyncio.start_server(self.atender, self.host, self.puerto, limit=self.limite_linea)
+        self.puerto = self.servidor.sockets[0].getsockname()[1]  # Por si se pidió el puerto 0
+        return self.servidor
+
+    async def detener(self):
+        self.servidor.close()
+        for escritor in self.conexiones.values():
+            escritor.close()  # Las conexiones abiertas terminan al leer el fin de datos
+        await asyncio.gather(*self.conexiones, return_exceptions=True)
+        await self.servidor.wait_closed()
+        self.ejecutor.shutdown(wait=True)
+        self.nulo.close()
+
+    async def atender(self, lector, escritor):
+        loop = asyncio.get_running_loop()
+        cola = asyncio.Queue()  # Líneas recibidas que todavía no se procesaron
+
+        async def leer():
+            descartando = False  # Se está tirando el resto de una línea demasiado larga
+            try:
+                while True:
+                    try:
+                        linea = await lector.readuntil(b"\n")
+                    except asyncio.IncompleteReadError as e:
+                        linea = e.partial  # El cliente cerró; puede quedar una última línea sin salto
+                        if not linea:
+                            return
+                    except asyncio.LimitOverrunError as e:
+                        await lector.readexactly(e.consumed)  # Tiramos lo leído sin pasar del límite
+                        descartando = True
+                        continue
+                    if descartando:
+                        descartando = False
+                        linea = ValueError(f"Solicitud demasiado larga (máximo {self.limite_linea} bytes)")
+                    await cola.put(linea)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass  # Conexión reiniciada o cerrada a mitad de una línea larga
+            finally:
+                cola.put_nowait(b"")  # Siempre avisamos el fin, si no atender se quedaría esperando
+
+        lectura = asyncio.create_task(leer())
+        tarea = asyncio.current_task()
+        self.conexiones[tarea] = escritor
+        try:
+            terminado = False
+            while not terminado:
+                # Tomamos todas las solicitudes que ya llegaron y las procesamos en un solo viaje al ejecutor
+                lineas = [await cola.get()]
+                while not cola.empty() and len(lineas) < self.maximo_lote:
+                    lineas.append(cola.get_nowait())
+                if not lineas[-1]:
+                    lineas.pop()
+                    terminado = True
+                if lineas:
+                    respuestas = await loop.run_in_executor(self.ejecutor, self.ejecutar_varias, lineas)
+                    escritor.writelines(respuestas)
+                    await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self.conexiones[tarea]
+            lectura.cancel()
+            escritor.close()
+
+    # Metodo que procesa varias líneas y devuelve las respuestas ya codificadas (corre en el ejecutor)
+    def ejecutar_varias(self, lineas):
+        respuestas = []
+        with redirect_stdout(self.nulo):  # Callamos los mensajes del menú
+            for linea in lineas:
+                try:
+                    if isinstance(linea, Exception):
+                        raise linea  # Error detectado al leer la línea (por ejemplo, demasiado larga)
+                    respuesta = self.ejecutar(json.loads(linea))
+                except Exception as e:
+                    respuesta = {"ok": False, "error": str(e)}
+                respuestas.append(json.dumps(respuesta, separators=(",", ":")).encode("utf-8") + b"\n")
+        return respuestas
+
+    # Metodo que aplica una solicitud sobre el inventario
+    def ejecutar(self, solicitud):
+        inventario = self.inventario
+        op = solicitud.get("op")
+        if op == "añadir":
+            id_item = str(solicitud["id_item"])
+            if inventario.obtener_item(id_item) is not None:
+                return {"ok": False, "error": "El ID ya existe."}
+            inventario.aña_item(Item(id_item, solicitud["nombre"], int(solicitud["cantidad"]),
+                                     float(solicitud["precio"])))
+            return {"ok": True}
+        if op == "eliminar":
+            id_item = str(solicitud["id_item"])
+            if inventario.obtener_item(id_item) is None:
+                return {"ok": False, "error": "Producto no encontrado."}
+            inventario.el_item(id_item)
+            return {"ok": True}
+        if op == "actualizar":
+            id_item = str(solicitud["id_item"])
+            if inventario.obtener_item(id_item) is None:
+                return {"ok": False, "error": "Producto no encontrado."}
+            cantidad = solicitud.get("cantidad")
+            precio = solicitud.get("precio")
+            inventario.act_item(id_item, int(cantidad) if cantidad is not None else None,
+                                float(precio) if precio is not None else None)
+            return {"ok": True, "item": inventario.obtener_item(id_item).to_dict()}
+        if op == "buscar":
+            return {"ok": True, "items": [item.to_dict() for item in inventario.bus_item(solicitud["nombre"])]}
+        if op == "listar":
+            return {"ok": True, "items": [item.to_dict() for item in inventario.listar_items()]}
+        return {"ok": False, "error": f"Operación desconocida: {op}"}
+
+
+def servir(host="127.0.0.1", puerto=8765, estrategia="dict", **opciones):
+    """Arranca el servicio de inventario hasta que se interrumpa con Ctrl+C"""
+    async def principal():
+        servidor = ServidorInventario(crear_inventario(estrategia, **opciones), host, puerto)
+        await servidor.iniciar()
+        print(f"Servicio de inventario escuchando en {servidor.host}:{servidor.puerto}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await servidor.detener()
+    try:
+        asyncio.run(principal())
+    except KeyboardInterrupt:
+        print("Servicio detenido.")
@@ -0,0 +1,27 @@
+# Configuración común de las pruebas (python -m pytest desde la raíz del repositorio)
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Carpeta que contiene el paquete inventario
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+
+@pytest.fixture(autouse=True)
+def carpeta_temporal(tmp_path, monkeypatch):
+    """Cada prueba corre en su propia carpeta, porque los inventarios escriben en el directorio actual"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture(scope="session")
+def biblioteca():
+    """Módulo SEMANA 12/biblioteca.py (la carpeta tiene un espacio, así que no se puede importar por nombre)"""
+    spec = importlib.util.spec_from_file_location("biblioteca", os.path.join(RAIZ, "SEMANA 12", "biblioteca.py"))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
@@ -0,0 +1,99 @@
+# Lectura de JSON por partes, escritura atómica y formatos de la foto del inventario
+
+import io
+import json
+import os
+import stat
+
+import pytest
+
+from inventario import FORMATOS, Inventario, Item, escribir_atomico, leer_json_por_partes
+
+
+@pytest.mark.parametrize("tam_bloque", [1, 2, 7, 1 << 16])
+def test_leer_json_por_partes_igual_que_json_load(tam_bloque):
+    datos = [{"id_item": str(i), "nombre": f"producto \"{i}\" ñ", "cantidad": i, "precio": i / 3,
+              "extra": [1, {"a": None}]} for i in range(50)]
+    for texto in (json.dumps(datos), json.dumps(datos, indent=4), " [ ] ", "[]"):
+        assert list(leer_json_por_partes(io.StringIO(texto), tam_bloque)) == json.loads(texto)
+
+
+@pytest.mark.parametrize("texto", ["", "{}", "[1, 2", "[1 2]", "[1,]", "[1] x", '[{"a": 1}'])
+def test_leer_json_por_partes_rechaza_json_invalido(texto):
+    with pytest.raises(json.JSONDecodeError):
+        list(leer_json_por_partes(io.StringIO(texto), 2))
+
+
+def test_escribir_atomico_conserva_el_archivo_si_falla(tmp_path):
+    ruta = tmp_path / "datos.txt"
+    ruta.write_text("anterior", encoding="utf-8")
+    os.chmod(ruta, 0o640)
+
+    def escribir_y_fallar(f):
+        f.write("a medias")
+        raise OSError("disco lleno")
+
+    with pytest.raises(OSError):
+        escribir_atomico(str(ruta), escribir_y_fallar)
+    assert ruta.read_text(encoding="utf-8") == "anterior"
+    assert os.listdir(tmp_path) == ["datos.txt"]  # Sin temporales sueltos
+    escribir_atomico(str(ruta), lambda f: f.write("ñandú\n"), encoding="utf-8", newline="")
+    assert ruta.read_bytes() == "ñandú\n".encode("utf-8")
+    assert stat.S_IMODE(os.stat(ruta).st_mode) == 0o640  # Mantiene los permisos del archivo reemplazado
+
+
+@pytest.mark.parametrize("formato", list(FORMATOS))
+def test_formatos_ida_y_vuelta(formato):
+    datos = [Item(str(i), f"producto {i} ñ", i, i * 0.25).to_dict() for i in range(300)]
+    ruta = "foto" + FORMATOS[formato].extension
+    FORMATOS[formato].guardar(ruta, datos)
+    assert list(FORMATOS[formato].cargar(ruta)) == datos
+
+
+@pytest.mark.parametrize("formato", list(FORMATOS))
+@pytest.mark.parametrize("usar_diario", [False, True])
+def test_foto_truncada_no_se_carga_a_medias_ni_se_pisa(formato, usar_diario):
+    inventario = Inventario(formato=formato, usar_diario=usar_diario)
+    with inventario.lote():
+        for i in range(10):
+            inventario.aña_item(Item(str(i), f"producto {i}", i, 1.0))
+    inventario.compactar()
+    with open(inventario.archivo, "rb") as f:
+        contenido = f.read()
+    with open(inventario.archivo, "wb") as f:
+        f.write(contenido[:-7])
+
+    inventario = Inventario(formato=formato, usar_diario=usar_diario)
+    assert len(inventario.items) == 0
+    inventario.aña_item(Item("nuevo", "nuevo", 1, 1.0))
+    inventario.compactar()
+    with open(inventario.archivo + ".danado", "rb") as f:
+        assert f.read() == contenido[:-7]
+    assert list(Inventario(formato=formato, usar_diario=usar_diario).items) == ["nuevo"]
+
+
+def test_exportar_e_importar_csv_y_jsonl():
+    inventario = Inventario()
+    inventario.aña_item(Item("1", "Ñandú, café", 2, 1.5))
+    inventario.aña_item(Item("2", 'línea\nnueva "citada"', 3, 0.25))
+    for ruta in ("exportado.csv", "exportado.jsonl"):
+        assert inventario.exportar_archivo(ruta) == 2
+        otro = Inventario(nombre="otro_" + ruta)
+        importados, rechazados = otro.importar_archivo(ruta)
+        assert (importados, rechazados) == (2, [])
+        assert [i.to_dict() for i in otro.items.values()] == [i.to_dict() for i in inventario.items.values()]
+
+
+def test_diario_solo_guarda_los_campos_que_cambiaron():
+    inventario = Inventario(usar_diario=True)
+    eventos = []
+    inventario.suscribir(eventos.append)
+    inventario.aña_item(Item("1", "pan", 1, 1.0))
+    inventario.act_item("1", precio=2.0)
+    inventario.ajustar_cantidad("1", 4)
+    assert [{k: v for k, v in e.items() if k != "sec"} for e in eventos[1:]] == [
+        {"op": "actualizar", "id_item": "1", "precio": 2.0},
+        {"op": "actualizar", "id_item": "1", "cantidad": 5},
+    ]
+    item = Inventario(usar_diario=True).items["1"]
+    assert (item.get_cantidad(), item.get_precio()) == (5, 2.0)
@@ -0,0 +1,75 @@
+# Biblioteca (SEMANA 12): búsqueda BM25 con poda, índices diferidos y devoluciones atómicas
+
+import random
+import sqlite3
+
+import pytest
+
+
+def test_bm25_con_poda_da_los_mismos_k_primeros(biblioteca):
+    azar = random.Random(3)
+    vocabulario = ["soledad", "cien", "años", "amor", "tiempos", "colera", "otoño", "patriarca", "general",
+                   "laberinto", "crónica", "muerte", "anunciada", "memoria", "putas", "tristes", "garcia", "marquez"]
+    indice = biblioteca.IndiceTexto()
+    for n in range(400):
+        indice.agregar(str(n), " ".join(azar.choice(vocabulario) for _ in range(azar.randint(1, 8))))
+    for n in range(0, 400, 7):
+        indice.quitar(str(n))
+    for consulta in ["soledad", "cien años soledad", "amor colera", "garcia marquez sol", "muerte anunc",
+                     "otoño patriarca general tristes", "xyz", "memoria memoria put"]:
+        for k in (1, 3, 10):
+            podado = indice.buscar(consulta, k)
+            completo = dict(indice.buscar(consulta, len(indice)))  # Con k = todos la poda nunca se aplica
+            mejores = sorted(completo.values(), reverse=True)[:k]
+            assert [puntaje for _, puntaje in podado] == pytest.approx(mejores), (consulta, k)
+            for isbn, puntaje in podado:
+                assert puntaje == pytest.approx(completo[isbn])
+
+
+def test_indices_diferidos_no_conservan_libros_prestados(biblioteca):
+    bib = biblioteca.Biblioteca()
+    bib.añadir_libro(biblioteca.Libro("Cien años de soledad", "García Márquez", "novela", "A"))
+    bib.añadir_libros([biblioteca.Libro(f"Título {i}", f"Autor {i}", "cuento", f"I{i}") for i in range(5)])
+    usuario = biblioteca.Usuario("Ana", "1")
+    bib.registrar_usuario(usuario)
+    bib.prestar_libro("A", usuario)
+    assert bib.buscar_libros("titulo", "Cien años de soledad") == []
+    assert bib.buscar_texto("soledad") == []
+    bib.devolver_libro("A", usuario)
+    assert [libro.isbn for libro, _ in bib.buscar_texto("soledad")] == ["A"]
+
+
+def test_devolucion_que_falla_no_cambia_la_memoria(biblioteca, tmp_path):
+    bib = biblioteca.Biblioteca(str(tmp_path / "biblioteca.db"))
+    ana, beto = biblioteca.Usuario("Ana", "1"), biblioteca.Usuario("Beto", "2")
+    bib.registrar_usuario(ana)
+    bib.registrar_usuario(beto)
+    bib.añadir_libro(biblioteca.Libro("Rayuela", "Cortázar", "novela", "R"))
+    bib.prestar_libro("R", ana)
+    bib.reservar_libro("R", beto)
+
+    def estado():
+        existencias = bib.existencias["R"]
+        return (dict(existencias.prestados), list(existencias.disponibles), list(existencias.reservas),
+                dict(ana.ejemplares), dict(beto.ejemplares), set(beto.reservas),
+                list(bib.conexion.execute("SELECT * FROM prestamos ORDER BY isbn, ejemplar")),
+                list(bib.conexion.execute("SELECT * FROM reservas")))
+
+    antes = estado()
+    escribir = bib.escribir
+
+    def escribir_sin_prestar(sql, parametros):
+        if sql == bib.SQL_PRESTAR:
+            raise sqlite3.OperationalError("disco lleno")
+        escribir(sql, parametros)
+
+    bib.escribir = escribir_sin_prestar
+    with pytest.raises(sqlite3.OperationalError):
+        bib.devolver_libro("R", ana)
+    assert estado() == antes
+    assert not bib.verificar_prestamos()
+    bib.escribir = escribir
+    bib.devolver_libro("R", ana)  # Ahora sí: el ejemplar pasa a Beto, que lo había reservado
+    assert "R" in beto.libros_prestados and "R" not in ana.libros_prestados
+    assert not bib.verificar_prestamos()
+    bib.cerrar()
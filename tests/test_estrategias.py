@@ -0,0 +1,101 @@
+# Las mismas operaciones sobre todas las estrategias de almacenamiento deben dar el mismo resultado
+
+import pytest
+
+from inventario import ESTRATEGIAS, InventarioFragmentado, Item, crear_inventario
+
+ESTRATEGIAS_PROBADAS = list(ESTRATEGIAS) + ["fragmentado", "fragmentado_procesos"]
+
+
+def abrir(estrategia):
+    if estrategia == "fragmentado":
+        return InventarioFragmentado(fragmentos=3)
+    if estrategia == "fragmentado_procesos":
+        return InventarioFragmentado(fragmentos=2, procesos=True)
+    return crear_inventario(estrategia)
+
+
+@pytest.fixture(params=ESTRATEGIAS_PROBADAS)
+def abrir_inventario(request):
+    """Devuelve una función que abre el inventario de la estrategia; al terminar se cierran todos"""
+    abiertos = []
+
+    def abrir_uno():
+        inventario = abrir(request.param)
+        abiertos.append(inventario)
+        return inventario
+
+    yield abrir_uno
+    for inventario in abiertos:
+        inventario.cerrar()
+
+
+def cargar_ejemplo(inventario):
+    with inventario.lote():
+        inventario.aña_item(Item("1", "Manzana roja", 10, 0.5))
+        inventario.aña_item(Item("2", "Manzana verde", 4, 0.6))
+        inventario.aña_item(Item("3", "Pera", 7, 0.8))
+        inventario.aña_item(Item("4", "Pan integral", 2, 1.5))
+
+
+def resumen(inventario):
+    return sorted((i.get_id(), i.get_nombre(), i.get_cantidad(), i.get_precio()) for i in inventario.listar_items())
+
+
+def test_operaciones_basicas(abrir_inventario):
+    inventario = abrir_inventario()
+    cargar_ejemplo(inventario)
+    inventario.aña_item(Item("1", "Repetido", 1, 1.0))  # ID existente: se rechaza
+    inventario.act_item("3", cantidad=9)
+    inventario.act_item("4", precio=1.75)
+    inventario.el_item("2")
+    inventario.el_item("no-existe")
+    assert resumen(inventario) == [("1", "Manzana roja", 10, 0.5), ("3", "Pera", 9, 0.8),
+                                   ("4", "Pan integral", 2, 1.75)]
+    assert inventario.obtener_item("3").get_cantidad() == 9
+    assert inventario.obtener_item("2") is None
+    assert sorted(i.get_id() for i in inventario.bus_item("manz")) == ["1"]
+    assert sorted(i.get_id() for i in inventario.bus_item("an")) == ["1", "4"]  # Menos de 3 letras
+    assert inventario.bus_item("kiwi") == []
+
+
+def test_listar_ordenado_y_paginado(abrir_inventario):
+    inventario = abrir_inventario()
+    cargar_ejemplo(inventario)
+    assert [i.get_id() for i in inventario.listar_items(orden="precio")] == ["1", "2", "3", "4"]
+    assert [i.get_id() for i in inventario.listar_items(2, 1, orden="cantidad", descendente=True)] == ["3", "2"]
+
+
+def test_consultas_por_rango(abrir_inventario):
+    inventario = abrir_inventario()
+    cargar_ejemplo(inventario)
+    assert [i.get_id() for i in inventario.items_por_precio(0.55, 1.0)] == ["2", "3"]
+    inventario.act_item("4", precio=0.7)
+    assert [i.get_id() for i in inventario.items_por_precio(0.55, 1.0)] == ["2", "4", "3"]
+    assert [i.get_id() for i in inventario.items_por_cantidad(maximo=4)] == ["4", "2"]
+
+
+def test_persistencia(abrir_inventario):
+    inventario = abrir_inventario()
+    cargar_ejemplo(inventario)
+    inventario.act_item("1", cantidad=11)
+    inventario.el_item("4")
+    esperado = resumen(inventario)
+    inventario.cerrar()
+    assert resumen(abrir_inventario()) == esperado
+
+
+def test_lote_cancelado_no_deja_cambios(abrir_inventario):
+    inventario = abrir_inventario()
+    cargar_ejemplo(inventario)
+    antes = resumen(inventario)
+    with pytest.raises(RuntimeError):
+        with inventario.lote():
+            inventario.aña_item(Item("5", "Uva", 3, 2.0))
+            inventario.act_item("1", cantidad=0, precio=9.0)
+            inventario.el_item("3")
+            raise RuntimeError("fallo a mitad del lote")
+    assert resumen(inventario) == antes
+    assert sorted(i.get_id() for i in inventario.bus_item("pera")) == ["3"]
+    inventario.cerrar()
+    assert resumen(abrir_inventario()) == antes  # Tampoco llegó al disco
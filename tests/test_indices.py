@@ -0,0 +1,84 @@
+# Índice de trigramas (bus_item) e índices por rango, comparados con un recorrido completo
+
+import random
+
+import pytest
+
+from inventario import IndicesRango, Inventario, Item, trigramas
+
+
+def test_trigramas():
+    assert trigramas("Pan") == {"pan"}
+    assert trigramas("Manzana") == {"man", "anz", "nza", "zan", "ana"}
+    assert trigramas("ab") == set()
+
+
+def operar_al_azar(inventario, azar, pasos):
+    """Aplica altas, bajas y cambios al azar y devuelve un diccionario con el estado esperado"""
+    esperado = {}
+    palabras = ["pan", "panela", "manzana", "ana", "banana", "café", "cafetera", "té"]
+    for paso in range(pasos):
+        id_item = str(azar.randrange(60))
+        operacion = azar.random()
+        if operacion < 0.5 and id_item not in esperado:
+            item = Item(id_item, " ".join(azar.sample(palabras, 2)), azar.randrange(20), azar.randrange(50) / 4)
+            inventario.aña_item(item)
+            esperado[id_item] = item.to_dict()
+        elif operacion < 0.7 and id_item in esperado:
+            inventario.el_item(id_item)
+            del esperado[id_item]
+        elif id_item in esperado:
+            cantidad, precio = azar.randrange(20), azar.randrange(50) / 4
+            inventario.act_item(id_item, cantidad, precio)
+            esperado[id_item].update(cantidad=cantidad, precio=precio)
+    return esperado
+
+
+@pytest.mark.parametrize("opciones", [{}, {"almacen_columnar": True}])
+def test_bus_item_igual_que_recorrido(opciones):
+    inventario = Inventario(**opciones)
+    esperado = operar_al_azar(inventario, random.Random(1), 400)
+    orden = list(esperado)  # Orden de inserción de los que quedan
+    for consulta in ["pan", "ana", "Ana", "nan", "café", "fe", "a", "ban", "xyz", "pan manzana", "é"]:
+        encontrados = [i.get_id() for i in inventario.bus_item(consulta)]
+        recorrido = [id_item for id_item in orden if consulta.lower() in esperado[id_item]["nombre"].lower()]
+        assert sorted(encontrados) == sorted(recorrido), consulta
+
+
+def test_indices_rango_igual_que_recorrido():
+    inventario = Inventario()
+    inventario.rangos()  # Creamos los índices antes de los cambios para que se mantengan al día
+    esperado = operar_al_azar(inventario, random.Random(2), 400)
+    for minimo, maximo in [(None, None), (2.0, 5.0), (None, 3.0), (7.5, None), (4.0, 4.0), (20.0, 30.0)]:
+        por_precio = [i.get_id() for i in inventario.items_por_precio(minimo, maximo)]
+        recorrido = sorted((d["precio"], d["id_item"]) for d in esperado.values()
+                           if (minimo is None or d["precio"] >= minimo) and (maximo is None or d["precio"] <= maximo))
+        assert por_precio == [id_item for _, id_item in recorrido]
+    por_cantidad = [i.get_id() for i in inventario.items_por_cantidad(5, 10)]
+    assert por_cantidad == [id_item for _, id_item in sorted((d["cantidad"], d["id_item"]) for d in esperado.values()
+                                                            if 5 <= d["cantidad"] <= 10)]
+
+
+def test_indices_rango_vuelven_atras_con_el_lote():
+    inventario = Inventario()
+    for i in range(5):
+        inventario.aña_item(Item(str(i), f"p{i}", i, float(i)))
+    indices = inventario.rangos()
+    antes = (list(indices.por_precio), list(indices.por_cantidad))
+    with pytest.raises(ValueError):
+        with inventario.lote():
+            inventario.act_item("1", 10, 10.0)
+            inventario.el_item("2")
+            inventario.aña_item(Item("9", "p9", 0, 0.5))
+            raise ValueError("cancelar")
+    assert (indices.por_precio, indices.por_cantidad) == antes
+
+
+def test_indices_rango_solo():
+    indices = IndicesRango([Item("a", "a", 3, 2.0), Item("b", "b", 1, 2.0), Item("c", "c", 2, 1.0)])
+    assert indices.rango("precio") == ["c", "a", "b"]
+    assert indices.rango("precio", 2.0, 2.0) == ["a", "b"]
+    indices.al_actualizar("c", 2, 1.0, 5, 3.0)
+    indices.al_quitar("a", 3, 2.0)
+    assert indices.rango("precio") == ["b", "c"]
+    assert indices.rango("cantidad", minimo=2) == ["c"]
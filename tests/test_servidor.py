@@ -0,0 +1,64 @@
+# Servicio TCP con JSON por líneas
+
+import asyncio
+import json
+
+from inventario import ServidorInventario, crear_inventario
+
+
+async def con_servidor(prueba):
+    servidor = ServidorInventario(crear_inventario("dict"), puerto=0)
+    await servidor.iniciar()
+    try:
+        lector, escritor = await asyncio.open_connection("127.0.0.1", servidor.puerto)
+        await prueba(lector, escritor, servidor)
+        escritor.close()
+    finally:
+        await asyncio.wait_for(servidor.detener(), 5)
+    assert not servidor.conexiones
+
+
+async def respuestas(lector, cantidad):
+    return [json.loads(await asyncio.wait_for(lector.readline(), 5)) for _ in range(cantidad)]
+
+
+def test_solicitudes_en_orden_con_pipelining():
+    async def prueba(lector, escritor, servidor):
+        solicitudes = [
+            {"op": "añadir", "id_item": "1", "nombre": "pan", "cantidad": 3, "precio": 0.5},
+            {"op": "añadir", "id_item": "1", "nombre": "pan", "cantidad": 3, "precio": 0.5},
+            {"op": "actualizar", "id_item": "1", "cantidad": 7},
+            {"op": "buscar", "nombre": "pa"},
+            {"op": "eliminar", "id_item": "2"},
+            {"op": "volar"},
+        ]
+        escritor.write(b"".join(json.dumps(s).encode("utf-8") + b"\n" for s in solicitudes) + b"no es json\n")
+        await escritor.drain()
+        recibidas = await respuestas(lector, 7)
+        assert [r["ok"] for r in recibidas] == [True, False, True, True, False, False, False]
+        assert recibidas[2]["item"]["cantidad"] == 7
+        assert [i["id_item"] for i in recibidas[3]["items"]] == ["1"]
+
+    asyncio.run(con_servidor(prueba))
+
+
+def test_linea_demasiado_larga_responde_error_y_sigue():
+    async def prueba(lector, escritor, servidor):
+        larga = json.dumps({"op": "buscar", "nombre": "x" * (servidor.limite_linea + 10)}).encode("utf-8")
+        escritor.write(larga + b'\n{"op": "listar"}\n' + b"y" * (3 * servidor.limite_linea))
+        escritor.write_eof()  # La última línea, también demasiado larga, termina sin salto
+        recibidas = await respuestas(lector, 3)
+        assert [r["ok"] for r in recibidas] == [False, True, False]
+        assert "demasiado larga" in recibidas[0]["error"]
+
+    asyncio.run(con_servidor(prueba))
+
+
+def test_detener_con_conexion_cortada_a_mitad_de_linea():
+    async def prueba(lector, escritor, servidor):
+        escritor.write(b"z" * (2 * servidor.limite_linea))
+        await escritor.drain()
+        escritor.transport.abort()  # Sin salto de línea ni cierre ordenado
+        await asyncio.sleep(0.1)
+
+    asyncio.run(con_servidor(prueba))